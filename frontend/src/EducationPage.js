@@ -2,14 +2,17 @@ import React, { useState, useEffect } from 'react';
 import { logout, authenticatedFetch, API_BASE_URL, isAuthenticated } from './utils/auth';
 import { useNavigate } from 'react-router-dom';
 
+const emptyEntry = { degree: '', institution: '', period: '', description: '' };
+
 function EducationPage() {
   const navigate = useNavigate();
-  const [educationText, setEducationText] = useState('');
+  const [entries, setEntries] = useState([]);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
   const [error, setError] = useState(null);
-  const [isEditing, setIsEditing] = useState(false);
-  const [editText, setEditText] = useState('');
+  // null: not editing; 'new': adding an entry; otherwise the id of the entry being edited
+  const [editingId, setEditingId] = useState(null);
+  const [form, setForm] = useState(emptyEntry);
 
   // Authentication guard
   useEffect(() => {
@@ -19,12 +22,12 @@ function EducationPage() {
     }
   }, [navigate]);
 
-  // Fetch education from backend
+  // Fetch education entries from backend
   const fetchEducation = async () => {
     try {
       setLoading(true);
       
-      const response = await authenticatedFetch(`${API_BASE_URL}/education/`, {
+      const response = await authenticatedFetch(`${API_BASE_URL}/education/entries/`, {
         method: 'GET',
       });
 
@@ -33,7 +36,7 @@ function EducationPage() {
       }
 
       const data = await response.json();
-      setEducationText(data.education || '');
+      setEntries(data);
       setError(null);
     } catch (err) {
       console.error('Error fetching education:', err);
@@ -47,23 +50,37 @@ function EducationPage() {
     fetchEducation();
   }, []);
 
-  const handleEdit = () => {
-    setIsEditing(true);
-    setEditText(educationText);
+  const handleAdd = () => {
+    setEditingId('new');
+    setForm(emptyEntry);
+  };
+
+  const handleEdit = (entry) => {
+    setEditingId(entry.id);
+    setForm({ degree: entry.degree, institution: entry.institution, period: entry.period, description: entry.description });
   };
 
   const handleCancel = () => {
-    setIsEditing(false);
-    setEditText('');
+    setEditingId(null);
+    setForm(emptyEntry);
   };
 
   const handleSave = async () => {
+    if (!form.degree.trim()) {
+      alert('Degree is required');
+      return;
+    }
     try {
       setSaving(true);
       
-      const response = await authenticatedFetch(`${API_BASE_URL}/education/`, {
-        method: 'POST',
-        body: JSON.stringify({ education: editText }),
+      // New entries are appended; edits only send this entry's fields
+      const isNew = editingId === 'new';
+      const url = isNew
+        ? `${API_BASE_URL}/education/entries/`
+        : `${API_BASE_URL}/education/entries/${editingId}/`;
+      const response = await authenticatedFetch(url, {
+        method: isNew ? 'POST' : 'PATCH',
+        body: JSON.stringify(form),
       });
 
       if (!response.ok) {
@@ -71,9 +88,10 @@ function EducationPage() {
         throw new Error(`Failed to save education: ${errorText}`);
       }
 
-      setEducationText(editText);
-      setIsEditing(false);
-      alert('Education saved successfully!');
+      const saved = await response.json();
+      setEntries(isNew ? [...entries, saved] : entries.map(entry => (entry.id === saved.id ? saved : entry)));
+      setEditingId(null);
+      setForm(emptyEntry);
     } catch (error) {
       console.error('Error saving education:', error);
       alert(`Failed to save education: ${error.message}`);
@@ -82,6 +100,26 @@ function EducationPage() {
     }
   };
 
+  const handleDelete = async (entryId) => {
+    if (!window.confirm('Delete this entry?')) {
+      return;
+    }
+    try {
+      const response = await authenticatedFetch(`${API_BASE_URL}/education/entries/${entryId}/`, {
+        method: 'DELETE',
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to delete entry (${response.status})`);
+      }
+
+      setEntries(entries.filter(entry => entry.id !== entryId));
+    } catch (error) {
+      console.error('Error deleting education:', error);
+      alert(`Failed to delete education: ${error.message}`);
+    }
+  };
+
   if (loading) {
     return (
       <div style={{ padding: '40px', textAlign: 'center' }}>
@@ -281,9 +319,9 @@ function EducationPage() {
               <h2 style={{ margin: 0, fontSize: '20px', fontWeight: '600', color: '#212529' }}>
                 Education
               </h2>
-              {!isEditing && (
+              {editingId === null && (
                 <button
-                  onClick={handleEdit}
+                  onClick={handleAdd}
                   style={{
                     backgroundColor: '#28a745',
                     color: 'white',
@@ -295,7 +333,7 @@ function EducationPage() {
                     cursor: 'pointer'
                   }}
                 >
-                  Edit
+                  Add
                 </button>
               )}
             </div>
@@ -313,20 +351,63 @@ function EducationPage() {
               </div>
             )}
 
-            {!isEditing ? (
+            {editingId === null ? (
               <div>
-                {educationText ? (
-                  <div style={{
-                    backgroundColor: '#f8f9fa',
-                    border: '1px solid #dee2e6',
-                    borderRadius: '4px',
-                    padding: '16px',
-                    whiteSpace: 'pre-wrap',
-                    lineHeight: '1.6',
-                    fontSize: '14px'
-                  }}>
-                    {educationText}
-                  </div>
+                {entries.length > 0 ? (
+                  entries.map(entry => (
+                    <div key={entry.id} style={{
+                      backgroundColor: '#f8f9fa',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      padding: '16px',
+                      marginBottom: '12px',
+                      fontSize: '14px'
+                    }}>
+                      <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'flex-start' }}>
+                        <div>
+                          <div style={{ fontWeight: '600', color: '#212529' }}>{entry.degree}</div>
+                          <div style={{ color: '#6c757d' }}>
+                            {[entry.institution, entry.period].filter(Boolean).join(' · ')}
+                          </div>
+                        </div>
+                        <div style={{ display: 'flex', gap: '8px' }}>
+                          <button
+                            onClick={() => handleEdit(entry)}
+                            style={{
+                              backgroundColor: 'transparent',
+                              color: '#6c757d',
+                              border: '1px solid #dee2e6',
+                              padding: '4px 12px',
+                              borderRadius: '4px',
+                              fontSize: '13px',
+                              cursor: 'pointer'
+                            }}
+                          >
+                            Edit
+                          </button>
+                          <button
+                            onClick={() => handleDelete(entry.id)}
+                            style={{
+                              backgroundColor: '#dc3545',
+                              color: 'white',
+                              border: 'none',
+                              padding: '4px 12px',
+                              borderRadius: '4px',
+                              fontSize: '13px',
+                              cursor: 'pointer'
+                            }}
+                          >
+                            Delete
+                          </button>
+                        </div>
+                      </div>
+                      {entry.description && (
+                        <div style={{ marginTop: '8px', whiteSpace: 'pre-wrap', lineHeight: '1.6' }}>
+                          {entry.description}
+                        </div>
+                      )}
+                    </div>
+                  ))
                 ) : (
                   <div style={{
                     backgroundColor: '#f8f9fa',
@@ -338,7 +419,7 @@ function EducationPage() {
                   }}>
                     <p style={{ margin: '0 0 16px 0' }}>No education information added yet.</p>
                     <button
-                      onClick={handleEdit}
+                      onClick={handleAdd}
                       style={{
                         backgroundColor: '#28a745',
                         color: 'white',
@@ -357,6 +438,78 @@ function EducationPage() {
               </div>
             ) : (
               <div>
+                <div style={{ marginBottom: '12px' }}>
+                  <label style={{
+                    display: 'block',
+                    marginBottom: '8px',
+                    fontSize: '14px',
+                    fontWeight: '500',
+                    color: '#212529'
+                  }}>
+                    Degree
+                  </label>
+                  <input
+                    type="text"
+                    value={form.degree}
+                    onChange={(e) => setForm({ ...form, degree: e.target.value })}
+                    style={{
+                      width: '100%',
+                      padding: '8px 12px',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      fontSize: '14px'
+                    }}
+                    placeholder="Bachelor of Science in Computer Science"
+                  />
+                </div>
+                <div style={{ marginBottom: '12px' }}>
+                  <label style={{
+                    display: 'block',
+                    marginBottom: '8px',
+                    fontSize: '14px',
+                    fontWeight: '500',
+                    color: '#212529'
+                  }}>
+                    Institution
+                  </label>
+                  <input
+                    type="text"
+                    value={form.institution}
+                    onChange={(e) => setForm({ ...form, institution: e.target.value })}
+                    style={{
+                      width: '100%',
+                      padding: '8px 12px',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      fontSize: '14px'
+                    }}
+                    placeholder="MIT"
+                  />
+                </div>
+                <div style={{ marginBottom: '12px' }}>
+                  <label style={{
+                    display: 'block',
+                    marginBottom: '8px',
+                    fontSize: '14px',
+                    fontWeight: '500',
+                    color: '#212529'
+                  }}>
+                    Period
+                  </label>
+                  <input
+                    type="text"
+                    value={form.period}
+                    onChange={(e) => setForm({ ...form, period: e.target.value })}
+                    style={{
+                      width: '100%',
+                      padding: '8px 12px',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      fontSize: '14px'
+                    }}
+                    placeholder="2016-2020"
+                  />
+                </div>
                 <div style={{ marginBottom: '16px' }}>
                   <label style={{
                     display: 'block',
@@ -365,31 +518,22 @@ function EducationPage() {
                     fontWeight: '500',
                     color: '#212529'
                   }}>
-                    Education
+                    Description
                   </label>
                   <textarea
-                    value={editText}
-                    onChange={(e) => setEditText(e.target.value)}
+                    value={form.description}
+                    onChange={(e) => setForm({ ...form, description: e.target.value })}
                     style={{
                       width: '100%',
                       padding: '12px',
                       border: '1px solid #dee2e6',
                       borderRadius: '4px',
                       fontSize: '14px',
-                      minHeight: '200px',
+                      minHeight: '120px',
                       resize: 'vertical',
                       fontFamily: 'inherit'
                     }}
-                    placeholder="Add your education here...
-
-Example:
-Bachelor of Science in Computer Science
-MIT (2016-2020)
-GPA: 3.8/4.0
-
-High School Diploma
-Lincoln High School (2014-2016)
-Valedictorian, Honor Roll"
+                    placeholder="GPA: 3.8/4.0"
                   />
                 </div>
 
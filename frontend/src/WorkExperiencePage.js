@@ -2,14 +2,17 @@ import React, { useState, useEffect } from 'react';
 import { logout, authenticatedFetch, API_BASE_URL, isAuthenticated } from './utils/auth';
 import { useNavigate } from 'react-router-dom';
 
+const emptyEntry = { title: '', company: '', period: '', description: '' };
+
 function WorkExperiencePage() {
   const navigate = useNavigate();
-  const [workText, setWorkText] = useState('');
+  const [entries, setEntries] = useState([]);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
   const [error, setError] = useState(null);
-  const [isEditing, setIsEditing] = useState(false);
-  const [editText, setEditText] = useState('');
+  // null: not editing; 'new': adding an entry; otherwise the id of the entry being edited
+  const [editingId, setEditingId] = useState(null);
+  const [form, setForm] = useState(emptyEntry);
 
   // Authentication guard
   useEffect(() => {
@@ -19,12 +22,12 @@ function WorkExperiencePage() {
     }
   }, [navigate]);
 
-  // Fetch work experience from backend
+  // Fetch work experience entries from backend
   const fetchWorkExperience = async () => {
     try {
       setLoading(true);
       
-      const response = await authenticatedFetch(`${API_BASE_URL}/work-experience/`, {
+      const response = await authenticatedFetch(`${API_BASE_URL}/work-experience/entries/`, {
         method: 'GET',
       });
 
@@ -33,7 +36,7 @@ function WorkExperiencePage() {
       }
 
       const data = await response.json();
-      setWorkText(data.work || '');
+      setEntries(data);
       setError(null);
     } catch (err) {
       console.error('Error fetching work experience:', err);
@@ -47,23 +50,37 @@ function WorkExperiencePage() {
     fetchWorkExperience();
   }, []);
 
-  const handleEdit = () => {
-    setIsEditing(true);
-    setEditText(workText);
+  const handleAdd = () => {
+    setEditingId('new');
+    setForm(emptyEntry);
+  };
+
+  const handleEdit = (entry) => {
+    setEditingId(entry.id);
+    setForm({ title: entry.title, company: entry.company, period: entry.period, description: entry.description });
   };
 
   const handleCancel = () => {
-    setIsEditing(false);
-    setEditText('');
+    setEditingId(null);
+    setForm(emptyEntry);
   };
 
   const handleSave = async () => {
+    if (!form.title.trim()) {
+      alert('Job Title is required');
+      return;
+    }
     try {
       setSaving(true);
       
-      const response = await authenticatedFetch(`${API_BASE_URL}/work-experience/`, {
-        method: 'POST',
-        body: JSON.stringify({ work: editText }),
+      // New entries are appended; edits only send this entry's fields
+      const isNew = editingId === 'new';
+      const url = isNew
+        ? `${API_BASE_URL}/work-experience/entries/`
+        : `${API_BASE_URL}/work-experience/entries/${editingId}/`;
+      const response = await authenticatedFetch(url, {
+        method: isNew ? 'POST' : 'PATCH',
+        body: JSON.stringify(form),
       });
 
       if (!response.ok) {
@@ -71,9 +88,10 @@ function WorkExperiencePage() {
         throw new Error(`Failed to save work experience: ${errorText}`);
       }
 
-      setWorkText(editText);
-      setIsEditing(false);
-      alert('Work experience saved successfully!');
+      const saved = await response.json();
+      setEntries(isNew ? [...entries, saved] : entries.map(entry => (entry.id === saved.id ? saved : entry)));
+      setEditingId(null);
+      setForm(emptyEntry);
     } catch (error) {
       console.error('Error saving work experience:', error);
       alert(`Failed to save work experience: ${error.message}`);
@@ -82,6 +100,26 @@ function WorkExperiencePage() {
     }
   };
 
+  const handleDelete = async (entryId) => {
+    if (!window.confirm('Delete this entry?')) {
+      return;
+    }
+    try {
+      const response = await authenticatedFetch(`${API_BASE_URL}/work-experience/entries/${entryId}/`, {
+        method: 'DELETE',
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to delete entry (${response.status})`);
+      }
+
+      setEntries(entries.filter(entry => entry.id !== entryId));
+    } catch (error) {
+      console.error('Error deleting work experience:', error);
+      alert(`Failed to delete work experience: ${error.message}`);
+    }
+  };
+
   if (loading) {
     return (
       <div style={{ padding: '40px', textAlign: 'center' }}>
@@ -281,9 +319,9 @@ function WorkExperiencePage() {
               <h2 style={{ margin: 0, fontSize: '20px', fontWeight: '600', color: '#212529' }}>
                 Work Experience
               </h2>
-              {!isEditing && (
+              {editingId === null && (
                 <button
-                  onClick={handleEdit}
+                  onClick={handleAdd}
                   style={{
                     backgroundColor: '#007bff',
                     color: 'white',
@@ -295,7 +333,7 @@ function WorkExperiencePage() {
                     cursor: 'pointer'
                   }}
                 >
-                  Edit
+                  Add
                 </button>
               )}
             </div>
@@ -313,20 +351,63 @@ function WorkExperiencePage() {
               </div>
             )}
 
-            {!isEditing ? (
+            {editingId === null ? (
               <div>
-                {workText ? (
-                  <div style={{
-                    backgroundColor: '#f8f9fa',
-                    border: '1px solid #dee2e6',
-                    borderRadius: '4px',
-                    padding: '16px',
-                    whiteSpace: 'pre-wrap',
-                    lineHeight: '1.6',
-                    fontSize: '14px'
-                  }}>
-                    {workText}
-                  </div>
+                {entries.length > 0 ? (
+                  entries.map(entry => (
+                    <div key={entry.id} style={{
+                      backgroundColor: '#f8f9fa',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      padding: '16px',
+                      marginBottom: '12px',
+                      fontSize: '14px'
+                    }}>
+                      <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'flex-start' }}>
+                        <div>
+                          <div style={{ fontWeight: '600', color: '#212529' }}>{entry.title}</div>
+                          <div style={{ color: '#6c757d' }}>
+                            {[entry.company, entry.period].filter(Boolean).join(' · ')}
+                          </div>
+                        </div>
+                        <div style={{ display: 'flex', gap: '8px' }}>
+                          <button
+                            onClick={() => handleEdit(entry)}
+                            style={{
+                              backgroundColor: 'transparent',
+                              color: '#6c757d',
+                              border: '1px solid #dee2e6',
+                              padding: '4px 12px',
+                              borderRadius: '4px',
+                              fontSize: '13px',
+                              cursor: 'pointer'
+                            }}
+                          >
+                            Edit
+                          </button>
+                          <button
+                            onClick={() => handleDelete(entry.id)}
+                            style={{
+                              backgroundColor: '#dc3545',
+                              color: 'white',
+                              border: 'none',
+                              padding: '4px 12px',
+                              borderRadius: '4px',
+                              fontSize: '13px',
+                              cursor: 'pointer'
+                            }}
+                          >
+                            Delete
+                          </button>
+                        </div>
+                      </div>
+                      {entry.description && (
+                        <div style={{ marginTop: '8px', whiteSpace: 'pre-wrap', lineHeight: '1.6' }}>
+                          {entry.description}
+                        </div>
+                      )}
+                    </div>
+                  ))
                 ) : (
                   <div style={{
                     backgroundColor: '#f8f9fa',
@@ -338,7 +419,7 @@ function WorkExperiencePage() {
                   }}>
                     <p style={{ margin: '0 0 16px 0' }}>No work experience added yet.</p>
                     <button
-                      onClick={handleEdit}
+                      onClick={handleAdd}
                       style={{
                         backgroundColor: '#007bff',
                         color: 'white',
@@ -357,6 +438,78 @@ function WorkExperiencePage() {
               </div>
             ) : (
               <div>
+                <div style={{ marginBottom: '12px' }}>
+                  <label style={{
+                    display: 'block',
+                    marginBottom: '8px',
+                    fontSize: '14px',
+                    fontWeight: '500',
+                    color: '#212529'
+                  }}>
+                    Job Title
+                  </label>
+                  <input
+                    type="text"
+                    value={form.title}
+                    onChange={(e) => setForm({ ...form, title: e.target.value })}
+                    style={{
+                      width: '100%',
+                      padding: '8px 12px',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      fontSize: '14px'
+                    }}
+                    placeholder="Software Engineer"
+                  />
+                </div>
+                <div style={{ marginBottom: '12px' }}>
+                  <label style={{
+                    display: 'block',
+                    marginBottom: '8px',
+                    fontSize: '14px',
+                    fontWeight: '500',
+                    color: '#212529'
+                  }}>
+                    Company
+                  </label>
+                  <input
+                    type="text"
+                    value={form.company}
+                    onChange={(e) => setForm({ ...form, company: e.target.value })}
+                    style={{
+                      width: '100%',
+                      padding: '8px 12px',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      fontSize: '14px'
+                    }}
+                    placeholder="Google"
+                  />
+                </div>
+                <div style={{ marginBottom: '12px' }}>
+                  <label style={{
+                    display: 'block',
+                    marginBottom: '8px',
+                    fontSize: '14px',
+                    fontWeight: '500',
+                    color: '#212529'
+                  }}>
+                    Period
+                  </label>
+                  <input
+                    type="text"
+                    value={form.period}
+                    onChange={(e) => setForm({ ...form, period: e.target.value })}
+                    style={{
+                      width: '100%',
+                      padding: '8px 12px',
+                      border: '1px solid #dee2e6',
+                      borderRadius: '4px',
+                      fontSize: '14px'
+                    }}
+                    placeholder="2020-2023"
+                  />
+                </div>
                 <div style={{ marginBottom: '16px' }}>
                   <label style={{
                     display: 'block',
@@ -365,31 +518,22 @@ function WorkExperiencePage() {
                     fontWeight: '500',
                     color: '#212529'
                   }}>
-                    Work Experience
+                    Description
                   </label>
                   <textarea
-                    value={editText}
-                    onChange={(e) => setEditText(e.target.value)}
+                    value={form.description}
+                    onChange={(e) => setForm({ ...form, description: e.target.value })}
                     style={{
                       width: '100%',
                       padding: '12px',
                       border: '1px solid #dee2e6',
                       borderRadius: '4px',
                       fontSize: '14px',
-                      minHeight: '200px',
+                      minHeight: '120px',
                       resize: 'vertical',
                       fontFamily: 'inherit'
                     }}
-                    placeholder="Add your work experience here...
-
-Example:
-Software Engineer at Google (2020-2023)
-- Developed web applications using React and Node.js
-- Led a team of 5 developers
-
-Frontend Developer at Startup (2018-2020)
-- Built responsive websites
-- Improved page load times by 40%"
+                    placeholder={'- Developed web applications using React and Node.js\n- Led a team of 5 developers'}
                   />
                 </div>
 
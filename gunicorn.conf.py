@@ -0,0 +1,42 @@
+# Gunicorn loads ./gunicorn.conf.py automatically; command-line flags in the
+# Procfile still take precedence over anything set here.
+
+
+def on_starting(server):
+    # child_exit runs in the master from a SIGCHLD handler. Without --preload
+    # the master would first load the settings there, and a second worker
+    # exiting mid-import would find them half-loaded.
+    from django.conf import settings
+
+    settings.PORTFOLIO_METRICS_DIR
+
+
+def post_fork(server, worker):
+    # With --preload the app is imported in the master. Drop any database
+    # connection it opened so each worker opens (and then reuses) its own.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # Pick up snapshot rebuilds that recycled workers didn't get to. Not in
+    # post_fork: without --preload the app isn't loaded until after it.
+    from portfolio import snapshots
+
+    snapshots.worker.resume()
+
+
+def worker_exit(server, worker):
+    # Write this worker's request metrics out before it goes
+    from portfolio.metrics import store
+
+    store.flush()
+
+
+def child_exit(server, worker):
+    # Runs in the master; fold the exited worker's metrics into the archive so
+    # /metrics counters survive --max-requests recycling
+    from portfolio.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 import pymysql
@@ -85,16 +86,23 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-request timings, query counts and /metrics; first so it times the rest
+    "portfolio.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    # WhiteNoise for efficient static file serving in production
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # WhiteNoise for efficient static file serving in production, plus the
+    # published portfolio snapshots
+    "portfolio.middleware.SnapshotWhiteNoiseMiddleware",
+    # gzip/brotli for API responses (WhiteNoise compresses its own files)
+    "portfolio.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # cProfile a request on demand; after auth so admin sessions can ask
+    "portfolio.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = 'meapi.urls'
@@ -116,6 +124,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'meapi.wsgi.application'
 
+# Serve the read-heavy endpoints from portfolio.async_views. meapi/asgi.py turns
+# this on, so it only applies when running under an ASGI server.
+ASYNC_READ_VIEWS = os.getenv("DJANGO_ASYNC_VIEWS", "False") == "True"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -137,8 +149,13 @@ DATABASES = {
             "read_timeout": 60,
             "write_timeout": 60,
         },
-        "CONN_MAX_AGE": 0,  # Disable connection pooling to fix threading issues
-        "CONN_HEALTH_CHECKS": False,  # Disable health checks that can cause threading issues
+        # Django keeps one persistent connection per thread, so reuse is safe for
+        # both sync and threaded gunicorn workers. Connections opened in the
+        # --preload master are closed after fork (see gunicorn.conf.py) so
+        # workers never share a socket. Set DB_CONN_MAX_AGE=0 to reconnect on
+        # every request.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,  # Ping reused connections so dropped ones are replaced transparently
         "TEST": {
             "CHARSET": None,
             "COLLATION": None,
@@ -146,6 +163,94 @@ DATABASES = {
     }
 }
 
+# Cache
+# Shared across gunicorn workers via the file backend by default; point
+# DJANGO_CACHE_BACKEND at locmem or Redis to override. Past MAX_ENTRIES the
+# file and locmem backends evict a third of all keys, version counters
+# included, so it is sized for every user's counter plus their responses.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("DJANGO_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", os.path.join(BASE_DIR, ".cache")),
+    }
+}
+if CACHES["default"]["BACKEND"].rsplit(".", 1)[-1] in ("FileBasedCache", "LocMemCache"):
+    # Redis hands OPTIONS to its client, which rejects MAX_ENTRIES
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("DJANGO_CACHE_MAX_ENTRIES", "20000"))}
+
+# Seconds a cached portfolio response lives; writes invalidate it sooner
+PORTFOLIO_CACHE_TIMEOUT = int(os.getenv("PORTFOLIO_CACHE_TIMEOUT", "300"))
+
+# Published portfolio snapshots: written under PORTFOLIO_SNAPSHOT_ROOT and
+# served by WhiteNoise at PORTFOLIO_SNAPSHOT_URL. Rebuilds run in the
+# background PORTFOLIO_SNAPSHOT_DELAY seconds after a change; a replaced
+# content-addressed version is kept for PORTFOLIO_SNAPSHOT_GRACE seconds.
+# Scheduled rebuilds are recorded under PORTFOLIO_SNAPSHOT_PENDING_DIR, which
+# must be outside the served root and shared by all workers.
+PORTFOLIO_SNAPSHOT_ROOT = os.getenv("PORTFOLIO_SNAPSHOT_ROOT", os.path.join(BASE_DIR, "snapshots"))
+PORTFOLIO_SNAPSHOT_PENDING_DIR = os.getenv(
+    "PORTFOLIO_SNAPSHOT_PENDING_DIR", os.path.join(BASE_DIR, "snapshots-pending")
+)
+PORTFOLIO_SNAPSHOT_URL = "/portfolios/"
+PORTFOLIO_SNAPSHOT_DELAY = float(os.getenv("PORTFOLIO_SNAPSHOT_DELAY", "1"))
+PORTFOLIO_SNAPSHOT_GRACE = int(os.getenv("PORTFOLIO_SNAPSHOT_GRACE", "3600"))
+
+# API response compression (portfolio.middleware.CompressionMiddleware).
+# Smaller bodies aren't worth the CPU or the extra header bytes; brotli is
+# used when the package is installed. See `manage.py bench_compression`.
+PORTFOLIO_COMPRESS_MIN_SIZE = int(os.getenv("PORTFOLIO_COMPRESS_MIN_SIZE", "1024"))
+PORTFOLIO_GZIP_LEVEL = int(os.getenv("PORTFOLIO_GZIP_LEVEL", "6"))
+PORTFOLIO_BROTLI_QUALITY = int(os.getenv("PORTFOLIO_BROTLI_QUALITY", "5"))
+
+# Request instrumentation (portfolio.middleware.RequestMetricsMiddleware).
+# Requests over either budget are logged with their SQL on the
+# "portfolio.metrics" logger. Each worker writes its metrics under
+# PORTFOLIO_METRICS_DIR at most every PORTFOLIO_METRICS_FLUSH_INTERVAL
+# seconds; /metrics/ merges them and archives the files of processes that
+# have exited. Set PORTFOLIO_METRICS_TOKEN to require
+# "Authorization: Bearer <token>" there.
+PORTFOLIO_SERVER_TIMING = os.getenv("PORTFOLIO_SERVER_TIMING", "True") == "True"
+PORTFOLIO_QUERY_BUDGET = int(os.getenv("PORTFOLIO_QUERY_BUDGET", "30"))
+PORTFOLIO_LATENCY_BUDGET_MS = int(os.getenv("PORTFOLIO_LATENCY_BUDGET_MS", "500"))
+PORTFOLIO_METRICS_DIR = os.getenv(
+    "PORTFOLIO_METRICS_DIR", os.path.join(tempfile.gettempdir(), "portfolio-metrics")
+)
+PORTFOLIO_METRICS_FLUSH_INTERVAL = float(os.getenv("PORTFOLIO_METRICS_FLUSH_INTERVAL", "1"))
+PORTFOLIO_METRICS_TOKEN = os.getenv("PORTFOLIO_METRICS_TOKEN", "")
+
+# On-demand request profiling (portfolio.middleware.ProfilingMiddleware).
+# The newest PORTFOLIO_PROFILE_KEEP profiles are kept in PORTFOLIO_PROFILE_DIR;
+# `manage.py profiles --sign` tokens last PORTFOLIO_PROFILE_TOKEN_MAX_AGE seconds.
+PORTFOLIO_PROFILING = os.getenv("PORTFOLIO_PROFILING", "True") == "True"
+PORTFOLIO_PROFILE_DIR = os.getenv(
+    "PORTFOLIO_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "portfolio-profiles")
+)
+PORTFOLIO_PROFILE_KEEP = int(os.getenv("PORTFOLIO_PROFILE_KEEP", "100"))
+PORTFOLIO_PROFILE_TOKEN_MAX_AGE = int(os.getenv("PORTFOLIO_PROFILE_TOKEN_MAX_AGE", "3600"))
+
+# Seconds a worker trusts its local copy of a user's revocation marker (a
+# portfolio.models.TokenRevocation row), i.e. the longest a revoked access
+# token keeps working on another worker
+PORTFOLIO_REVOCATION_TTL = int(os.getenv("PORTFOLIO_REVOCATION_TTL", "30"))
+
+# Request threads per gunicorn worker; the Procfile passes the same variable
+# to --threads
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# Login/registration hash passwords in a per-worker process pool (0 hashes
+# inline). Up to PASSWORD_HASH_QUEUE more requests may wait for it; beyond
+# that they get 503 with Retry-After: PASSWORD_HASH_RETRY_AFTER seconds. A
+# login is shed only once more than PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE
+# are hashing in one gunicorn worker. The queue defaults to the thread count,
+# so nothing is shed until it is lowered to keep threads free for other requests.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "1"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", str(GUNICORN_THREADS)))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+# Processes used to hash a batch-provisioning request (1 hashes inline)
+PASSWORD_HASH_BATCH_WORKERS = int(os.getenv("PASSWORD_HASH_BATCH_WORKERS", str(os.cpu_count() or 1)))
+
+AUTHENTICATION_BACKENDS = ["portfolio.backends.PooledPasswordBackend"]
+
 # Database connection retry settings
 DATABASE_CONNECTION_RETRY_DELAY = 5
 DATABASE_CONNECTION_MAX_RETRIES = 3
@@ -200,7 +305,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Builds request.user from the verified token; no auth_user query
+        "portfolio.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -212,6 +318,10 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    # Adds a profile_id claim so views can skip the profile lookup
+    "TOKEN_OBTAIN_SERIALIZER": "portfolio.serializers.PortfolioTokenObtainPairSerializer",
+    # Refuses refresh tokens of deactivated or revoked users
+    "TOKEN_REFRESH_SERIALIZER": "portfolio.serializers.PortfolioTokenRefreshSerializer",
 }
 
 CORS_ALLOW_ALL_ORIGINS = True  # Temporarily allow all origins for testing
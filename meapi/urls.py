@@ -1,10 +1,11 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from portfolio.views import RegisterView, api_root
+from portfolio.views import BulkRegisterView, RegisterView, api_root
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -15,17 +16,24 @@ def simple_health(request):
     return JsonResponse({"status": "healthy", "service": "me-api"})
 
 
+@csrf_exempt
+async def async_simple_health(request):
+    """Ultra-simple health check for Railway, without a thread hop under ASGI"""
+    return JsonResponse({"status": "healthy", "service": "me-api"})
+
+
 urlpatterns = [
     path("admin/", admin.site.urls),
 
     # Simple health check (for Railway)
-    path("health/", simple_health, name="simple_health"),
+    path("health/", async_simple_health if settings.ASYNC_READ_VIEWS else simple_health, name="simple_health"),
 
     # API Root
     path("", api_root, name="api_root"),
 
     # JWT Auth
     path("auth/register/", RegisterView.as_view(), name="register"),
+    path("auth/register/bulk/", BulkRegisterView.as_view(), name="register-bulk"),
     path("auth/login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("", include("portfolio.urls")),
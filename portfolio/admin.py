@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import UserProfile, Skill, Project
+from .models import UserProfile, Skill, Project, WorkEntry, EducationEntry
 
 admin.site.register(UserProfile)
 admin.site.register(Skill)
 admin.site.register(Project)
+admin.site.register(WorkEntry)
+admin.site.register(EducationEntry)
@@ -0,0 +1,188 @@
+"""
+Async implementations of the read-heavy endpoints, used when the app is served
+over ASGI (see meapi/asgi.py). They return the same JSON as the DRF views in
+views.py; anything they don't handle (writes, cursor pagination) is handed to
+the DRF view unchanged.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch, Value
+from django.db.models.functions import Lower
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import cache_headers, compute_etag, not_modified, response_cache_key
+from .fieldsets import ProfileFieldset
+from .models import Project, Skill, UserProfile, profile_detail_queryset
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer
+from .serializers import ProjectSerializer, SkillRowSerializer, UserProfileSerializer
+from .views import UserProfileView, UserProjectsView, UserSkillsView, UserTopSkillsView
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    # Same bytes the DRF JSONRenderer would produce for the sync views
+    return HttpResponse(
+        FastJSONRenderer().render(data), status=status_code, content_type='application/json', headers=headers
+    )
+
+
+def _authenticate(request):
+    for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authenticator().authenticate(request)
+        if result is not None:
+            return result
+    return None, None
+
+
+async def authenticate(request):
+    """
+    Run the configured DRF authentication classes and set ``request.user`` and
+    ``request.auth`` like DRF would. Returns an error response, or None.
+    """
+    try:
+        user, request.auth = await sync_to_async(_authenticate)(request)
+    except exceptions.AuthenticationFailed as exc:
+        return json_response(exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail},
+                             status.HTTP_401_UNAUTHORIZED, {'WWW-Authenticate': 'Bearer realm="api"'})
+    if user is None:
+        return json_response({'detail': exceptions.NotAuthenticated.default_detail},
+                             status.HTTP_401_UNAUTHORIZED, {'WWW-Authenticate': 'Bearer realm="api"'})
+    request.user = user
+    return None
+
+
+async def get_profile(request, queryset=None):
+    # Async counterpart of views.resolve_profile
+    queryset = UserProfile.objects.all() if queryset is None else queryset
+    try:
+        return await queryset.aget(user_id=request.user.pk)
+    except UserProfile.DoesNotExist:
+        return (await UserProfile.objects.aget_or_create(user_id=request.user.pk))[0]
+
+
+async def get_profile_id(request):
+    # Async counterpart of views.ProfileMixin.get_profile_id
+    profile_id = request.auth.get('profile_id') if hasattr(request.auth, 'get') else None
+    if profile_id is not None:
+        return profile_id
+    return (await get_profile(request)).pk
+
+
+async def paginate(request, queryset, serializer_class):
+    """Async equivalent of PageNumberPagination's count/next/previous/results envelope."""
+    page_size = api_settings.PAGE_SIZE
+    count = await queryset.acount()
+    last_page = max((count + page_size - 1) // page_size, 1)
+    page = request.GET.get('page', 1)
+    try:
+        page = last_page if page == 'last' else int(page)
+    except (TypeError, ValueError):
+        page = 0
+    if not 1 <= page <= last_page:
+        raise exceptions.NotFound('Invalid page.')
+
+    offset = (page - 1) * page_size
+    rows = [row async for row in queryset[offset:offset + page_size]]
+    url = request.build_absolute_uri()
+    previous = None
+    if page > 1:
+        previous = remove_query_param(url, 'page') if page == 2 else replace_query_param(url, 'page', page - 1)
+    return {
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if page < last_page else None,
+        'previous': previous,
+        'results': serializer_class(rows, many=True).data,
+    }
+
+
+def async_read_view(build, fallback):
+    """
+    Wrap ``build(request)`` (returns response data) as an async view with
+    the same caching/ETag behaviour as ProfileCacheMixin. Non-GET requests and
+    cursor-paginated reads go to the sync DRF ``fallback`` view.
+    """
+    fallback_view = sync_to_async(fallback.as_view())
+
+    async def view(request, *args, **kwargs):
+        use_cursor = request.GET.get('pagination') == 'cursor' or KeysetPagination.cursor_query_param in request.GET
+        if request.method != 'GET' or use_cursor:
+            return await fallback_view(request, *args, **kwargs)
+        error = await authenticate(request)
+        if error is not None:
+            return error
+
+        key = await sync_to_async(response_cache_key)(request, request.user.id)
+        cached = await cache.aget(key)
+        if cached is None:
+            try:
+                data = await build(request)
+            except exceptions.APIException as exc:
+                detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+                return json_response(detail, exc.status_code)
+            cached = (compute_etag(data), data)
+            await cache.aset(key, cached, timeout=settings.PORTFOLIO_CACHE_TIMEOUT)
+
+        etag, data = cached
+        if not_modified(request, etag):
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+        return json_response(data, headers=cache_headers(etag))
+
+    return csrf_exempt(view)
+
+
+async def build_profile(request):
+    fieldset = ProfileFieldset.from_query(request.GET)
+    if fieldset is None:
+        profile = await get_profile(request, profile_detail_queryset())
+        return UserProfileSerializer(profile).data
+    profile = await get_profile(request, fieldset.queryset())
+    pages = fieldset.pages(profile)
+    for page in pages:
+        await page.aload()
+    return fieldset.data(profile, pages, request.build_absolute_uri())
+
+
+async def build_skills(request):
+    profile_id = await get_profile_id(request)
+    skills = Skill.objects.filter(profile_id=profile_id).order_by('id').values(*SkillRowSerializer.values)
+    return await paginate(request, skills, SkillRowSerializer)
+
+
+async def build_projects(request):
+    profile_id = await get_profile_id(request)
+    queryset = Project.objects.filter(profile_id=profile_id).order_by('id').prefetch_related(
+        Prefetch('skills', queryset=Skill.objects.order_by('id'))
+    )
+    skill_name = request.GET.get('skill')
+    if skill_name:
+        skill_ids = Skill.objects.filter(profile_id=profile_id).alias(lname=Lower('name')).filter(lname=Lower(Value(skill_name))).values('id')
+        queryset = queryset.filter(skills__in=skill_ids)
+    return await paginate(request, queryset, ProjectSerializer)
+
+
+async def build_top_skills(request):
+    profile_id = await get_profile_id(request)
+    skills = Skill.objects.filter(profile_id=profile_id).order_by('-project_count', 'id').values(*SkillRowSerializer.values)
+    skills = [skill async for skill in skills[:5]]
+    return {'count': len(skills), 'next': None, 'previous': None, 'results': SkillRowSerializer(skills, many=True).data}
+
+
+profile = async_read_view(build_profile, UserProfileView)
+skills = async_read_view(build_skills, UserSkillsView)
+projects = async_read_view(build_projects, UserProjectsView)
+top_skills = async_read_view(build_top_skills, UserTopSkillsView)
+
+
+async def health(request):
+    """Simple health check for Railway"""
+    return JsonResponse({
+        "status": "healthy",
+        "service": "portfolio-api",
+        "timestamp": timezone.now().isoformat()
+    }, status=200)
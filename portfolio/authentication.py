@@ -0,0 +1,112 @@
+"""
+JWT authentication that trusts the verified token instead of loading the User
+row on every request. Revocation (deactivation, password change, deletion) is
+enforced through TokenRevocation rows, see ``RevocationCache``.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import TokenRevocation
+
+
+class RevocationCache:
+    """
+    Per-process memo of "tokens issued before T are revoked" markers.
+
+    The markers themselves are TokenRevocation rows, so every worker sees
+    them and nothing evicts them early; each process re-reads a user's
+    marker at most once per ``PORTFOLIO_REVOCATION_TTL`` seconds, which
+    bounds how long a revoked token can keep working on another worker.
+    """
+
+    max_entries = 10000
+
+    def __init__(self):
+        self._entries = {}
+
+    @property
+    def marker_timeout(self):
+        # Long enough to outlive every token issued before the revocation
+        lifetimes = (api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+        return int(max(lifetimes).total_seconds())
+
+    def revoked_at(self, user_id):
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] <= now:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            revoked_at = TokenRevocation.objects.filter(user_id=user_id).values_list("revoked_at", flat=True).first()
+            entry = (revoked_at, now + settings.PORTFOLIO_REVOCATION_TTL)
+            self._entries[user_id] = entry
+        return entry[0]
+
+    def is_revoked(self, token):
+        revoked_at = self.revoked_at(token[api_settings.USER_ID_CLAIM])
+        # iat is whole seconds, so a token from the same second as the
+        # revocation is treated as issued before it.
+        return revoked_at is not None and token.get("iat", 0) < revoked_at
+
+    def revoke(self, user_id):
+        revoked_at = time.time()
+        TokenRevocation.objects.update_or_create(user_id=user_id, defaults={"revoked_at": revoked_at})
+        # Every token issued before an expired marker has expired itself
+        TokenRevocation.objects.filter(revoked_at__lt=revoked_at - self.marker_timeout).delete()
+        self._entries[user_id] = (revoked_at, time.monotonic() + settings.PORTFOLIO_REVOCATION_TTL)
+
+    def clear(self):
+        self._entries.clear()
+
+
+revocations = RevocationCache()
+
+
+class ClaimsUser(TokenUser):
+    """
+    ``request.user`` built from the token claims. ``id``/``pk`` and the
+    portfolio claims need no query; any other attribute (username, email,
+    is_staff, ...) loads the User row once, on first access.
+    """
+
+    @cached_property
+    def user(self):
+        try:
+            return get_user_model().objects.get(pk=self.id)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    @property
+    def username(self):
+        return self.user.username
+
+    @property
+    def is_staff(self):
+        return self.user.is_staff
+
+    @property
+    def is_superuser(self):
+        return self.user.is_superuser
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication without the per-request ``SELECT ... FROM auth_user``."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if revocations.is_revoked(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return ClaimsUser(validated_token)
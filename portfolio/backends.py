@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .passwords import hash_password, verify_password
+
+
+class PooledPasswordBackend(ModelBackend):
+    """ModelBackend that checks passwords in the hashing pool (see passwords.py)."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown usernames take as long as wrong passwords
+            hash_password(password)
+            return None
+
+        valid, upgraded = verify_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if upgraded:
+            # update() rather than save(): a re-hash of the same password must
+            # not trip the token revocation in signals.py
+            UserModel._default_manager.filter(pk=user.pk).update(password=upgraded)
+            user.password = upgraded
+        return user
@@ -0,0 +1,212 @@
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Max, Value, When
+from django.db.models.functions import Lower
+
+from .models import Project, Skill, UserProfile, recount_project_counts
+from .passwords import hash_passwords
+from .search import index_projects
+
+BATCH_SIZE = 500
+
+
+def _dedupe_by_name(items):
+    # Keyed on the same lower(name) the unique constraint uses: the first
+    # spelling of a name is kept, the last level given for it wins.
+    deduped = {}
+    for item in items:
+        key = item["name"].lower()
+        if key not in deduped:
+            deduped[key] = dict(item)
+        elif item.get("level"):
+            deduped[key]["level"] = item["level"]
+    return deduped
+
+
+def _skills_by_name(profile_id, keys):
+    """
+    Profile ``profile_id``'s skills named any of ``keys`` (lower-cased names),
+    keyed by the one each matched. The database does the matching, so under a
+    collation that also folds e.g. accents a row still lands on its key.
+    """
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), BATCH_SIZE):
+        chunk = keys[start:start + BATCH_SIZE]
+        matched = Case(*[When(lname=Value(key), then=Value(key)) for key in chunk], output_field=CharField())
+        for skill in Skill.objects.alias(lname=Lower("name")).filter(
+            profile_id=profile_id, lname__in=chunk
+        ).annotate(matched=matched):
+            found[skill.matched] = skill
+    return found
+
+
+def _upsert_skills(profile_id, items):
+    wanted = _dedupe_by_name(items)
+    if not wanted:
+        return {}, 0, 0
+
+    existing = _skills_by_name(profile_id, wanted)
+    with transaction.atomic():
+        # A concurrent request may insert one of these names after the read
+        # above; the insert then skips it and the re-read below picks it up.
+        Skill.objects.bulk_create(
+            [
+                Skill(profile_id=profile_id, name=item["name"], level=item.get("level"))
+                for key, item in wanted.items()
+                if key not in existing
+            ],
+            ignore_conflicts=True,
+            batch_size=BATCH_SIZE,
+        )
+        skills = _skills_by_name(profile_id, wanted)
+        to_update = []
+        for key, item in wanted.items():
+            level = item.get("level")
+            if level and level != skills[key].level:
+                skills[key].level = level
+                to_update.append(skills[key])
+        Skill.objects.bulk_update(to_update, ["level"], batch_size=BATCH_SIZE)
+
+    created = len(wanted) - len(existing)
+    updated = sum(1 for skill in to_update if skill.matched in existing)
+    return {key: skills[key] for key in wanted}, created, updated
+
+
+def upsert_skills(profile_id, items):
+    """
+    Insert or update ``items`` (dicts with ``name`` and optional ``level``) for
+    profile ``profile_id`` in a fixed number of statements.
+
+    Names are matched case-insensitively; a missing level never clears an
+    existing one. Returns ``(skills, created, updated)`` where ``skills`` holds
+    one saved Skill per distinct name, suitable for serializing.
+    """
+    skills, created, updated = _upsert_skills(profile_id, items)
+    return list(skills.values()), created, updated
+
+
+def import_projects(profile_id, items):
+    """
+    Create projects from validated ``items`` (ProjectSerializer fields plus a
+    ``skills`` list of SkillSerializer dicts) in one transaction.
+
+    Every referenced skill is resolved through one upsert, projects and their skill links are each inserted as one batch, and the
+    search index is rebuilt once for the lot.
+    """
+    skill_items = [skill for item in items for skill in item.get("skills", [])]
+
+    with transaction.atomic():
+        skills, _, _ = _upsert_skills(profile_id, skill_items)
+        skill_ids = {key: skill.id for key, skill in skills.items()}
+
+        projects = [
+            Project(profile_id=profile_id, **{k: v for k, v in item.items() if k != "skills"})
+            for item in items
+        ]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Project.objects.bulk_create(projects, batch_size=BATCH_SIZE)
+        else:
+            # MySQL can't hand back the ids of a multi-row INSERT, and the M2M
+            # rows below need them. Lock the profile so no other import for it
+            # interleaves, then read the new rows back: ids ascend in insertion
+            # order, as in load_portfolios.
+            list(UserProfile.objects.select_for_update().filter(pk=profile_id).values_list("pk"))
+            last_id = Project.objects.filter(profile_id=profile_id).aggregate(last=Max("id"))["last"] or 0
+            Project.objects.bulk_create(projects, batch_size=BATCH_SIZE)
+            new_ids = Project.objects.filter(profile_id=profile_id, id__gt=last_id).order_by("id").values_list(
+                "id", flat=True
+            )
+            for project, project_id in zip(projects, new_ids):
+                project.id = project_id
+
+        Through = Project.skills.through
+        Through.objects.bulk_create(
+            [
+                Through(project_id=project.id, skill_id=skill_id)
+                for project, item in zip(projects, items)
+                for skill_id in {skill_ids[skill["name"].lower()] for skill in item.get("skills", [])}
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # The batched inserts bypass m2m_changed and post_save
+        recount_project_counts(Skill.objects.filter(pk__in=skill_ids.values()))
+        index_projects(project.id for project in projects)
+
+    return projects
+
+
+def username_key(username):
+    """
+    ``username`` as MySQL's default collation compares it: case-insensitively,
+    so rows can come back spelled differently from what was sent.
+    """
+    return username.casefold()
+
+
+def provision_users(items):
+    """
+    Create users plus their empty profiles from validated ``items`` (dicts
+    with ``username`` and optional ``password``, ``email``, ``first_name``,
+    ``last_name``).
+
+    Returns one ``(status, user_id)`` per item, in order, where status is
+    ``created``, ``exists`` (username already taken) or ``duplicate``
+    (repeated earlier in the batch, ignoring case). Collisions are found with
+    one IN query, passwords are hashed in parallel and rows are inserted in
+    batches.
+    """
+    results = [None] * len(items)
+    first_seen = {}
+    for index, item in enumerate(items):
+        key = username_key(item["username"])
+        if key in first_seen:
+            results[index] = ("duplicate", None)
+        else:
+            first_seen[key] = index
+
+    usernames = [items[index]["username"] for index in first_seen.values()]
+    taken = {username_key(username) for username in User.objects.filter(username__in=usernames).values_list(
+        "username", flat=True
+    )}
+    # A row the collation matched but casefold() doesn't (e.g. an accent
+    # variant) isn't in first_seen; its insert is skipped as a conflict below.
+    wanted = [index for key, index in first_seen.items() if key not in taken]
+    for key in taken & first_seen.keys():
+        results[first_seen[key]] = ("exists", None)
+
+    users = [
+        User(
+            username=items[index]["username"],
+            email=User.objects.normalize_email(items[index].get("email")),
+            first_name=items[index].get("first_name", ""),
+            last_name=items[index].get("last_name", ""),
+            password=password,
+        )
+        for index, password in zip(wanted, hash_passwords(items[index].get("password") for index in wanted))
+    ]
+
+    with transaction.atomic():
+        # A username registered since the IN query above is skipped rather
+        # than failing the whole batch.
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        # Neither ignore_conflicts nor MySQL return ids, so read them back.
+        # Salted hashes are unique, so a matching password marks our row.
+        ours = {username_key(user.username): user.password for user in users}
+        created = {}
+        for start in range(0, len(users), BATCH_SIZE):
+            usernames = [user.username for user in users[start:start + BATCH_SIZE]]
+            for username, user_id, password in User.objects.filter(username__in=usernames).values_list(
+                "username", "id", "password"
+            ):
+                key = username_key(username)
+                if ours.get(key) == password:
+                    created[key] = user_id
+        UserProfile.objects.bulk_create(
+            [UserProfile(user_id=user_id) for user_id in created.values()], batch_size=BATCH_SIZE
+        )
+
+    for index in wanted:
+        user_id = created.get(username_key(items[index]["username"]))
+        results[index] = ("created", user_id) if user_id is not None else ("exists", None)
+    return results
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .snapshots import schedule_snapshot
+
+VERSION_KEY = "portfolio:version:{user_id}"
+RESPONSE_KEY = "portfolio:response:{user_id}:{version}:{url}"
+
+
+def _fresh_version():
+    # Seeded from the clock so an evicted counter never restarts at a value
+    # that older cached responses were stored under.
+    return int(time.time() * 1000)
+
+
+def get_profile_version(user_id):
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_profile_version(user_id, published=None):
+    """
+    Invalidate every cached read for this user's portfolio, and its published
+    snapshot. Pass ``published`` if the profile is already loaded.
+    """
+    schedule_snapshot(user_id, published)
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def compute_etag(data):
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(",", ":"))
+    return '"%s"' % hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def response_cache_key(request, user_id):
+    version = get_profile_version(user_id)
+    url = hashlib.sha1(request.build_absolute_uri().encode("utf-8")).hexdigest()
+    return RESPONSE_KEY.format(user_id=user_id, version=version, url=url)
+
+
+def cache_headers(etag):
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request, etag):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+    # Weak comparison: CompressionMiddleware sends the ETag as W/"..."
+    etags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+    return "*" in etags or etag in etags
+
+
+class ProfileCacheMixin:
+    """
+    Serve GETs from a per-user cache keyed by the portfolio version counter.
+
+    Write paths call ``bump_profile_version`` so stale entries are simply never
+    looked up again. Cached responses carry a strong ETag and a matching
+    ``If-None-Match`` is answered with 304 straight from the cache.
+    """
+
+    def get(self, request, *args, **kwargs):
+        key = response_cache_key(request, request.user.id)
+        cached = cache.get(key)
+        if cached is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cached = (compute_etag(response.data), response.data)
+            cache.set(key, cached, timeout=settings.PORTFOLIO_CACHE_TIMEOUT)
+
+        etag, data = cached
+        headers = cache_headers(etag)
+        if not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
@@ -0,0 +1,110 @@
+"""
+Conversion of the legacy "JSON string or plain text" work/education blobs
+into WorkEntry/EducationEntry rows, for the legacy /work-experience/ and
+/education/ endpoints, which write through to the entries. Migration 0005
+converted existing blobs with its own frozen copy of this parser.
+"""
+import json
+
+from django.db import transaction
+
+from .models import EducationEntry, WorkEntry
+
+# Where each entry field may be found in the old JSON blobs, most likely key first
+WORK_KEYS = {
+    'title': ['title', 'position', 'role', 'job_title'],
+    'company': ['company', 'organization', 'organisation', 'employer'],
+}
+EDUCATION_KEYS = {
+    'degree': ['degree', 'title', 'course', 'field', 'program'],
+    'institution': ['institution', 'school', 'university', 'college'],
+}
+COMMON_KEYS = {
+    'period': ['period', 'duration', 'dates', 'years'],
+    'description': ['description', 'details', 'summary', 'responsibilities'],
+}
+MAX_LENGTHS = {'title': 200, 'company': 200, 'degree': 200, 'institution': 200, 'period': 100}
+
+
+def _text(value):
+    if isinstance(value, list):
+        return '\n'.join(_text(item) for item in value)
+    return '' if value is None else str(value).strip()
+
+
+def _entry_from_text(text, heading):
+    # Plain text can't be split reliably, so it becomes one entry: the first
+    # line as its heading and the full text kept in the description.
+    first_line = text.splitlines()[0].strip()
+    rest = text[len(text.splitlines()[0]):].strip()
+    fits = len(first_line) <= MAX_LENGTHS[heading]
+    return {heading: first_line[:MAX_LENGTHS[heading]], 'description': rest if fits else text}
+
+
+def _entry_from_dict(item, keys, heading):
+    item = {str(key).lower(): value for key, value in item.items()}
+    entry = {}
+    for field, candidates in {**keys, **COMMON_KEYS}.items():
+        for key in candidates:
+            if _text(item.get(key)):
+                entry[field] = _text(item.pop(key))
+                break
+    if 'period' not in entry:
+        start = _text(item.pop('start', None) or item.pop('start_date', None) or item.pop('from', None))
+        end = _text(item.pop('end', None) or item.pop('end_date', None) or item.pop('to', None))
+        if start or end:
+            entry['period'] = f'{start}-{end or "Present"}'
+    # Keep anything unrecognised rather than dropping it
+    extra = [f'{key}: {_text(value)}' for key, value in item.items() if _text(value)]
+    if extra:
+        entry['description'] = '\n'.join(filter(None, [entry.get('description', '')] + extra))
+    for field, max_length in MAX_LENGTHS.items():
+        if len(entry.get(field, '')) > max_length:
+            entry['description'] = '\n'.join(filter(None, [entry.get('description', ''), entry[field]]))
+            entry[field] = entry[field][:max_length]
+    entry.setdefault(heading, '')
+    return entry
+
+
+def parse_entries(blob, keys, heading):
+    """Turn a legacy "JSON string or plain text" blob into entry field dicts."""
+    blob = (blob or '').strip()
+    if not blob:
+        return []
+    try:
+        data = json.loads(blob)
+    except ValueError:
+        return [_entry_from_text(blob, heading)]
+    if not isinstance(data, list):
+        data = [data]
+    entries = []
+    for item in data:
+        if isinstance(item, dict):
+            entries.append(_entry_from_dict(item, keys, heading))
+        elif _text(item):
+            entries.append(_entry_from_text(_text(item), heading))
+    return entries
+
+
+# model -> (blob field on UserProfile, key spellings, heading field)
+LEGACY_FIELDS = {
+    WorkEntry: ('work', WORK_KEYS, 'title'),
+    EducationEntry: ('education', EDUCATION_KEYS, 'degree'),
+}
+
+
+def replace_entries(profile, model, blob):
+    """
+    Store ``blob`` in the profile's legacy field and replace its ``model``
+    entries with the ones parsed from it, in one transaction.
+    """
+    field, keys, heading = LEGACY_FIELDS[model]
+    setattr(profile, field, blob)
+    with transaction.atomic():
+        profile.save(update_fields=[field])
+        model.objects.filter(profile=profile).delete()
+        entries = model.objects.bulk_create(
+            model(profile=profile, position=position, **fields)
+            for position, fields in enumerate(parse_entries(blob, keys, heading))
+        )
+    return entries
@@ -0,0 +1,105 @@
+import json
+
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import EducationEntry, Project, Skill, UserProfile, WorkEntry
+from .serializers import (
+    EducationEntrySerializer, ProjectSerializer, SkillSerializer, UserSerializer, WorkEntrySerializer
+)
+
+CHUNK_SIZE = 500
+PROFILE_FIELDS = ['education', 'work', 'github', 'linkedin', 'portfolio']
+
+
+def keyset_pages(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yield lists of up to ``chunk_size`` rows of ``queryset`` in primary-key
+    order.
+
+    Each page is its own ``WHERE id > last ORDER BY id LIMIT n`` query, so
+    prefetch_related runs once per page and only one page is ever held in
+    memory. (PyMySQL buffers whole result sets client side, so a single
+    ``iterator()`` query would not keep memory flat on MySQL.)
+    """
+    last_pk = None
+    while True:
+        page = queryset.order_by('pk')
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def keyset_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Rows of ``queryset`` in primary-key order, fetched a page at a time (see keyset_pages)."""
+    for chunk in keyset_pages(queryset, chunk_size):
+        yield from chunk
+
+
+def project_skills():
+    return Prefetch('skills', queryset=Skill.objects.order_by('id'))
+
+
+def profile_records(profile, skills, projects, work_entries, education_entries):
+    user_id = profile.user_id
+    yield {
+        'type': 'profile',
+        'user': UserSerializer(profile.user).data,
+        **{field: getattr(profile, field) for field in PROFILE_FIELDS},
+    }
+    for skill in skills:
+        yield {'type': 'skill', 'user_id': user_id, **SkillSerializer(skill).data}
+    for project in projects:
+        yield {'type': 'project', 'user_id': user_id, **ProjectSerializer(project).data}
+    for entry in work_entries:
+        yield {'type': 'work_entry', 'user_id': user_id, **WorkEntrySerializer(entry).data}
+    for entry in education_entries:
+        yield {'type': 'education_entry', 'user_id': user_id, **EducationEntrySerializer(entry).data}
+
+
+def iter_profile_records(profile, chunk_size=CHUNK_SIZE):
+    """One profile record, then one record per skill, project and work/education entry."""
+    return profile_records(
+        profile,
+        keyset_chunks(Skill.objects.filter(profile=profile), chunk_size),
+        keyset_chunks(Project.objects.filter(profile=profile).prefetch_related(project_skills()), chunk_size),
+        keyset_chunks(WorkEntry.objects.filter(profile=profile), chunk_size),
+        keyset_chunks(EducationEntry.objects.filter(profile=profile), chunk_size),
+    )
+
+
+def iter_all_records(chunk_size=CHUNK_SIZE):
+    """
+    Every profile's records. Each page of ``chunk_size`` profiles has its
+    skills, projects (with their skills) and entries prefetched together, so
+    the export costs a fixed number of queries per page, not per profile.
+    """
+    profiles = UserProfile.objects.select_related('user')
+    for chunk in keyset_pages(profiles, chunk_size):
+        prefetch_related_objects(
+            chunk,
+            Prefetch('skills', queryset=Skill.objects.order_by('id'), to_attr='export_skills'),
+            Prefetch(
+                'projects',
+                queryset=Project.objects.order_by('id').prefetch_related(project_skills()),
+                to_attr='export_projects',
+            ),
+            Prefetch('work_entries', queryset=WorkEntry.objects.order_by('id'), to_attr='export_work_entries'),
+            Prefetch(
+                'education_entries', queryset=EducationEntry.objects.order_by('id'), to_attr='export_education_entries'
+            ),
+        )
+        for profile in chunk:
+            yield from profile_records(
+                profile, profile.export_skills, profile.export_projects,
+                profile.export_work_entries, profile.export_education_entries,
+            )
+
+
+def ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record, cls=JSONEncoder, separators=(',', ':')).encode('utf-8') + b'\n'
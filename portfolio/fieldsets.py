@@ -0,0 +1,226 @@
+"""
+Sparse fieldsets and inline paging for GET /profile/.
+
+``?fields=github,projects.title`` keeps only the listed fields; dotted names
+pick fields inside a relation. ``?expand=skills,projects`` keeps the plain
+profile fields plus only the listed relations (``?expand=`` gives none), and
+can be combined with ``fields``. Unrequested relations are never queried and
+unrequested columns are deferred.
+
+``?projects_page=`` / ``?projects_page_size=`` (and the ``skills_`` pair)
+page those collections inline, rendering them as a
+``count``/``next``/``previous``/``results`` envelope.
+"""
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import UserProfile
+from .serializers import UserProfileSerializer
+
+PAGED_COLLECTIONS = ("projects", "skills")
+MAX_INLINE_PAGE_SIZE = 100
+
+
+def _fields(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return serializer.fields
+
+
+def _is_relation(field):
+    return isinstance(field, serializers.BaseSerializer)
+
+
+def _parse(value):
+    """``"a,b.c,b.d"`` -> ``{"a": None, "b": {"c": None, "d": None}}``; None means the whole field."""
+    tree = {}
+    for path in filter(None, (path.strip() for path in value.split(","))):
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            if part in node and node[part] is None:
+                break  # the whole field is already requested
+            node = node.setdefault(part, {})
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _merge(tree, other):
+    for name, sub in other.items():
+        if name not in tree or sub is None:
+            tree[name] = sub
+        elif tree[name] is not None:
+            _merge(tree[name], sub)
+    return tree
+
+
+def _resolve(serializer, requested, param, prefix=""):
+    """
+    Check ``requested`` against the serializer's fields and spell it out in
+    full, in serializer order: relations map to their own field trees,
+    plain fields to None.
+    """
+    fields = _fields(serializer)
+    unknown = sorted(prefix + name for name in requested if name not in fields)
+    if unknown:
+        raise ValidationError({param: [f"Unknown field: {name}" for name in unknown]})
+    tree = {}
+    for name, field in fields.items():
+        if name not in requested:
+            continue
+        if _is_relation(field):
+            tree[name] = _resolve(field, requested[name] or {n: None for n in _fields(field)}, param, f"{prefix}{name}.")
+        elif requested[name] is not None:
+            raise ValidationError({param: [f"{prefix}{name} has no nested fields"]})
+        else:
+            tree[name] = None
+    return tree
+
+
+def _columns(model, tree, *keys):
+    names = {field.name for field in model._meta.concrete_fields if not field.is_relation}
+    return [*keys, *(name for name in tree if name in names)]
+
+
+def _related_queryset(model, name, tree):
+    field = model._meta.get_field(name)
+    related = field.related_model
+    keys = [related._meta.pk.name]
+    if field.one_to_many:
+        keys.append(field.field.name)  # the FK the prefetch joins on
+    queryset = related.objects.only(*_columns(related, tree, *keys))
+    if not related._meta.ordering:
+        queryset = queryset.order_by("pk")
+    return queryset.prefetch_related(*_prefetches(related, tree))
+
+
+def _prefetches(model, tree, exclude=()):
+    prefetches = []
+    for name, sub in tree.items():
+        if sub is None or name in exclude:
+            continue
+        field = model._meta.get_field(name)
+        if field.one_to_many or field.many_to_many:
+            prefetches.append(Prefetch(name, _related_queryset(model, name, sub)))
+    return prefetches
+
+
+def _page_param(params, name, default):
+    try:
+        return int(params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+class InlinePage:
+    """One page of a nested collection, loaded with ``load()`` or ``aload()``."""
+
+    def __init__(self, name, queryset, number, size):
+        self.name = name
+        self.queryset = queryset
+        self.number = number
+        self.size = size
+        self.count = 0
+        self.rows = []
+
+    def _offset(self):
+        last = max(-(-self.count // self.size), 1)
+        if not 1 <= self.number <= last:
+            raise NotFound("Invalid page.")
+        return (self.number - 1) * self.size
+
+    def load(self):
+        self.count = self.queryset.count()
+        offset = self._offset()
+        self.rows = list(self.queryset[offset:offset + self.size])
+
+    async def aload(self):
+        self.count = await self.queryset.acount()
+        offset = self._offset()
+        self.rows = [row async for row in self.queryset[offset:offset + self.size]]
+
+    def envelope(self, field, url):
+        param = f"{self.name}_page"
+        previous = None
+        if self.number > 1:
+            previous = remove_query_param(url, param) if self.number == 2 else replace_query_param(url, param, self.number - 1)
+        return {
+            "count": self.count,
+            "next": replace_query_param(url, param, self.number + 1) if self.number * self.size < self.count else None,
+            "previous": previous,
+            "results": field.to_representation(self.rows),
+        }
+
+
+class ProfileFieldset:
+    """The parts of UserProfileSerializer one request asked for."""
+
+    serializer_class = UserProfileSerializer
+
+    def __init__(self, tree, paging):
+        self.tree = tree
+        self.paging = paging  # collection name -> (page, page_size)
+
+    @classmethod
+    def from_query(cls, params):
+        """Build from the query string, or return None when it asks for the full profile."""
+        paging = {}
+        for name in PAGED_COLLECTIONS:
+            if f"{name}_page" in params or f"{name}_page_size" in params:
+                size = _page_param(params, f"{name}_page_size", api_settings.PAGE_SIZE)
+                paging[name] = (_page_param(params, f"{name}_page", 1), min(max(size, 1), MAX_INLINE_PAGE_SIZE))
+        if "fields" not in params and "expand" not in params and not paging:
+            return None
+
+        fields = cls.serializer_class().fields
+        expand = _parse(params["expand"]) if "expand" in params else None
+        if "fields" in params:
+            requested = _parse(params["fields"])
+        else:
+            requested = {name: None for name, field in fields.items() if expand is None or not _is_relation(field)}
+        if expand:
+            invalid = sorted(name for name in expand if name not in fields or not _is_relation(fields[name]))
+            if invalid:
+                raise ValidationError({"expand": [f"Unknown relation: {name}" for name in invalid]})
+            _merge(requested, expand)
+        tree = _resolve(cls.serializer_class(), requested, "fields" if "fields" in params else "expand")
+        return cls(tree, {name: page for name, page in paging.items() if name in tree})
+
+    def queryset(self):
+        tree = self.tree
+        columns = _columns(UserProfile, tree, "id", "user")
+        queryset = UserProfile.objects.all()
+        if "user" in tree:
+            user_model = UserProfile._meta.get_field("user").related_model
+            columns += [f"user__{name}" for name in _columns(user_model, tree["user"])]
+            queryset = queryset.select_related("user")
+        return queryset.only(*columns).prefetch_related(*_prefetches(UserProfile, tree, exclude=self.paging))
+
+    def pages(self, profile):
+        """Unloaded pages for the collections being paged."""
+        return [
+            InlinePage(name, _related_queryset(UserProfile, name, self.tree[name]).filter(profile=profile), number, size)
+            for name, (number, size) in self.paging.items()
+        ]
+
+    def data(self, profile, pages, url):
+        serializer = self.serializer_class(profile)
+        self._prune(serializer, self.tree)
+        paged = {page.name: (page, _fields(serializer).pop(page.name)) for page in pages}
+        data = serializer.data
+        return {
+            name: paged[name][0].envelope(paged[name][1], url) if name in paged else data[name]
+            for name in self.tree
+        }
+
+    def _prune(self, serializer, tree):
+        fields = _fields(serializer)
+        for name in list(fields):
+            if name not in tree:
+                fields.pop(name)
+            elif tree[name] is not None:
+                self._prune(fields[name], tree[name])
@@ -0,0 +1,340 @@
+import http.client
+import itertools
+import json
+import math
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import URLResolver, get_resolver, resolve, reverse
+
+from portfolio.models import EducationEntry, Project, Skill, UserProfile, WorkEntry
+from portfolio.serializers import PortfolioTokenObtainPairSerializer
+from portfolio.synthetic import (
+    BENCH_PASSWORD, BENCH_PREFIX, bench_users, clear_dataset, seed_dataset, seeded_users, skill_name,
+)
+
+
+class Endpoint:
+    """One request shape. ``path`` and ``body`` may be callables taking a RequestContext."""
+
+    def __init__(self, name, method, path=None, body=None, auth='user', share=1.0):
+        self.name = name  # URL name, for the coverage check
+        self.method = method
+        self.path = path
+        self.body = body
+        self.auth = auth  # 'user', 'admin' or None
+        self.share = share  # fraction of --requests, for the password-hashing endpoints
+
+    def label(self):
+        if callable(self.path):
+            path = reverse(self.name, args=[0]).replace('/0/', '/<pk>/')
+        else:
+            path = self.path or reverse(self.name)
+        return f'{self.method} {path}'
+
+
+class RequestContext:
+    def __init__(self, index, user, run):
+        self.index = index
+        self.user = user
+        self.run = run
+
+
+ENDPOINTS = [
+    Endpoint('api_root', 'GET', auth=None),
+    Endpoint('simple_health', 'GET', auth=None),
+    Endpoint('metrics', 'GET', auth=None, share=0.05),
+    Endpoint('profile', 'GET'),
+    Endpoint('profile', 'GET', '/profile/?fields=github,linkedin,portfolio'),
+    Endpoint('profile', 'PATCH', body=lambda c: {'linkedin': f'https://linkedin.com/in/bench-{c.index}'}),
+    Endpoint('skills', 'GET'),
+    Endpoint('skills', 'POST', body=lambda c: {'name': f'Bench {c.run} {c.index}', 'level': 'Advanced'}),
+    Endpoint('skills-bulk', 'POST', body=lambda c: [{'name': skill_name(k), 'level': 'Advanced'} for k in range(5)]),
+    Endpoint('top-skills', 'GET'),
+    Endpoint('projects', 'GET'),
+    Endpoint('projects', 'GET', '/projects/?skill=Python'),
+    Endpoint('projects', 'POST', body=lambda c: {
+        'title': f'Bench project {c.run} {c.index}', 'description': 'Created by manage.py bench',
+        'skills': [{'name': 'Python'}, {'name': 'Django'}],
+    }),
+    Endpoint('projects-bulk', 'POST', body=lambda c: [
+        {'title': f'Bulk project {c.run} {c.index} {k}', 'description': 'Created by manage.py bench',
+         'skills': [{'name': skill_name(k)}]}
+        for k in range(5)
+    ]),
+    Endpoint('projects-search', 'GET', '/projects/search/?q=python+platform'),
+    Endpoint('work-experience', 'GET'),
+    Endpoint('work-experience', 'POST', body=lambda c: {'work': f'Software Engineer ({c.index})'}),
+    Endpoint('work-entries', 'GET'),
+    Endpoint('work-entries', 'POST', body=lambda c: {'title': 'Engineer', 'company': f'Bench {c.index}'}),
+    Endpoint('work-entry', 'PATCH', lambda c: reverse('work-entry', args=[c.user['work_entry']]),
+             body=lambda c: {'period': f'20{c.index % 25:02d}-Present'}),
+    Endpoint('education', 'GET'),
+    Endpoint('education', 'POST', body=lambda c: {'education': f'BSc ({c.index})'}),
+    Endpoint('education-entries', 'GET'),
+    Endpoint('education-entries', 'POST', body=lambda c: {'degree': 'MSc', 'institution': f'Bench {c.index}'}),
+    Endpoint('education-entry', 'PATCH', lambda c: reverse('education-entry', args=[c.user['education_entry']]),
+             body=lambda c: {'period': f'20{c.index % 25:02d}-2024'}),
+    Endpoint('social-links', 'GET'),
+    Endpoint('social-links', 'POST', body=lambda c: {'github': f'https://github.com/bench-{c.index}'}),
+    Endpoint('export', 'GET'),
+    Endpoint('publish', 'GET'),
+    Endpoint('publish', 'POST'),
+    Endpoint('token_refresh', 'POST', auth=None, body=lambda c: {'refresh': c.user['refresh']}),
+    # Each of these hashes a password, so they get a small share of the requests
+    Endpoint('token_obtain_pair', 'POST', auth=None, share=0.05,
+             body=lambda c: {'username': c.user['username'], 'password': BENCH_PASSWORD}),
+    Endpoint('register', 'POST', auth=None, share=0.05,
+             body=lambda c: {'username': f'{BENCH_PREFIX}reg-{c.run}-{c.index}', 'password': BENCH_PASSWORD}),
+    Endpoint('register-bulk', 'POST', auth='admin', share=0.02, body=lambda c: [
+        {'username': f'{BENCH_PREFIX}bulk-{c.run}-{c.index}-{k}', 'password': BENCH_PASSWORD} for k in range(10)
+    ]),
+]
+
+
+def route_names():
+    """Names of every reachable, non-namespaced route (admin is left out)."""
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace is None:
+                    yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif pattern.name:
+                yield pattern.name, prefix + str(pattern.pattern)
+
+    for name, route in walk(get_resolver().url_patterns, ''):
+        # Skip routes shadowed by an earlier one with the same path (portfolio's health/)
+        if '<' in route or resolve('/' + route).url_name == name:
+            yield name
+
+
+def percentile(ordered, pct):
+    # Nearest-rank percentile of an already sorted list
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset (reused between runs) and drive every API endpoint at a given '
+        'concurrency, in-process or against a running server with --url. Reports p50/p95/p99 latency, '
+        'requests/sec and queries per request for each endpoint as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--skills', type=int, default=15, help='Skills per user')
+        parser.add_argument('--projects', type=int, default=20, help='Projects per user')
+        parser.add_argument('--skills-per-project', type=int, default=3)
+        parser.add_argument('--reseed', action='store_true', help='Delete and re-create the dataset first')
+        parser.add_argument('--clear', action='store_true', help='Delete the dataset and exit')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients')
+        parser.add_argument('--only', help='Comma-separated URL names to run (default: all)')
+        parser.add_argument('--url', help='Base URL of a running server (default: in-process test client)')
+        parser.add_argument('--no-cache', action='store_true', help='In-process only: measure without the read cache')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+        parser.add_argument('--yes', action='store_true',
+                            help='Run even though DEBUG is off and the database has users of its own')
+
+    def handle(self, *args, **options):
+        if not options['yes'] and not settings.DEBUG and User.objects.exclude(pk__in=bench_users()).exists():
+            raise CommandError(
+                'DEBUG is off and this database has users that bench did not create; it looks like production. '
+                'bench seeds, writes and deletes rows, so pass --yes to run it here anyway.'
+            )
+        if options['clear']:
+            self.stdout.write(f'Deleted {clear_dataset()} rows')
+            return
+
+        uncovered = sorted(set(route_names()) - {endpoint.name for endpoint in ENDPOINTS})
+        if uncovered:
+            self.stderr.write(f'Not benchmarked (add them to ENDPOINTS): {", ".join(uncovered)}')
+        endpoints = ENDPOINTS
+        if options['only']:
+            names = set(options['only'].split(','))
+            endpoints = [endpoint for endpoint in ENDPOINTS if endpoint.name in names]
+            if not endpoints:
+                raise CommandError(f'No endpoints named {options["only"]}')
+
+        users = self.dataset(options)
+        admin = self.admin()
+        run = int(time.time())
+        if options['url']:
+            send, session = self.http_sender(options['url']), None
+        else:
+            send, session = self.client_sender, Client
+
+        caching = override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}) \
+            if options['no_cache'] and not options['url'] else nullcontext()
+        report = {'config': self.config(options), 'endpoints': {}}
+        started = time.perf_counter()
+        # The in-process client sends Host: testserver
+        with caching, override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for endpoint in endpoints:
+                count = max(1, round(options['requests'] * endpoint.share))
+                result = self.run_endpoint(endpoint, count, options['concurrency'], users, admin, run, send, session)
+                report['endpoints'][endpoint.label()] = result
+                queries = result['queries_per_request']
+                self.stdout.write(
+                    f'{endpoint.label():<48} {result["requests_per_sec"]:8.1f} req/s  p50 {result["p50_ms"]:7.1f}  '
+                    f'p95 {result["p95_ms"]:7.1f}  p99 {result["p99_ms"]:7.1f} ms  '
+                    f'{"-" if queries is None else f"{queries:.1f}":>5} queries  {result["errors"]} errors'
+                )
+        elapsed = time.perf_counter() - started
+        total = sum(result['requests'] for result in report['endpoints'].values())
+        report['total'] = {
+            'requests': total,
+            'errors': sum(result['errors'] for result in report['endpoints'].values()),
+            'seconds': elapsed,
+            'requests_per_sec': total / elapsed,
+        }
+        if uncovered:
+            report['not_benchmarked'] = uncovered
+
+        output = json.dumps(report)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+    def dataset(self, options):
+        if options['reseed']:
+            clear_dataset()
+        seeded = seeded_users()
+        if not seeded.exists():
+            started = time.perf_counter()
+            seed_dataset(options['users'], options['skills'], options['projects'], options['skills_per_project'])
+            self.stdout.write(f'Seeded {options["users"]} users in {time.perf_counter() - started:.1f}s')
+        else:
+            self.stdout.write(f'Reusing {seeded.count()} seeded users (--reseed to start over)')
+
+        work = dict(WorkEntry.objects.filter(profile__user__in=seeded).values_list('profile__user_id', 'id'))
+        education = dict(EducationEntry.objects.filter(profile__user__in=seeded).values_list('profile__user_id', 'id'))
+        profiles = dict(UserProfile.objects.filter(user__in=seeded).values_list('user_id', 'id'))
+        users = []
+        for user in seeded.order_by('id'):
+            refresh = PortfolioTokenObtainPairSerializer.get_token(user)
+            users.append({
+                'username': user.username,
+                'access': str(refresh.access_token),
+                'refresh': str(refresh),
+                'profile': profiles[user.id],
+                'work_entry': work[user.id],
+                'education_entry': education[user.id],
+            })
+        return users
+
+    def admin(self):
+        user, created = User.objects.get_or_create(username=f'{BENCH_PREFIX}admin', defaults={'is_staff': True})
+        if created:
+            UserProfile.objects.create(user=user)
+        return str(PortfolioTokenObtainPairSerializer.get_token(user).access_token)
+
+    def config(self, options):
+        try:
+            commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                    cwd=settings.BASE_DIR).stdout.strip() or None
+        except OSError:
+            commit = None
+        # Describe the dataset actually in the database, which may have been seeded by an earlier run
+        seeded = seeded_users()
+        return {
+            'commit': commit,
+            'target': options['url'] or 'in-process',
+            'database': connection.vendor,
+            'cache': not options['no_cache'],
+            'users': seeded.count(),
+            'skills': Skill.objects.filter(profile__user__in=seeded).count(),
+            'projects': Project.objects.filter(profile__user__in=seeded).count(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+        }
+
+    def run_endpoint(self, endpoint, count, concurrency, users, admin, run, send, session_factory):
+        indexes = itertools.count()
+        samples = []
+        lock = threading.Lock()
+
+        def worker(_):
+            session = session_factory() if session_factory else None
+            try:
+                while (index := next(indexes)) < count:
+                    context = RequestContext(index, users[index % len(users)], run)
+                    path = endpoint.path(context) if callable(endpoint.path) else endpoint.path or reverse(endpoint.name)
+                    body = endpoint.body(context) if endpoint.body else None
+                    token = {'user': context.user['access'], 'admin': admin}.get(endpoint.auth)
+                    started = time.perf_counter()
+                    status_code, queries = send(session, endpoint.method, path, body, token)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        samples.append((elapsed, status_code, queries))
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(concurrency, count)) as pool:
+            list(pool.map(worker, range(min(concurrency, count))))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency * 1000 for latency, _, _ in samples)
+        queries = [queries for _, _, queries in samples if queries is not None]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for _, status_code, _ in samples if status_code is None or status_code >= 400),
+            'requests_per_sec': len(samples) / elapsed,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'queries_per_request': sum(queries) / len(queries) if queries else None,
+        }
+
+    def client_sender(self, client, method, path, body, token):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        with connection.execute_wrapper(count):
+            client.raise_request_exception = False
+            response = client.generic(method, path, json.dumps(body) if body is not None else '',
+                                      content_type='application/json', headers=headers)
+            if response.streaming:
+                # Streamed bodies query while they're consumed
+                b''.join(response.streaming_content)
+        return response.status_code, queries
+
+    def http_sender(self, base_url):
+        url = urlsplit(base_url)
+        local = threading.local()
+
+        def send(_, method, path, body, token):
+            if getattr(local, 'connection', None) is None:
+                factory = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+                local.connection = factory(url.hostname, url.port, timeout=60)
+            headers = {'Content-Type': 'application/json'}
+            if token:
+                headers['Authorization'] = f'Bearer {token}'
+            try:
+                local.connection.request(method, url.path.rstrip('/') + path,
+                                         json.dumps(body) if body is not None else None, headers)
+                response = local.connection.getresponse()
+                response.read()
+                return response.status, None
+            except (OSError, http.client.HTTPException):
+                local.connection.close()
+                local.connection = None
+                return None, None
+
+        return send
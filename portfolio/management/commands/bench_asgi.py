@@ -0,0 +1,172 @@
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.models import Project, ProjectSkill, Skill, UserProfile
+
+ENDPOINTS = ['/health/', '/profile/', '/skills/', '/projects/', '/skills/top/']
+BENCH_USERNAME = 'bench-asgi'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the sync (WSGI) and async (ASGI) read endpoints at high concurrency. '
+        'Each mode is served by a real gunicorn on localhost with the same number of worker processes '
+        '(gthread workers for WSGI, uvicorn workers for ASGI) and driven by the same client pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100, help='Concurrent clients, each on its own keep-alive connection')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per client')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes for both servers (the Procfile runs 2)')
+        parser.add_argument(
+            '--threads', type=int, default=settings.GUNICORN_THREADS, help='Threads per WSGI worker (default: GUNICORN_THREADS)'
+        )
+        parser.add_argument('--projects', type=int, default=50, help='Projects seeded for the benchmark user')
+        parser.add_argument('--with-cache', action='store_true', help='Leave the response cache enabled')
+        parser.add_argument('--startup-timeout', type=float, default=30, help='Seconds to wait for a server to answer')
+
+    def handle(self, *args, **options):
+        token = self.seed(options['projects'])
+        headers = {'Authorization': f'Bearer {token}'}
+        results = {}
+        for mode in ('wsgi', 'asgi'):
+            port = free_port()
+            with self.server(mode, port, options):
+                # One untimed pass so both modes start with warm workers and connections
+                self.run_clients(port, options['workers'] * 2, 1, headers)
+                started = time.perf_counter()
+                latencies = self.run_clients(port, options['clients'], options['requests'], headers)
+                elapsed = time.perf_counter() - started
+            results[mode] = self.summarize(latencies, elapsed)
+            self.stdout.write(
+                f'{mode}: {results[mode]["requests_per_sec"]:.0f} req/s, {results[mode]["errors"]} errors, '
+                f'p50 {results[mode]["p50_ms"]:.1f} ms, p99 {results[mode]["p99_ms"]:.1f} ms '
+                f'({options["clients"]} clients, {options["workers"]} workers)'
+            )
+        self.stdout.write(json.dumps(results))
+
+    def seed(self, project_count):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        user, created = User.objects.get_or_create(username=BENCH_USERNAME)
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        if created:
+            Skill.objects.bulk_create([Skill(profile=profile, name=f'Skill{i}') for i in range(20)])
+            Project.objects.bulk_create([
+                Project(profile=profile, title=f'Project {i}', description='Benchmark project')
+                for i in range(project_count)
+            ])
+            # Re-read so ids are available on backends that don't return them
+            skills = list(profile.skills.all())
+            projects = list(profile.projects.all())
+            ProjectSkill.objects.bulk_create([
+                ProjectSkill(project=project, skill=skills[(i + j) % len(skills)])
+                for i, project in enumerate(projects) for j in range(3)
+            ])
+        return str(RefreshToken.for_user(user).access_token)
+
+    def server_command(self, mode, port, options):
+        argv = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(options['workers']),
+                '--log-level', 'warning']
+        if mode == 'wsgi':
+            return argv + ['--worker-class', 'gthread', '--threads', str(options['threads']), 'meapi.wsgi:application']
+        return argv + ['--worker-class', 'uvicorn.workers.UvicornWorker', 'meapi.asgi:application']
+
+    def server(self, mode, port, options):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': options['settings'] or os.environ.get('DJANGO_SETTINGS_MODULE', 'meapi.settings'),
+            'DJANGO_ASYNC_VIEWS': 'True' if mode == 'asgi' else 'False',
+        }
+        if not options['with_cache']:
+            # Measure the database path; the cache would answer every repeated GET after the first
+            env['DJANGO_CACHE_BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+        process = subprocess.Popen(self.server_command(mode, port, options), env=env, cwd=settings.BASE_DIR)
+        return RunningServer(process, port, options['startup_timeout'])
+
+    def run_clients(self, port, clients, requests, headers):
+        latencies = []
+        lock = threading.Lock()
+
+        def client(index):
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            try:
+                for i in range(requests):
+                    path = ENDPOINTS[(index + i) % len(ENDPOINTS)]
+                    started = time.perf_counter()
+                    try:
+                        connection.request('GET', path, headers={**headers, 'Host': 'localhost'})
+                        response = connection.getresponse()
+                        response.read()
+                        status_code = response.status
+                    except (OSError, http.client.HTTPException):
+                        connection.close()
+                        status_code = 599
+                    with lock:
+                        latencies.append((time.perf_counter() - started, status_code))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            list(pool.map(client, range(clients)))
+        return latencies
+
+    def summarize(self, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        return {
+            'requests': len(latencies),
+            'errors': sum(1 for _, status_code in results if status_code >= 400),
+            'requests_per_sec': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        }
+
+
+class RunningServer:
+    """Context manager around a gunicorn subprocess: waits until it answers, then stops it on exit."""
+
+    def __init__(self, process, port, timeout):
+        self.process = process
+        self.port = port
+        self.timeout = timeout
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f'Server exited with status {self.process.returncode} (is gunicorn/uvicorn installed?)')
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+                connection.request('GET', '/health/', headers={'Host': 'localhost'})
+                connection.getresponse().read()
+                connection.close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise CommandError(f'Server did not answer within {self.timeout:.0f} seconds')
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
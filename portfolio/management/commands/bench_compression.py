@@ -0,0 +1,120 @@
+import hashlib
+import json
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from portfolio import middleware
+from portfolio.export import iter_profile_records, ndjson_lines
+from portfolio.models import Project, ProjectSkill, Skill, UserProfile, profile_detail_queryset
+from portfolio.renderers import FastJSONRenderer
+from portfolio.serializers import UserProfileSerializer
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 9)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the CPU cost and bytes saved by each gzip level and brotli quality on a '
+        'synthetic /profile/ body and export stream, plus the cost of reusing cached compressed '
+        'bytes. Seeds a throwaway profile and rolls it back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=600, help='Projects on the profile (~0.7 KB each)')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per setting (median is reported)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                profile = self.seed(options['projects'])
+                profile = profile_detail_queryset().get(pk=profile.pk)
+                body = FastJSONRenderer().render(UserProfileSerializer(profile).data)
+                chunks = list(ndjson_lines(iter_profile_records(profile)))
+                raise Rollback
+        except Rollback:
+            pass
+
+        settings_to_try = [('gzip', level) for level in GZIP_LEVELS]
+        if middleware.brotli is not None:
+            settings_to_try += [('br', quality) for quality in BROTLI_QUALITIES]
+        else:
+            self.stdout.write('brotli is not installed; measuring gzip only')
+
+        results = {'profile_bytes': len(body), 'export_bytes': sum(map(len, chunks)), 'profile': {}, 'export': {}}
+        for encoding, level in settings_to_try:
+            label = f'{encoding}-{level}'
+            with override_settings(PORTFOLIO_GZIP_LEVEL=level, PORTFOLIO_BROTLI_QUALITY=level):
+                compressed, ms = self.measure(lambda: middleware.compress(body, encoding), options['repeat'])
+                results['profile'][label] = self.summary(len(body), len(compressed), ms)
+                streamed, ms = self.measure(
+                    lambda: b''.join(middleware.compress_stream(iter(chunks), encoding)), options['repeat']
+                )
+                results['export'][label] = self.summary(results['export_bytes'], len(streamed), ms)
+            self.stdout.write(
+                f'{label:>7}: profile {results["profile"][label]["ratio"]:.3f} of '
+                f'{len(body) / 1024:.0f} KB in {results["profile"][label]["ms"]:.2f} ms, '
+                f'export {results["export"][label]["ratio"]:.3f} in {results["export"][label]["ms"]:.2f} ms'
+            )
+
+        # What CompressionMiddleware pays for a cached read instead of compressing again
+        key = middleware.COMPRESSED_KEY.format(encoding='gzip', digest='bench')
+        cache.set(key, middleware.compress(body, 'gzip'))
+        _, reuse_ms = self.measure(
+            lambda: (hashlib.blake2b(body, digest_size=20).hexdigest(), cache.get(key)), options['repeat']
+        )
+        cache.delete(key)
+        results['cached_reuse_ms'] = reuse_ms
+        self.stdout.write(f'cached reuse (digest + cache get): {reuse_ms:.2f} ms')
+        self.stdout.write(json.dumps(results))
+
+    def seed(self, project_count):
+        user = User.objects.create(username='bench-compression')
+        profile = UserProfile.objects.create(user=user, github='https://github.com/bench-compression')
+        skills = Skill.objects.bulk_create([
+            Skill(profile=profile, name=name, level=level)
+            for name, level in zip(
+                ('Python', 'Django', 'PostgreSQL', 'React', 'TypeScript', 'Docker', 'AWS', 'Go'),
+                ('Advanced', 'Advanced', 'Intermediate', 'Intermediate', 'Beginner', 'Advanced', None, 'Beginner'),
+            )
+        ])
+        projects = Project.objects.bulk_create([
+            Project(
+                profile=profile,
+                title=f'Project {i}: {skills[i % len(skills)].name} service',
+                description=f'Built a {skills[i % len(skills)].name} service handling {i * 37} requests a second, '
+                            'with caching, background jobs and a test suite. ' * 4,
+                links=f'https://github.com/bench/project-{i},https://project-{i}.example.com',
+            )
+            for i in range(project_count)
+        ])
+        ProjectSkill.objects.bulk_create([
+            ProjectSkill(project=project, skill=skills[(i + k) % len(skills)])
+            for i, project in enumerate(projects) for k in range(3)
+        ])
+        return profile
+
+    def measure(self, fn, repeat):
+        timings = []
+        for _ in range(repeat + 1):  # the first run warms up
+            start = time.perf_counter()
+            result = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return result, statistics.median(timings[1:])
+
+    def summary(self, size, compressed, ms):
+        return {
+            'bytes': compressed,
+            'ratio': compressed / size,
+            'ms': ms,
+            'mb_per_sec': size / 1e6 / (ms / 1000),
+        }
@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from portfolio.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare requests/sec with and without persistent database connections. '
+        'Each simulated request goes through the same request_started/request_finished '
+        'signals Django uses to open, health-check and close connections.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Requests per mode'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=1,
+            help='Concurrent threads (1 mimics a sync worker, more mimics gthread)'
+        )
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=60,
+            help='CONN_MAX_AGE used for the reuse mode'
+        )
+
+    def handle(self, *args, **options):
+        results = {}
+        settings_dict = connections['default'].settings_dict
+        configured = settings_dict['CONN_MAX_AGE']
+        try:
+            for label, max_age in (('reconnect', 0), ('reuse', options['max_age'])):
+                results[label] = self.run(max_age, options['requests'], options['threads'])
+                self.stdout.write(f'{label:>9} (CONN_MAX_AGE={max_age}): {results[label]:.0f} requests/sec')
+        finally:
+            # Shared by every thread's connection, so put it back for whatever runs next
+            settings_dict['CONN_MAX_AGE'] = configured
+            connections.close_all()
+        if results['reconnect']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Connection reuse speedup: {results["reuse"] / results["reconnect"]:.2f}x'
+            ))
+
+    def run(self, max_age, requests, threads):
+        connections.close_all()
+        connections['default'].settings_dict['CONN_MAX_AGE'] = max_age
+
+        def worker(count):
+            for _ in range(count):
+                request_started.send(sender=self.__class__)
+                try:
+                    UserProfile.objects.filter(pk=0).exists()
+                finally:
+                    request_finished.send(sender=self.__class__)
+            connections.close_all()
+
+        per_thread = max(requests // threads, 1)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, [per_thread] * threads))
+        elapsed = time.perf_counter() - started
+        return per_thread * threads / elapsed
@@ -0,0 +1,137 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from portfolio.models import Skill, UserProfile
+
+READ_ENDPOINTS = ['/health/', '/skills/', '/skills/top/']
+BENCH_USERNAME = 'bench-login'
+BENCH_PASSWORD = 'bench-login-password'
+
+# (label, login storm running?, PASSWORD_HASH_WORKERS)
+MODES = [('baseline', False, None), ('inline', True, '0'), ('pool', True, None)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure read-endpoint latency while a burst of logins is running, with passwords '
+        'hashed inline versus in the bounded hashing pool. Each mode runs in its own subprocess.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='Clients reading other endpoints')
+        parser.add_argument('--logins', type=int, default=32, help='Clients logging in back to back')
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Requests the worker serves at once (the Procfile runs gthread workers with 8 threads)'
+        )
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per mode')
+        parser.add_argument('--mode', choices=[label for label, _, _ in MODES], help='Run a single mode (internal)')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            self.run_mode(options)
+            return
+
+        token = self.seed()
+        results = {}
+        for label, _, hash_workers in MODES:
+            env = {**os.environ, 'BENCH_TOKEN': token}
+            if hash_workers is not None:
+                env['PASSWORD_HASH_WORKERS'] = hash_workers
+            argv = [sys.executable, sys.argv[0], 'bench_login_storm', '--mode', label,
+                    '--readers', str(options['readers']), '--logins', str(options['logins']),
+                    '--threads', str(options['threads']), '--duration', str(options['duration'])]
+            if options['settings']:
+                argv += ['--settings', options['settings']]
+            output = subprocess.run(argv, env=env, check=True, capture_output=True, text=True).stdout
+            results[label] = json.loads(output.strip().splitlines()[-1])
+            result = results[label]
+            self.stdout.write(
+                f'{label:>8}: reads p50 {result["read_p50_ms"]:.1f} ms, p99 {result["read_p99_ms"]:.1f} ms, '
+                f'{result["reads_per_sec"]:.0f} reads/s; logins {result["logins_ok"]} ok, '
+                f'{result["logins_shed"]} shed'
+                + (f', p50 {result["login_p50_ms"]:.0f} ms' if result['login_p50_ms'] is not None else '')
+            )
+        self.stdout.write(json.dumps(results))
+
+    def seed(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        user, created = User.objects.get_or_create(username=BENCH_USERNAME)
+        if created:
+            user.set_password(BENCH_PASSWORD)
+            user.save()
+            profile, _ = UserProfile.objects.get_or_create(user=user)
+            Skill.objects.bulk_create([Skill(profile=profile, name=f'Skill{i}') for i in range(20)])
+        return str(RefreshToken.for_user(user).access_token)
+
+    def run_mode(self, options):
+        storm = dict((label, storm) for label, storm, _ in MODES)[options['mode']]
+        # Readers should measure queueing, not the response cache
+        with override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ):
+            result = self.storm(options, storm)
+        self.stdout.write(json.dumps(result))
+
+    def storm(self, options, storm):
+        # Requests queue for the worker's threads, like a gthread gunicorn worker
+        slots = threading.Semaphore(options['threads'])
+        stop = threading.Event()
+        headers = {'Authorization': f'Bearer {os.environ["BENCH_TOKEN"]}'}
+        reads, logins = [], []
+
+        def reader(index):
+            http = Client()
+            i = index
+            while not stop.is_set():
+                started = time.perf_counter()
+                with slots:
+                    http.get(READ_ENDPOINTS[i % len(READ_ENDPOINTS)], headers=headers)
+                reads.append(time.perf_counter() - started)
+                i += 1
+
+        def login(_):
+            http = Client()
+            credentials = {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}
+            while not stop.is_set():
+                started = time.perf_counter()
+                with slots:
+                    response = http.post('/auth/login/', credentials)
+                logins.append((time.perf_counter() - started, response.status_code))
+
+        # Warm up: start the hashing pool (if any) before the clock runs
+        Client().post('/auth/login/', {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+
+        clients = [reader] * options['readers'] + ([login] * options['logins'] if storm else [])
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            futures = [pool.submit(client, i) for i, client in enumerate(clients)]
+            time.sleep(options['duration'])
+            stop.set()
+            for future in futures:
+                future.result()
+
+        reads.sort()
+        ok = [latency for latency, code in logins if code == 200]
+        return {
+            'reads': len(reads),
+            'reads_per_sec': len(reads) / options['duration'],
+            'read_p50_ms': statistics.median(reads) * 1000,
+            'read_p99_ms': reads[int(len(reads) * 0.99) - 1] * 1000,
+            'logins_ok': len(ok),
+            'logins_shed': sum(1 for _, code in logins if code == 503),
+            'login_p50_ms': statistics.median(ok) * 1000 if ok else None,
+        }
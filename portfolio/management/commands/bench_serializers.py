@@ -0,0 +1,112 @@
+import json
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from portfolio.models import Project, ProjectSkill, Skill, UserProfile
+from portfolio.renderers import FastJSONRenderer
+from portfolio.serializers import ProjectRowSerializer, ProjectSerializer, SkillRowSerializer, SkillSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the ModelSerializer + JSONRenderer path with the values() row serializers + '
+        'FastJSONRenderer for a page of skills and of projects. Seeds a throwaway profile and '
+        'rolls it back afterwards; checks both paths return identical bytes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=500, help='Projects in the page')
+        parser.add_argument('--skills', type=int, default=50, help='Skills on the profile')
+        parser.add_argument('--skills-per-project', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per path (median is reported)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                profile = self.seed(options)
+                results = self.run(profile, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: model {result["model_ms"]:.2f} ms ({result["model_serialize_ms"]:.2f} ms serializing), '
+                f'rows {result["rows_ms"]:.2f} ms ({result["rows_serialize_ms"]:.2f} ms serializing), '
+                f'{result["speedup"]:.2f}x'
+            )
+        self.stdout.write(json.dumps(results))
+
+    def seed(self, options):
+        user = User.objects.create(username='bench-serializers')
+        profile = UserProfile.objects.create(user=user)
+        skills = Skill.objects.bulk_create([
+            Skill(profile=profile, name=f'Skill {i} – ünïcode', level='Advanced' if i % 2 else None)
+            for i in range(options['skills'])
+        ])
+        projects = Project.objects.bulk_create([
+            Project(profile=profile, title=f'Project {i}', description='Lorem ipsum dolor sit amet. ' * 8,
+                    links='https://example.com/a,https://example.com/b' if i % 3 else None)
+            for i in range(options['projects'])
+        ])
+        per_project = min(options['skills_per_project'], len(skills))
+        ProjectSkill.objects.bulk_create([
+            ProjectSkill(project=project, skill=skills[(i + k) % len(skills)])
+            for i, project in enumerate(projects) for k in range(per_project)
+        ])
+        return profile
+
+    def run(self, profile, repeat):
+        skills = Skill.objects.filter(profile=profile).order_by('id')
+        projects = Project.objects.filter(profile=profile).order_by('id')
+        paths = {
+            'skills': (
+                lambda: list(skills.all()),
+                lambda rows: JSONRenderer().render(SkillSerializer(rows, many=True).data),
+                lambda: list(skills.values(*SkillRowSerializer.values)),
+                lambda rows: FastJSONRenderer().render(SkillRowSerializer(rows, many=True).data),
+            ),
+            'projects': (
+                lambda: list(projects.prefetch_related(Prefetch('skills', queryset=Skill.objects.order_by('id')))),
+                lambda rows: JSONRenderer().render(ProjectSerializer(rows, many=True).data),
+                lambda: list(projects.values(*ProjectRowSerializer.values)),
+                # Includes the row serializer's skills query
+                lambda rows: FastJSONRenderer().render(ProjectRowSerializer(rows, many=True).data),
+            ),
+        }
+        results = {}
+        for name, (model_fetch, model_render, rows_fetch, rows_render) in paths.items():
+            model_body, model_total, model_serialize = self.measure(model_fetch, model_render, repeat)
+            rows_body, rows_total, rows_serialize = self.measure(rows_fetch, rows_render, repeat)
+            if model_body != rows_body:
+                raise CommandError(f'{name}: row serializer output differs from {name} ModelSerializer output')
+            results[name] = {
+                'bytes': len(model_body),
+                'model_ms': model_total,
+                'model_serialize_ms': model_serialize,
+                'rows_ms': rows_total,
+                'rows_serialize_ms': rows_serialize,
+                'speedup': model_total / rows_total,
+            }
+        return results
+
+    def measure(self, fetch, render, repeat):
+        totals, serializing = [], []
+        for _ in range(repeat + 1):  # the first run warms up
+            start = time.perf_counter()
+            rows = fetch()
+            fetched = time.perf_counter()
+            body = render(rows)
+            done = time.perf_counter()
+            totals.append((done - start) * 1000)
+            serializing.append((done - fetched) * 1000)
+        return body, statistics.median(totals[1:]), statistics.median(serializing[1:])
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.utils import DatabaseError, OperationalError
+
+
+def backoff_delays(initial, maximum):
+    """Exponential backoff with full jitter: a random wait up to initial, 2x, 4x, ... capped at maximum."""
+    delay = initial
+    while True:
+        yield random.uniform(0, delay)
+        delay = min(delay * 2, maximum)
+
+
+def unapplied_migrations(connection):
+    """Migrations on disk that the database hasn't recorded, read with a single query."""
+    table = connection.ops.quote_name(MigrationRecorder.Migration._meta.db_table)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT app, name FROM {table}")
+            applied = set(cursor.fetchall())
+    except DatabaseError:
+        # No migrations table yet: a fresh database
+        applied = set()
+    # Built without a connection, so loading the graph doesn't query again
+    graph = MigrationLoader(None, ignore_no_migrations=True).graph
+    return sorted(node for node in graph.nodes if node not in applied)
+
+
+def static_source_hash():
+    """Digest of every file collectstatic would copy (paths and contents) and the storage it copies into."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr(settings.STORAGES.get("staticfiles")).encode())
+    files = {}
+    for finder in finders.get_finders():
+        for path, storage in finder.list([]):
+            # First finder wins, as in collectstatic
+            files.setdefault(path, storage)
+    for path in sorted(files):
+        digest.update(path.encode() + b"\0")
+        with files[path].open(path) as f:
+            digest.update(hashlib.blake2b(f.read(), digest_size=20).digest())
+    return digest.hexdigest()
+
+
+def static_hash_path():
+    # Beside STATIC_ROOT, not in it, so it isn't served as a static file
+    return f"{os.path.normpath(settings.STATIC_ROOT)}.source-hash"
+
+
+class Command(BaseCommand):
+    help = (
+        'Get the app ready to serve: wait for the database, then migrate and collect static files '
+        'only if something changed since the last boot. Prints how long each phase took.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait for the database')
+        parser.add_argument('--initial-delay', type=float, default=0.1, help='First retry waits up to this long')
+        parser.add_argument('--max-delay', type=float, default=5, help='Longest wait between database retries')
+        parser.add_argument('--force', action='store_true', help='Run migrate and collectstatic even if up to date')
+        parser.add_argument('--skip-static', action='store_true', help="Don't check or collect static files")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to wait for and migrate')
+
+    def handle(self, *args, **options):
+        self.phases = {}
+        start = time.perf_counter()
+        connection = connections[options['database']]
+
+        with self.phase('database') as phase:
+            phase['attempts'] = self.wait_for_database(connection, options)
+
+        with self.phase('migrate') as phase:
+            pending = unapplied_migrations(connection)
+            phase['pending'] = len(pending)
+            if pending or options['force']:
+                for app, name in pending:
+                    self.stdout.write(f'  pending: {app}.{name}')
+                call_command('migrate', database=options['database'], interactive=False, verbosity=0)
+                phase['ran'] = True
+            else:
+                phase['ran'] = False
+
+        if not options['skip_static']:
+            with self.phase('collectstatic') as phase:
+                source_hash = static_source_hash()
+                try:
+                    with open(static_hash_path()) as f:
+                        collected_hash = f.read().strip()
+                except FileNotFoundError:
+                    collected_hash = None
+                unchanged = collected_hash == source_hash and os.path.isdir(settings.STATIC_ROOT)
+                if unchanged and not options['force']:
+                    phase['ran'] = False
+                else:
+                    call_command('collectstatic', interactive=False, verbosity=0)
+                    with open(static_hash_path(), 'w') as f:
+                        f.write(source_hash)
+                    phase['ran'] = True
+
+        total_ms = (time.perf_counter() - start) * 1000
+        for name, phase in self.phases.items():
+            detail = ', '.join(f'{key}={value}' for key, value in phase.items() if key != 'ms')
+            self.stdout.write(f'{name:>13}: {phase["ms"]:8.1f} ms  {detail}')
+        self.stdout.write(self.style.SUCCESS(f'{"total":>13}: {total_ms:8.1f} ms'))
+        self.stdout.write(json.dumps({'phases': self.phases, 'total_ms': round(total_ms, 1)}))
+
+    def wait_for_database(self, connection, options):
+        deadline = time.monotonic() + options['timeout']
+        delays = backoff_delays(options['initial_delay'], options['max_delay'])
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                connection.ensure_connection()
+                return attempts
+            except OperationalError as e:
+                # Drop the half-open connection so the next attempt starts clean
+                connection.close()
+                delay = next(delays)
+                if time.monotonic() + delay >= deadline:
+                    self.stdout.write(self.style.ERROR(
+                        f'Database unavailable after {attempts} attempts in {options["timeout"]:.0f} seconds: {e}'
+                    ))
+                    sys.exit(1)
+                self.stdout.write(f'Database unavailable ({e}); retrying in {delay:.2f}s')
+                time.sleep(delay)
+
+    @contextmanager
+    def phase(self, name):
+        """Time the block into ``phases[name]['ms']``; the block adds its own details."""
+        phase = self.phases[name] = {}
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase['ms'] = round((time.perf_counter() - start) * 1000, 1)
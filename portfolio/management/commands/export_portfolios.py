@@ -0,0 +1,36 @@
+import sys
+from django.core.management.base import BaseCommand
+
+from portfolio.export import CHUNK_SIZE, iter_all_records, ndjson_lines
+
+
+class Command(BaseCommand):
+    help = 'Stream every portfolio as NDJSON (one profile/skill/project per line)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='File to write to, or - for stdout'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Rows fetched per query'
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        stream = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        lines = 0
+        try:
+            for line in ndjson_lines(iter_all_records(options['chunk_size'])):
+                stream.write(line)
+                lines += 1
+        finally:
+            if stream is not sys.stdout.buffer:
+                stream.close()
+            else:
+                stream.flush()
+        self.stderr.write(self.style.SUCCESS(f'Exported {lines} records'))
@@ -0,0 +1,246 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolio.bulk import BATCH_SIZE, username_key
+from portfolio.search import index_projects
+from portfolio.export import PROFILE_FIELDS
+from portfolio.models import EducationEntry, Project, ProjectSkill, Skill, UserProfile, WorkEntry
+
+USER_FIELDS = ['username', 'email', 'first_name', 'last_name']
+# Record type -> key the records are collected under in a portfolio
+CHILD_RECORDS = {
+    'skill': 'skills',
+    'project': 'projects',
+    'work_entry': 'work_entries',
+    'education_entry': 'education_entries',
+}
+ENTRY_FIELDS = {
+    'work_entries': (WorkEntry, ['position', 'title', 'company', 'period', 'description']),
+    'education_entries': (EducationEntry, ['position', 'degree', 'institution', 'period', 'description']),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-load portfolios from a JSONL file in the export_portfolios format. '
+        'Progress is checkpointed after every committed batch so an interrupted run can resume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL file to load')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Profiles committed per transaction'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file (default: <path>.checkpoint)'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore any existing checkpoint and start from the beginning'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+        offset = 0 if options['restart'] else self.read_checkpoint(checkpoint)
+        if offset:
+            self.stdout.write(f'Resuming from byte {offset}')
+
+        started = time.monotonic()
+        totals = Counter()
+        with open(path, 'rb') as source:
+            source.seek(offset)
+            for batch, next_offset in self.read_batches(source, options['batch_size']):
+                batch_started = time.monotonic()
+                counts = self.load_batch(batch)
+                self.write_checkpoint(checkpoint, next_offset)
+                totals.update(counts)
+                elapsed = time.monotonic() - batch_started
+                rows = sum(counts.values()) - counts['skipped']
+                self.stdout.write(
+                    f'{totals["profiles"]} profiles loaded, {counts["skipped"]} skipped in batch, '
+                    f'{rows / elapsed if elapsed else rows:.0f} rows/sec'
+                )
+
+        elapsed = time.monotonic() - started
+        rows = sum(totals.values()) - totals['skipped']
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {totals["profiles"]} profiles, {totals["skills"]} skills, {totals["projects"]} projects '
+            f'({totals["skipped"]} skipped) in {elapsed:.1f}s, {rows / elapsed if elapsed else rows:.0f} rows/sec'
+        ))
+
+    def read_checkpoint(self, checkpoint):
+        try:
+            with open(checkpoint) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def write_checkpoint(self, checkpoint, offset):
+        # Write-then-rename so a crash never leaves a truncated checkpoint
+        tmp = f'{checkpoint}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(str(offset))
+        os.replace(tmp, checkpoint)
+
+    def read_batches(self, source, batch_size):
+        """
+        Group records into portfolios (a profile record followed by its skill,
+        project and entry records) and yield ``batch_size`` portfolios at a time with
+        the byte offset just past the batch.
+        """
+        batch, current = [], None
+        offset = source.tell()
+        for line in iter(source.readline, b''):
+            line_start, offset = offset, source.tell()
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise CommandError(f'Invalid JSON at byte {line_start}: {e}')
+            kind = record.get('type')
+            if kind == 'profile':
+                if len(batch) == batch_size:
+                    yield batch, line_start
+                    batch = []
+                current = {'profile': record, **{key: [] for key in CHILD_RECORDS.values()}}
+                batch.append(current)
+            elif kind in CHILD_RECORDS:
+                if current is None:
+                    raise CommandError(f'{kind} record at byte {line_start} has no preceding profile')
+                current[CHILD_RECORDS[kind]].append(record)
+            else:
+                raise CommandError(f'Unknown record type {kind!r} at byte {line_start}')
+        if batch:
+            yield batch, offset
+
+    def load_batch(self, batch):
+        counts = Counter()
+        # Usernames are matched the way MySQL's collation does, as in
+        # bulk.provision_users: "Bob" and "bob" are the same user.
+        by_username = {}
+        for portfolio in batch:
+            by_username.setdefault(username_key(portfolio['profile']['user']['username']), portfolio)
+        # Already-present users were loaded by an earlier (possibly crashed) run
+        existing = {username_key(username) for username in User.objects.filter(
+            username__in=[p['profile']['user']['username'] for p in by_username.values()]
+        ).values_list('username', flat=True)}
+        portfolios = [p for key, p in by_username.items() if key not in existing]
+        if not portfolios:
+            counts['skipped'] = len(batch)
+            return counts
+
+        with transaction.atomic():
+            users = [self.build_user(p['profile']['user']) for p in portfolios]
+            # A username the collation matches but casefold() doesn't (e.g. an
+            # accent variant) is skipped rather than failing the batch
+            User.objects.bulk_create(users, batch_size=BATCH_SIZE, ignore_conflicts=True)
+            # Passwords are salted or unusable-random, so a match marks our row
+            ours = {username_key(user.username): user.password for user in users}
+            user_ids = {}
+            for username, user_id, password in User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list('username', 'id', 'password'):
+                if ours.get(username_key(username)) == password:
+                    user_ids[username_key(username)] = user_id
+            portfolios = [p for p in portfolios if username_key(p['profile']['user']['username']) in user_ids]
+            counts['skipped'] = len(batch) - len(portfolios)
+
+            UserProfile.objects.bulk_create([
+                UserProfile(
+                    user_id=user_ids[username_key(p['profile']['user']['username'])],
+                    **{field: p['profile'].get(field) for field in PROFILE_FIELDS},
+                )
+                for p in portfolios
+            ], batch_size=BATCH_SIZE)
+            profile_ids = dict(UserProfile.objects.filter(user_id__in=user_ids.values()).values_list('user_id', 'id'))
+            for p in portfolios:
+                p['profile_id'] = profile_ids[user_ids[username_key(p['profile']['user']['username'])]]
+
+            skills = []
+            for p in portfolios:
+                wanted = {}
+                for record in p['skills'] + [s for project in p['projects'] for s in project.get('skills', [])]:
+                    key = record['name'].lower()
+                    skill = wanted.setdefault(key, Skill(profile_id=p['profile_id'], name=record['name']))
+                    skill.level = record.get('level') or skill.level
+                # project_count is known up front, so no recount is needed afterwards
+                uses = Counter(
+                    key for project in p['projects']
+                    for key in {s['name'].lower() for s in project.get('skills', [])}
+                )
+                for key, skill in wanted.items():
+                    skill.project_count = uses[key]
+                skills.extend(wanted.values())
+            Skill.objects.bulk_create(skills, batch_size=BATCH_SIZE)
+            skill_ids = {
+                (profile_id, name.lower()): skill_id
+                for skill_id, profile_id, name in Skill.objects.filter(
+                    profile_id__in=profile_ids.values()
+                ).values_list('id', 'profile_id', 'name')
+            }
+
+            Project.objects.bulk_create([
+                Project(
+                    profile_id=p['profile_id'],
+                    title=record['title'],
+                    description=record.get('description', ''),
+                    links=record.get('links'),
+                )
+                for p in portfolios for record in p['projects']
+            ], batch_size=BATCH_SIZE)
+            # The profiles are brand new, so their projects are exactly the rows
+            # just inserted, and ids ascend in insertion order. Pair them back up
+            # by id instead of relying on the backend returning ids.
+            project_ids = defaultdict(list)
+            for project_id, profile_id in Project.objects.filter(
+                profile_id__in=profile_ids.values()
+            ).order_by('id').values_list('id', 'profile_id'):
+                project_ids[profile_id].append(project_id)
+
+            links = []
+            for p in portfolios:
+                for project_id, record in zip(project_ids[p['profile_id']], p['projects']):
+                    for skill_id in {skill_ids[(p['profile_id'], s['name'].lower())] for s in record.get('skills', [])}:
+                        links.append(ProjectSkill(project_id=project_id, skill_id=skill_id))
+            ProjectSkill.objects.bulk_create(links, batch_size=BATCH_SIZE)
+            index_projects(project_id for ids in project_ids.values() for project_id in ids)
+
+            for key, (model, fields) in ENTRY_FIELDS.items():
+                entries = [
+                    model(profile_id=p['profile_id'], **{field: record[field] for field in fields if field in record})
+                    for p in portfolios for record in p[key]
+                ]
+                model.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+                counts[key] = len(entries)
+
+        counts['users'] = counts['profiles'] = len(portfolios)
+        counts['skills'] = len(skills)
+        counts['projects'] = sum(len(p['projects']) for p in portfolios)
+        counts['links'] = len(links)
+        return counts
+
+    def build_user(self, data):
+        user = User(**{field: data.get(field) or '' for field in USER_FIELDS})
+        password = data.get('password')
+        if not password:
+            user.set_unusable_password()
+            return user
+        try:
+            identify_hasher(password)
+            user.password = password  # already hashed by the source system
+        except ValueError:
+            user.password = make_password(password)
+        return user
@@ -0,0 +1,75 @@
+import io
+import os
+import pstats
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.profiling import PROFILE_HEADER, list_profiles, sign_token
+
+SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls')
+
+
+class Command(BaseCommand):
+    help = (
+        'Summarize the request profiles saved by ProfilingMiddleware: merged per view, '
+        'most expensive functions first. --sign prints a header value that asks for a profile.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', help='Only this view (URL name, e.g. profile or projects)')
+        parser.add_argument('--method', help='Only this HTTP method')
+        parser.add_argument('--limit', type=int, default=20, help='Functions listed per view')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='cumulative', help='Order functions by')
+        parser.add_argument('--full-paths', action='store_true', help="Don't strip directories from file names")
+        parser.add_argument('--output', help='Also write the merged stats of --view to this file (for snakeviz etc.)')
+        parser.add_argument('--sign', action='store_true', help=f'Print a signed {PROFILE_HEADER} header and exit')
+        parser.add_argument('--clear', action='store_true', help='Delete the saved profiles and exit')
+
+    def handle(self, *args, **options):
+        if options['sign']:
+            self.stdout.write(f'{PROFILE_HEADER}: {sign_token()}')
+            self.stdout.write(f'Valid for {settings.PORTFOLIO_PROFILE_TOKEN_MAX_AGE} seconds')
+            return
+
+        profiles = list_profiles()
+        if options['clear']:
+            for profile in profiles:
+                os.remove(profile['path'])
+            self.stdout.write(self.style.SUCCESS(f'Deleted {len(profiles)} profile(s)'))
+            return
+
+        if options['view']:
+            profiles = [profile for profile in profiles if profile['view'] == options['view']]
+        if options['method']:
+            profiles = [profile for profile in profiles if profile['method'] == options['method'].upper()]
+        if options['output'] and not options['view']:
+            raise CommandError('--output needs --view: merging different views gives a meaningless profile')
+        if not profiles:
+            self.stdout.write(f'No profiles in {settings.PORTFOLIO_PROFILE_DIR}')
+            return
+
+        by_view = {}
+        for profile in profiles:
+            by_view.setdefault(profile['view'], []).append(profile)
+        for view, group in sorted(by_view.items()):
+            methods = ', '.join(f'{method} x{count}' for method, count in sorted(Counter(p['method'] for p in group).items()))
+            first, last = (datetime.fromtimestamp(p['time'] / 1e9).strftime('%Y-%m-%d %H:%M:%S') for p in (group[0], group[-1]))
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{view}: {len(group)} profile(s) ({methods}), {first} to {last}'))
+            buffer = io.StringIO()
+            stats = pstats.Stats(*(p['path'] for p in group), stream=buffer)
+            if options['output']:
+                stats.dump_stats(options['output'])
+            if not options['full_paths']:
+                stats.strip_dirs()
+            # Per request, so views profiled different numbers of times compare
+            self.stdout.write(f'{stats.total_tt / len(group) * 1000:.1f} ms per request under the profiler')
+            # The heading above already says which files were merged
+            stats.files = []
+            stats.sort_stats(options['sort']).print_stats(options['limit'])
+            self.stdout.write(buffer.getvalue(), ending='')
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'Wrote merged stats to {options["output"]}'))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.models import UserProfile
+from portfolio.snapshots import clear_pending, pending_snapshots, write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the static snapshot of every published portfolio, e.g. after a deploy '
+        'that changes the serializers or on a host with an empty snapshot directory'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending', action='store_true',
+            help='Only rebuild snapshots whose scheduled rebuild never ran (e.g. the worker was killed)',
+        )
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            user_ids = pending_snapshots()
+        else:
+            user_ids = UserProfile.objects.filter(published=True, user__is_active=True).order_by(
+                'user_id'
+            ).values_list('user_id', flat=True).iterator()
+        count = 0
+        for user_id in user_ids:
+            started = time.time()
+            write_snapshot(user_id)
+            clear_pending(user_id, started)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} snapshot(s)'))
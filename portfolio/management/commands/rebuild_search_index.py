@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.models import Project
+from portfolio.search import BATCH_SIZE, index_projects
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project search documents (and so the full-text index) from the current projects and skills'
+
+    def handle(self, *args, **options):
+        total = 0
+        last_pk = 0
+        while True:
+            ids = list(Project.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            index_projects(ids)
+            total += len(ids)
+            last_pk = ids[-1]
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} project(s)'))
@@ -0,0 +1,36 @@
+import sys
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from portfolio.models import Skill, recount_project_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute Skill.project_count from the project/skill links, or verify it with --check'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Report skills whose stored count is wrong and exit non-zero instead of fixing them'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drifted = (
+                Skill.objects.annotate(actual=Count('projects'))
+                .exclude(project_count=F('actual'))
+                .values_list('id', 'name', 'project_count', 'actual')
+            )
+            count = 0
+            for skill_id, name, stored, actual in drifted.iterator():
+                count += 1
+                self.stdout.write(f'Skill {skill_id} ({name}): stored {stored}, actual {actual}')
+            if count:
+                self.stdout.write(self.style.ERROR(f'{count} skill(s) have a stale project_count'))
+                sys.exit(1)
+            self.stdout.write(self.style.SUCCESS('All project counts are correct'))
+            return
+
+        updated = recount_project_counts(Skill.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'Recounted {updated} skill(s)'))
@@ -0,0 +1,223 @@
+"""
+Request metrics shared across gunicorn workers.
+
+Each process aggregates counters and histograms in memory and, at most
+every PORTFOLIO_METRICS_FLUSH_INTERVAL seconds, writes its whole state to
+``<PORTFOLIO_METRICS_DIR>/<pid>.json`` (write-then-rename). /metrics sums
+every process's file into Prometheus text format. When a worker exits,
+gunicorn's child_exit hook folds its file into ``archive.json`` so counters
+never go backwards and files don't pile up as workers are recycled; files
+left by processes that exited any other way are folded in by the next
+collection. A lock file keeps readers from seeing a worker's numbers both
+in its own file and in the archive.
+"""
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+
+ARCHIVE = "archive.json"
+LOCK = ".lock"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "portfolio_requests_total": ("counter", "Requests served, by view, method and status code.", None),
+    "portfolio_request_duration_seconds": ("histogram", "Time to produce the response.", DURATION_BUCKETS),
+    "portfolio_request_queries": ("histogram", "Database queries per request.", QUERY_BUCKETS),
+    "portfolio_request_sql_seconds": ("histogram", "Time spent in database queries per request.", DURATION_BUCKETS),
+    "portfolio_request_render_seconds": ("histogram", "Time spent rendering the response body.", RENDER_BUCKETS),
+    "portfolio_budget_exceeded_total": ("counter", "Requests over the query or latency budget.", None),
+}
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+def _merge(into, state):
+    for key, value in state.items():
+        if isinstance(value, list):
+            current = into.setdefault(key, [0] * len(value))
+            for i, v in enumerate(value):
+                current[i] += v
+        else:
+            into[key] = into.get(key, 0) + value
+    return into
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write(path, state):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(directory, mode):
+    with open(os.path.join(directory, LOCK), "a") as lock:
+        fcntl.flock(lock, mode)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class MetricsStore:
+    """This process's metrics. Counters are plain numbers; a histogram is its bucket counts plus sum and count."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._state = {}
+        self._flushed = 0.0
+
+    def _own_state(self):
+        # A forked worker (gunicorn --preload) starts from zero, not the master's numbers
+        if self._pid != os.getpid():
+            self._reset()
+        return self._state
+
+    def inc(self, name, labels, amount=1):
+        key = _key(name, labels)
+        with self._lock:
+            state = self._own_state()
+            state[key] = state.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = _key(name, labels)
+        with self._lock:
+            state = self._own_state()
+            # One slot per bucket, then +Inf, sum and count
+            histogram = state.setdefault(key, [0] * (len(buckets) + 3))
+            histogram[bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def reset(self):
+        """Drop this process's numbers without writing them."""
+        with self._lock:
+            self._reset()
+
+    def maybe_flush(self):
+        if time.monotonic() - self._flushed >= settings.PORTFOLIO_METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            state = dict((key, list(value) if isinstance(value, list) else value)
+                         for key, value in self._own_state().items())
+            self._flushed = time.monotonic()
+        if not state:
+            return
+        directory = settings.PORTFOLIO_METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        _write(os.path.join(directory, f"{self._pid}.json"), state)
+
+    def collect(self):
+        """Every process's metrics, summed."""
+        self.flush()
+        directory = settings.PORTFOLIO_METRICS_DIR
+        if not os.path.isdir(directory):
+            return {}
+        for name in os.listdir(directory):
+            pid = name.removesuffix(".json")
+            if pid.isdigit() and not _process_exists(int(pid)):
+                # Exited without gunicorn's child_exit: another server, a
+                # management command, a killed worker
+                mark_process_dead(int(pid))
+        total = {}
+        with _locked(directory, fcntl.LOCK_SH):
+            for name in os.listdir(directory):
+                if name.endswith(".json"):
+                    _merge(total, _read(os.path.join(directory, name)))
+        return total
+
+
+store = MetricsStore()
+atexit.register(store.flush)
+
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def mark_process_dead(pid):
+    """Fold an exited worker's metrics into the archive (called from gunicorn's child_exit hook)."""
+    directory = settings.PORTFOLIO_METRICS_DIR
+    path = os.path.join(directory, f"{pid}.json")
+    if not os.path.exists(path):
+        return
+    with _locked(directory, fcntl.LOCK_EX):
+        # Another process may have folded it in while this one waited
+        if not os.path.exists(path):
+            return
+        archive = os.path.join(directory, ARCHIVE)
+        _write(archive, _merge(_read(archive), _read(path)))
+        os.remove(path)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(state):
+    """Prometheus text exposition format (version 0.0.4)."""
+    series = {}
+    for key, value in state.items():
+        name, pairs = json.loads(key)
+        series.setdefault(name, []).append((pairs, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        if name not in series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for pairs, value in sorted(series[name]):
+            if kind == "counter":
+                lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*buckets, "+Inf"], value):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(f"{name}_bucket{_labels([*pairs, ['le', le]])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(pairs)} {_number(value[-2])}")
+            lines.append(f"{name}_count{_labels(pairs)} {value[-1]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,456 @@
+import cProfile
+import hashlib
+import logging
+import time
+import zlib
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import AuthenticationFailed
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import MissingFileError
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+from .authentication import StatelessJWTAuthentication
+from .metrics import store
+from .profiling import PROFILE_HEADER, PROFILE_ID_HEADER, PROFILE_QUERY_FLAG, save_profile, valid_token
+from .snapshots import HASHED_NAME_RE, SNAPSHOT_NAME_RE
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+COMPRESSED_KEY = "portfolio:compressed:{encoding}:{digest}"
+# API payloads only: HTML pages (admin, browsable API) carry CSRF tokens next
+# to reflected input, and compressing them would expose those to BREACH.
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson")
+# Most expensive statements listed when a request goes over budget
+SLOW_REQUEST_STATEMENTS = 10
+
+logger = logging.getLogger("portfolio.metrics")
+
+
+class SnapshotWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also serves published portfolio snapshots (see
+    portfolio.snapshots) under PORTFOLIO_SNAPSHOT_URL.
+
+    WhiteNoise indexes its files once at startup, but snapshots are written
+    while the app runs, so they're looked up on disk per request instead.
+    Content-addressed snapshots get WhiteNoise's forever-cache headers.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        # Set first: WhiteNoise calls immutable_file_test while indexing
+        self.snapshot_prefix = ensure_leading_trailing_slash(settings.PORTFOLIO_SNAPSHOT_URL)
+        self.snapshot_root = settings.PORTFOLIO_SNAPSHOT_ROOT
+        super().__init__(get_response, settings)
+
+    def __call__(self, request):
+        path = request.path_info
+        if path.startswith(self.snapshot_prefix):
+            static_file = self.find_snapshot(path)
+            if static_file is not None:
+                return self.serve(static_file, request)
+        return super().__call__(request)
+
+    def find_snapshot(self, url):
+        name = url[len(self.snapshot_prefix):]
+        if not (SNAPSHOT_NAME_RE.match(name) or HASHED_NAME_RE.match(name)):
+            return None
+        try:
+            return self.get_static_file(f"{self.snapshot_root}/{name}", url)
+        except MissingFileError:
+            return None
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.snapshot_prefix):
+            return bool(HASHED_NAME_RE.match(url[len(self.snapshot_prefix):]))
+        return super().immutable_file_test(path, url)
+
+
+def accepted_encoding(accept_encoding):
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header, or None."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip()
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 0.0
+        weights[coding.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if weights.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def compressor(encoding):
+    """A streaming compressor for ``encoding`` as a ``(process, flush, finish)`` triple."""
+    if encoding == "br":
+        stream = brotli.Compressor(quality=settings.PORTFOLIO_BROTLI_QUALITY)
+        return stream.process, stream.flush, stream.finish
+    # wbits=31: gzip container rather than a bare zlib stream
+    stream = zlib.compressobj(settings.PORTFOLIO_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return stream.compress, lambda: stream.flush(zlib.Z_SYNC_FLUSH), stream.flush
+
+
+def compress(body, encoding):
+    process, _, finish = compressor(encoding)
+    return process(body) + finish()
+
+
+def compress_stream(chunks, encoding):
+    process, flush, finish = compressor(encoding)
+    for chunk in chunks:
+        # Flushed per chunk: the compressor would otherwise hold small chunks
+        # back, and a streamed export's first rows must go out at once
+        yield process(chunk) + flush()
+    yield finish()
+
+
+async def acompress_stream(chunks, encoding):
+    process, flush, finish = compressor(encoding)
+    async for chunk in chunks:
+        yield process(chunk) + flush()
+    yield finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress JSON and NDJSON responses with brotli (when installed) or gzip,
+    whichever the client prefers. Bodies under PORTFOLIO_COMPRESS_MIN_SIZE
+    bytes, 304s and already-encoded responses are left alone; streaming
+    responses are compressed and flushed chunk by chunk.
+
+    Responses carrying an ETag come from the per-user read cache and repeat
+    the same body, so their compressed bytes are cached by content digest
+    and reused. The ETag is made weak, as Django's GZipMiddleware does.
+
+    Listed below WhiteNoise, which serves its own precompressed files.
+    """
+
+    def process_response(self, request, response):
+        if response.status_code == 304 or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < settings.PORTFOLIO_COMPRESS_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = accepted_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers["Content-Length"]
+        else:
+            body = response.content
+            if response.has_header("ETag"):
+                digest = hashlib.blake2b(body, digest_size=20).hexdigest()
+                key = COMPRESSED_KEY.format(encoding=encoding, digest=digest)
+                compressed = cache.get(key)
+                if compressed is None:
+                    compressed = compress(body, encoding)
+                    cache.set(key, compressed, timeout=settings.PORTFOLIO_CACHE_TIMEOUT)
+            else:
+                compressed = compress(body, encoding)
+            if len(compressed) >= len(body):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+# The RequestTimer of the request being handled in this context. A thread's
+# connections can't be told which request they serve: an async view runs its
+# queries through sync_to_async on another thread, and asgiref carries the
+# context across to it.
+current_timer = ContextVar("portfolio_request_timer", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper on every connection; hands the query to the current request's timer, if any."""
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    """Called for every new connection (see portfolio.signals)."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestTimer:
+    """
+    One request's timings. Fed by record_query while it is the current
+    timer, it counts queries and their time and groups statements by SQL
+    text (parameters are never kept).
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql = 0.0
+        self.render = 0.0
+        self.render_start = None
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.sql += elapsed
+            stats = self.statements.setdefault(sql, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def install(self):
+        current_timer.set(self)
+
+    def uninstall(self):
+        if current_timer.get() is self:
+            current_timer.set(None)
+
+    def rendering(self):
+        self.render_start = time.perf_counter()
+
+    def rendered(self, response):
+        if self.render_start is not None:
+            self.render += time.perf_counter() - self.render_start
+            self.render_start = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request and count its database queries, then:
+
+    - add a ``Server-Timing`` header (db, render, app and total, in ms) so
+      browser dev tools show where the time went;
+    - record per-view histograms for /metrics (see portfolio.metrics);
+    - log a warning, with the SQL it ran, for any request over
+      PORTFOLIO_QUERY_BUDGET queries or PORTFOLIO_LATENCY_BUDGET_MS.
+
+    "render" is DRF turning response data into bytes. A streaming response's
+    header can only cover the time to its first byte; the recorded metrics
+    and budget checks wait until the stream has been sent.
+
+    Listed first so it sees everything below it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = self.start(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            timer.uninstall()
+            raise
+        return self.finish(request, response, timer)
+
+    async def __acall__(self, request):
+        timer = self.start(request)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            timer.uninstall()
+            raise
+        return self.finish(request, response, timer)
+
+    def start(self, request):
+        timer = request._metrics_timer = RequestTimer()
+        timer.install()
+        return timer
+
+    def process_template_response(self, request, response):
+        # The outermost middleware's hook runs last, immediately before render()
+        timer = request._metrics_timer
+        timer.rendering()
+        response.add_post_render_callback(timer.rendered)
+        return response
+
+    def finish(self, request, response, timer):
+        if settings.PORTFOLIO_SERVER_TIMING:
+            response.headers["Server-Timing"] = self.server_timing(timer, timer.elapsed())
+        if not response.streaming:
+            timer.uninstall()
+            self.record(request, response, timer)
+        elif response.is_async:
+            response.streaming_content = self.astream(response.streaming_content, request, response, timer)
+        else:
+            response.streaming_content = self.stream(response.streaming_content, request, response, timer)
+        return response
+
+    def stream(self, content, request, response, timer):
+        try:
+            yield from content
+        finally:
+            timer.uninstall()
+            self.record(request, response, timer)
+
+    async def astream(self, content, request, response, timer):
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            timer.uninstall()
+            self.record(request, response, timer)
+
+    def server_timing(self, timer, total):
+        app = max(total - timer.sql - timer.render, 0.0)
+        return (
+            f'db;dur={timer.sql * 1000:.1f};desc="{timer.queries} queries", '
+            f"render;dur={timer.render * 1000:.1f}, app;dur={app * 1000:.1f}, total;dur={total * 1000:.1f}"
+        )
+
+    def record(self, request, response, timer):
+        total = timer.elapsed()
+        match = request.resolver_match
+        view = match.view_name if match is not None else "unresolved"
+        store.inc("portfolio_requests_total", {"view": view, "method": request.method, "status": response.status_code})
+        store.observe("portfolio_request_duration_seconds", {"view": view, "method": request.method}, total)
+        store.observe("portfolio_request_queries", {"view": view}, timer.queries)
+        store.observe("portfolio_request_sql_seconds", {"view": view}, timer.sql)
+        store.observe("portfolio_request_render_seconds", {"view": view}, timer.render)
+
+        over = []
+        if timer.queries > settings.PORTFOLIO_QUERY_BUDGET:
+            over.append("queries")
+        if total * 1000 > settings.PORTFOLIO_LATENCY_BUDGET_MS:
+            over.append("latency")
+        for budget in over:
+            store.inc("portfolio_budget_exceeded_total", {"view": view, "budget": budget})
+        if over:
+            self.log_slow_request(request, response, view, timer, total, over)
+        store.maybe_flush()
+
+    def log_slow_request(self, request, response, view, timer, total, over):
+        statements = sorted(timer.statements.items(), key=lambda item: item[1][1], reverse=True)
+        lines = [
+            f"  {count}x {seconds * 1000:.1f} ms  {sql}"
+            for sql, (count, seconds) in statements[:SLOW_REQUEST_STATEMENTS]
+        ]
+        if len(statements) > SLOW_REQUEST_STATEMENTS:
+            lines.append(f"  ... and {len(statements) - SLOW_REQUEST_STATEMENTS} more distinct statements")
+        logger.warning(
+            "%s %s (%s) over %s budget: %d in %.0f ms, %d queries in %.0f ms, render %.0f ms\n%s",
+            request.method, request.path, view, " and ".join(over), response.status_code, total * 1000,
+            timer.queries, timer.sql * 1000, timer.render * 1000, "\n".join(lines),
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Run a single request under cProfile on demand and save the profile (see
+    portfolio.profiling). A request asks for it with a signed
+    X-Portfolio-Profile header, or with ``?profile=1`` when its user (JWT
+    or admin session) is staff. The response names the saved file in
+    X-Portfolio-Profile-Id.
+
+    Any other request costs a header lookup, and nothing at all when
+    PORTFOLIO_PROFILING is off. A streaming response is profiled up to its
+    first byte only.
+
+    Listed after AuthenticationMiddleware so admin sessions can use the flag.
+    Under ASGI it stays async, so async views don't pay a thread hop; the
+    profile then covers the event loop thread only, including any other
+    requests it serves meanwhile, and not work sent to sync_to_async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PORTFOLIO_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.requested(request):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        return self.finish(request, response, profiler)
+
+    async def __acall__(self, request):
+        # The staff check may query the database; it only runs for flagged requests
+        if PROFILE_QUERY_FLAG in request.META.get("QUERY_STRING", "") and PROFILE_HEADER not in request.headers:
+            requested = await sync_to_async(self.requested)(request)
+        else:
+            requested = self.requested(request)
+        if not requested:
+            return await self.get_response(request)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        return await sync_to_async(self.finish)(request, response, profiler)
+
+    def finish(self, request, response, profiler):
+        match = request.resolver_match
+        name = save_profile(profiler, request.method, match.view_name if match is not None else "unresolved")
+        response.headers[PROFILE_ID_HEADER] = name
+        return response
+
+    def requested(self, request):
+        token = request.headers.get(PROFILE_HEADER)
+        if token is not None:
+            return valid_token(token)
+        if PROFILE_QUERY_FLAG in request.META.get("QUERY_STRING", "") and request.GET.get(PROFILE_QUERY_FLAG) == "1":
+            return self.is_staff(request)
+        return False
+
+    def is_staff(self, request):
+        session_user = getattr(request, "user", None)
+        if session_user is not None and session_user.is_staff:
+            return True
+        try:
+            authenticated = StatelessJWTAuthentication().authenticate(request)
+            return authenticated is not None and authenticated[0].is_staff
+        except AuthenticationFailed:
+            return False
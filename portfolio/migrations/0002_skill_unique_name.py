@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def merge_duplicate_skills(apps, schema_editor):
+    """Fold case-insensitive duplicate skills into the oldest row so the constraint can be added."""
+    Skill = apps.get_model('portfolio', 'Skill')
+    Through = Skill.projects.through
+    duplicates = (
+        Skill.objects.values('profile_id', lname=Lower('name'))
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+    )
+    for group in duplicates:
+        skills = list(
+            Skill.objects.alias(lname=Lower('name'))
+            .filter(profile_id=group['profile_id'], lname=group['lname'])
+            .order_by('id')
+        )
+        survivor, extras = skills[0], skills[1:]
+        extra_ids = [skill.id for skill in extras]
+        linked = set(Through.objects.filter(skill_id=survivor.id).values_list('project_id', flat=True))
+        moved = set(Through.objects.filter(skill_id__in=extra_ids).values_list('project_id', flat=True))
+        Through.objects.bulk_create([
+            Through(project_id=project_id, skill_id=survivor.id) for project_id in moved - linked
+        ])
+        if not survivor.level:
+            survivor.level = next((skill.level for skill in extras if skill.level), None)
+            survivor.save(update_fields=['level'])
+        Skill.objects.filter(id__in=extra_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_skills, migrations.RunPython.noop),
+        # Leading on profile_id lets the index also serve "this profile's
+        # skill named X" lookups.
+        migrations.AddConstraint(
+            model_name='skill',
+            constraint=models.UniqueConstraint(models.F('profile'), django.db.models.functions.text.Lower('name'), name='unique_skill_name_per_profile'),
+        ),
+    ]
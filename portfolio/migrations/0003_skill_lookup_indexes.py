@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_skill_unique_name'),
+    ]
+
+    operations = [
+        # Adopt the auto-created M2M table as an explicit through model. The
+        # table, its columns and its unique (project_id, skill_id) index already
+        # exist, so only the migration state changes here.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ProjectSkill',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='portfolio.project')),
+                        ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='portfolio.skill')),
+                    ],
+                    options={
+                        'db_table': 'portfolio_project_skills',
+                        'unique_together': {('project', 'skill')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='project',
+                    name='skills',
+                    field=models.ManyToManyField(related_name='projects', through='portfolio.ProjectSkill', to='portfolio.skill'),
+                ),
+            ],
+        ),
+        # skill -> project lookups (top skills, ?skill= filter) read only this index
+        migrations.AddIndex(
+            model_name='projectskill',
+            index=models.Index(fields=['skill', 'project'], name='portfolio_ps_skill_proj_idx'),
+        ),
+    ]
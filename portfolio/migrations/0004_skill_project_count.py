@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_project_counts(apps, schema_editor):
+    Skill = apps.get_model('portfolio', 'Skill')
+    ProjectSkill = apps.get_model('portfolio', 'ProjectSkill')
+    actual = (
+        ProjectSkill.objects.filter(skill=OuterRef('pk'))
+        .values('skill')
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    Skill.objects.update(project_count=Coalesce(Subquery(actual), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_skill_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_project_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['profile', '-project_count'], name='portfolio_skill_top_idx'),
+        ),
+    ]
@@ -0,0 +1,147 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:10
+
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Where each entry field may be found in the old JSON blobs, most likely key first
+WORK_KEYS = {
+    'title': ['title', 'position', 'role', 'job_title'],
+    'company': ['company', 'organization', 'organisation', 'employer'],
+}
+EDUCATION_KEYS = {
+    'degree': ['degree', 'title', 'course', 'field', 'program'],
+    'institution': ['institution', 'school', 'university', 'college'],
+}
+COMMON_KEYS = {
+    'period': ['period', 'duration', 'dates', 'years'],
+    'description': ['description', 'details', 'summary', 'responsibilities'],
+}
+MAX_LENGTHS = {'title': 200, 'company': 200, 'degree': 200, 'institution': 200, 'period': 100}
+
+
+def _text(value):
+    if isinstance(value, list):
+        return '\n'.join(_text(item) for item in value)
+    return '' if value is None else str(value).strip()
+
+
+def _entry_from_text(text, heading):
+    # Plain text can't be split reliably, so it becomes one entry: the first
+    # line as its heading and the full text kept in the description.
+    first_line = text.splitlines()[0].strip()
+    rest = text[len(text.splitlines()[0]):].strip()
+    fits = len(first_line) <= MAX_LENGTHS[heading]
+    return {heading: first_line[:MAX_LENGTHS[heading]], 'description': rest if fits else text}
+
+
+def _entry_from_dict(item, keys, heading):
+    item = {str(key).lower(): value for key, value in item.items()}
+    entry = {}
+    for field, candidates in {**keys, **COMMON_KEYS}.items():
+        for key in candidates:
+            if _text(item.get(key)):
+                entry[field] = _text(item.pop(key))
+                break
+    if 'period' not in entry:
+        start = _text(item.pop('start', None) or item.pop('start_date', None) or item.pop('from', None))
+        end = _text(item.pop('end', None) or item.pop('end_date', None) or item.pop('to', None))
+        if start or end:
+            entry['period'] = f'{start}-{end or "Present"}'
+    # Keep anything unrecognised rather than dropping it
+    extra = [f'{key}: {_text(value)}' for key, value in item.items() if _text(value)]
+    if extra:
+        entry['description'] = '\n'.join(filter(None, [entry.get('description', '')] + extra))
+    for field, max_length in MAX_LENGTHS.items():
+        if len(entry.get(field, '')) > max_length:
+            entry['description'] = '\n'.join(filter(None, [entry.get('description', ''), entry[field]]))
+            entry[field] = entry[field][:max_length]
+    entry.setdefault(heading, '')
+    return entry
+
+
+def parse_entries(blob, keys, heading):
+    """Turn a legacy "JSON string or plain text" blob into entry field dicts."""
+    blob = (blob or '').strip()
+    if not blob:
+        return []
+    try:
+        data = json.loads(blob)
+    except ValueError:
+        return [_entry_from_text(blob, heading)]
+    if not isinstance(data, list):
+        data = [data]
+    entries = []
+    for item in data:
+        if isinstance(item, dict):
+            entries.append(_entry_from_dict(item, keys, heading))
+        elif _text(item):
+            entries.append(_entry_from_text(_text(item), heading))
+    return entries
+
+
+def copy_text_to_entries(apps, schema_editor):
+    UserProfile = apps.get_model('portfolio', 'UserProfile')
+    WorkEntry = apps.get_model('portfolio', 'WorkEntry')
+    EducationEntry = apps.get_model('portfolio', 'EducationEntry')
+    profiles = UserProfile.objects.exclude(work__isnull=True, education__isnull=True).values_list('id', 'work', 'education')
+    work, education = [], []
+    for profile_id, work_text, education_text in profiles.iterator(chunk_size=500):
+        work += [
+            WorkEntry(profile_id=profile_id, position=position, **fields)
+            for position, fields in enumerate(parse_entries(work_text, WORK_KEYS, 'title'))
+        ]
+        education += [
+            EducationEntry(profile_id=profile_id, position=position, **fields)
+            for position, fields in enumerate(parse_entries(education_text, EDUCATION_KEYS, 'degree'))
+        ]
+        if len(work) + len(education) >= 500:
+            WorkEntry.objects.bulk_create(work)
+            EducationEntry.objects.bulk_create(education)
+            work, education = [], []
+    WorkEntry.objects.bulk_create(work)
+    EducationEntry.objects.bulk_create(education)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_skill_project_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EducationEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('degree', models.CharField(max_length=200)),
+                ('institution', models.CharField(blank=True, max_length=200)),
+                ('period', models.CharField(blank=True, max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='education_entries', to='portfolio.userprofile')),
+            ],
+            options={
+                'ordering': ['position', 'id'],
+                'indexes': [models.Index(fields=['profile', 'position'], name='portfolio_edu_order_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('title', models.CharField(max_length=200)),
+                ('company', models.CharField(blank=True, max_length=200)),
+                ('period', models.CharField(blank=True, max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='work_entries', to='portfolio.userprofile')),
+            ],
+            options={
+                'ordering': ['position', 'id'],
+                'indexes': [models.Index(fields=['profile', 'position'], name='portfolio_work_order_idx')],
+            },
+        ),
+        migrations.RunPython(copy_text_to_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:13
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TEXT_INDEX_SQL = {
+    'mysql': (
+        [
+            'ALTER TABLE portfolio_projectsearch '
+            'ADD FULLTEXT INDEX portfolio_projectsearch_ft (title, description, links, skills)',
+        ],
+        ['ALTER TABLE portfolio_projectsearch DROP INDEX portfolio_projectsearch_ft'],
+    ),
+    'sqlite': (
+        [
+            # External-content FTS5 table: it stores only the index, the text
+            # stays in portfolio_projectsearch and the triggers keep them in step.
+            "CREATE VIRTUAL TABLE portfolio_projectsearch_fts USING fts5("
+            "title, description, links, skills, "
+            "content='portfolio_projectsearch', content_rowid='project_id', tokenize='unicode61')",
+            "CREATE TRIGGER portfolio_projectsearch_ai AFTER INSERT ON portfolio_projectsearch BEGIN "
+            "INSERT INTO portfolio_projectsearch_fts(rowid, title, description, links, skills) "
+            "VALUES (new.project_id, new.title, new.description, new.links, new.skills); END",
+            "CREATE TRIGGER portfolio_projectsearch_ad AFTER DELETE ON portfolio_projectsearch BEGIN "
+            "INSERT INTO portfolio_projectsearch_fts(portfolio_projectsearch_fts, rowid, title, description, links, skills) "
+            "VALUES ('delete', old.project_id, old.title, old.description, old.links, old.skills); END",
+            "CREATE TRIGGER portfolio_projectsearch_au AFTER UPDATE ON portfolio_projectsearch BEGIN "
+            "INSERT INTO portfolio_projectsearch_fts(portfolio_projectsearch_fts, rowid, title, description, links, skills) "
+            "VALUES ('delete', old.project_id, old.title, old.description, old.links, old.skills); "
+            "INSERT INTO portfolio_projectsearch_fts(rowid, title, description, links, skills) "
+            "VALUES (new.project_id, new.title, new.description, new.links, new.skills); END",
+            # Index the documents that already exist
+            "INSERT INTO portfolio_projectsearch_fts(portfolio_projectsearch_fts) VALUES ('rebuild')",
+        ],
+        [
+            'DROP TRIGGER IF EXISTS portfolio_projectsearch_ai',
+            'DROP TRIGGER IF EXISTS portfolio_projectsearch_ad',
+            'DROP TRIGGER IF EXISTS portfolio_projectsearch_au',
+            'DROP TABLE IF EXISTS portfolio_projectsearch_fts',
+        ],
+    ),
+}
+
+
+def create_text_index(apps, schema_editor):
+    # Other backends get no index; portfolio.search falls back to LIKE there
+    for sql in TEXT_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sql)
+
+
+def drop_text_index(apps, schema_editor):
+    for sql in TEXT_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sql)
+
+
+def build_documents(apps, schema_editor):
+    Project = apps.get_model('portfolio', 'Project')
+    ProjectSkill = apps.get_model('portfolio', 'ProjectSkill')
+    ProjectSearch = apps.get_model('portfolio', 'ProjectSearch')
+    skill_names = defaultdict(list)
+    for project_id, name in ProjectSkill.objects.order_by('skill_id').values_list('project_id', 'skill__name').iterator():
+        skill_names[project_id].append(name)
+    documents = (
+        ProjectSearch(
+            project_id=project_id, profile_id=profile_id, title=title, description=description,
+            links=links or '', skills=' '.join(skill_names[project_id]),
+        )
+        for project_id, profile_id, title, description, links in Project.objects.values_list(
+            'id', 'profile_id', 'title', 'description', 'links'
+        ).iterator()
+    )
+    ProjectSearch.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_work_education_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSearch',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='portfolio.project')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('links', models.TextField(blank=True)),
+                ('skills', models.TextField(blank=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.userprofile')),
+            ],
+        ),
+        # Documents first, so the index is built once over existing rows
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_text_index, drop_text_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_project_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='published',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,14 +1,20 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce, Lower
 from django.contrib.auth.models import User
 
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
+    # Legacy free-form blobs behind /work-experience/ and /education/; the
+    # structured data lives in WorkEntry and EducationEntry.
     education = models.TextField(blank=True, null=True)   # JSON string or plain text
     work = models.TextField(blank=True, null=True)        # JSON string or plain text
     github = models.URLField(blank=True, null=True)
     linkedin = models.URLField(blank=True, null=True)
     portfolio = models.URLField(blank=True, null=True)
+    # Served to anonymous visitors as a static snapshot (portfolio.snapshots)
+    published = models.BooleanField(default=False)
 
     def __str__(self):
         return self.user.username
@@ -18,6 +24,19 @@ class Skill(models.Model):
     profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="skills")
     name = models.CharField(max_length=100)
     level = models.CharField(max_length=50, blank=True, null=True)  # e.g. Beginner, Intermediate, Advanced
+    # Number of projects using this skill, kept in sync by portfolio.signals
+    project_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Top skills per profile is an index range read, no GROUP BY
+            models.Index(fields=["profile", "-project_count"], name="portfolio_skill_top_idx"),
+        ]
+        constraints = [
+            # One skill per name per profile, regardless of case. Leading on
+            # profile lets the same index serve case-insensitive name lookups.
+            models.UniqueConstraint("profile", Lower("name"), name="unique_skill_name_per_profile"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.profile.user.username})"
@@ -28,7 +47,112 @@ class Project(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     links = models.TextField(blank=True, null=True)  # JSON or comma-separated URLs
-    skills = models.ManyToManyField(Skill, related_name="projects")
+    skills = models.ManyToManyField(Skill, related_name="projects", through="ProjectSkill")
 
     def __str__(self):
         return f"{self.title} ({self.profile.user.username})"
+
+
+class ProjectSkill(models.Model):
+    # Explicit through model for Project.skills so the join table can carry
+    # a skill-first index; the table itself is the one Django auto-created.
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "portfolio_project_skills"
+        unique_together = [("project", "skill")]
+        indexes = [
+            models.Index(fields=["skill", "project"], name="portfolio_ps_skill_proj_idx"),
+        ]
+
+
+class ProjectSearch(models.Model):
+    """
+    One search document per project: its text plus its skill names, which
+    the full-text index is built on (see portfolio.search). Rewritten by
+    portfolio.signals whenever the project or its skills change.
+    """
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="+")
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    links = models.TextField(blank=True)
+    skills = models.TextField(blank=True)  # space-separated skill names
+
+
+class TokenRevocation(models.Model):
+    """
+    Access and refresh tokens for ``user_id`` issued before ``revoked_at``
+    (a Unix timestamp) are rejected. Not a foreign key, so the row outlives
+    a deleted user. See portfolio.authentication.RevocationCache.
+    """
+    user_id = models.IntegerField(primary_key=True)
+    revoked_at = models.FloatField()
+
+
+class WorkEntry(models.Model):
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="work_entries")
+    position = models.PositiveIntegerField(default=0)  # display order within the profile
+    title = models.CharField(max_length=200)
+    company = models.CharField(max_length=200, blank=True)
+    period = models.CharField(max_length=100, blank=True)  # e.g. "2022-Present"
+    description = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["position", "id"]
+        indexes = [
+            models.Index(fields=["profile", "position"], name="portfolio_work_order_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.profile_id})"
+
+
+class EducationEntry(models.Model):
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="education_entries")
+    position = models.PositiveIntegerField(default=0)  # display order within the profile
+    degree = models.CharField(max_length=200)
+    institution = models.CharField(max_length=200, blank=True)
+    period = models.CharField(max_length=100, blank=True)
+    description = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["position", "id"]
+        indexes = [
+            models.Index(fields=["profile", "position"], name="portfolio_edu_order_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.degree} ({self.profile_id})"
+
+
+def recount_project_counts(skills):
+    """Recompute ``project_count`` from the through table for a Skill queryset in one UPDATE."""
+    actual = (
+        ProjectSkill.objects.filter(skill=OuterRef("pk"))
+        .values("skill")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return skills.update(project_count=Coalesce(Subquery(actual), 0))
+
+
+def profile_detail_queryset():
+    """
+    Profiles with everything UserProfileSerializer touches loaded up front:
+    profile+user in one JOIN, then one query each for skills, projects, the
+    project<->skill M2M and the work/education entries, regardless of how
+    many projects a profile has.
+    """
+    return UserProfile.objects.select_related("user").prefetch_related(
+        Prefetch("skills", queryset=Skill.objects.order_by("id")),
+        Prefetch(
+            "projects",
+            queryset=Project.objects.order_by("id").prefetch_related(
+                Prefetch("skills", queryset=Skill.objects.order_by("id"))
+            ),
+        ),
+        "work_entries",
+        "education_entries",
+    )
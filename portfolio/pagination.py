@@ -0,0 +1,55 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opaque-cursor pagination over ``id``: each page is ``WHERE id > ? ORDER BY
+    id LIMIT n`` with no COUNT(*) and no OFFSET. Pass ``count=true`` to get the
+    total anyway.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.queryset = queryset
+        self.include_count = request.query_params.get('count', '').lower() in ('1', 'true')
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.include_count:
+            response.data['count'] = self.queryset.count()
+        return response
+
+
+class OptInCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination by default, switching to KeysetPagination when the
+    client sends ``pagination=cursor`` or follows a ``cursor`` link.
+    """
+    cursor_pagination_class = KeysetPagination
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get('pagination') == 'cursor'
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        # Keep page-number results in the same stable order as the cursor mode
+        return super().paginate_queryset(queryset.order_by('id'), request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
@@ -0,0 +1,137 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 is deliberately slow, so login and registration hash in a small,
+per-worker process pool instead of on the thread serving the request. At
+most ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE`` hashes can be running
+or waiting in one worker; anything beyond that is refused straight away
+with 503 + Retry-After rather than tying up more request threads.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHasherBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-ins in progress, please retry shortly.'
+    default_code = 'password_hasher_busy'
+
+    def __init__(self, wait):
+        super().__init__()
+        # DRF's exception handler turns this into a Retry-After header
+        self.wait = wait
+
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+_batch_executor = None
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _hash(raw_password):
+    return make_password(raw_password)
+
+
+def _hash_many(raw_passwords):
+    return [make_password(raw_password) for raw_password in raw_passwords]
+
+
+def _verify(raw_password, encoded):
+    # Mirrors User.check_password: also returns the re-hashed password when
+    # the stored one uses an outdated hasher or iteration count.
+    upgraded = []
+    valid = check_password(raw_password, encoded, setter=lambda password: upgraded.append(make_password(password)))
+    return valid, upgraded[0] if upgraded else None
+
+
+def _spawn_pool(workers):
+    # Pools are created lazily so each gunicorn worker gets its own after the
+    # fork; "spawn" because forking a threaded worker is unsafe.
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker
+    )
+
+
+def _get_pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            _executor = _spawn_pool(settings.PASSWORD_HASH_WORKERS)
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE)
+        return _executor, _slots
+
+
+def _get_batch_pool():
+    global _batch_executor
+    with _lock:
+        if _batch_executor is None:
+            _batch_executor = _spawn_pool(settings.PASSWORD_HASH_BATCH_WORKERS)
+        return _batch_executor
+
+
+def _reset_pool(executor):
+    global _executor, _batch_executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+        if _batch_executor is executor:
+            _batch_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_in_pool(fn, *args):
+    """Run ``fn(*args)`` in the hashing pool, or inline when it is disabled."""
+    if not settings.PASSWORD_HASH_WORKERS:
+        return fn(*args)
+    executor, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy(settings.PASSWORD_HASH_RETRY_AFTER)
+    try:
+        return executor.submit(fn, *args).result()
+    except BrokenProcessPool:
+        # A pool process died (e.g. OOM-killed); start a fresh pool next time
+        _reset_pool(executor)
+        raise
+    finally:
+        slots.release()
+
+
+def hash_password(raw_password):
+    return run_in_pool(_hash, raw_password)
+
+
+def verify_password(raw_password, encoded):
+    """Return ``(valid, upgraded_hash_or_None)``."""
+    return run_in_pool(_verify, raw_password, encoded)
+
+
+def hash_passwords(raw_passwords):
+    """
+    Hash a batch of passwords (``None`` gives an unusable password) across the
+    batch pool of PASSWORD_HASH_BATCH_WORKERS processes. It is separate from
+    the login pool so a big batch doesn't queue behind, or crowd out, logins.
+    """
+    raw_passwords = list(raw_passwords)
+    workers = min(settings.PASSWORD_HASH_BATCH_WORKERS, len(raw_passwords))
+    if workers <= 1:
+        return _hash_many(raw_passwords)
+    size = -(-len(raw_passwords) // workers)
+    chunks = [raw_passwords[i:i + size] for i in range(0, len(raw_passwords), size)]
+    executor = _get_batch_pool()
+    try:
+        return [encoded for chunk in executor.map(_hash_many, chunks) for encoded in chunk]
+    except BrokenProcessPool:
+        _reset_pool(executor)
+        raise
@@ -0,0 +1,84 @@
+"""
+On-demand request profiles (see ProfilingMiddleware and ``manage.py profiles``).
+
+A request is run under cProfile when it carries a signed
+``X-Portfolio-Profile`` header (``manage.py profiles --sign`` prints one) or,
+for staff users, a ``?profile=1`` query flag. Profiles are written to
+PORTFOLIO_PROFILE_DIR as ``<time_ns>-<pid>-<method>-<view>.prof`` and only
+the newest PORTFOLIO_PROFILE_KEEP are kept, whichever worker wrote them.
+"""
+import logging
+import os
+import re
+import time
+from contextlib import suppress
+
+from django.conf import settings
+from django.core.signing import BadSignature, TimestampSigner
+
+PROFILE_HEADER = "X-Portfolio-Profile"
+PROFILE_ID_HEADER = "X-Portfolio-Profile-Id"
+PROFILE_QUERY_FLAG = "profile"
+PROFILE_NAME_RE = re.compile(r"^(?P<time>\d+)-(?P<pid>\d+)-(?P<method>[A-Z]+)-(?P<view>[\w.-]+)\.prof$")
+
+logger = logging.getLogger(__name__)
+
+_SIGNER_SALT = "portfolio.profiling"
+_TOKEN_VALUE = "profile"
+
+
+def sign_token():
+    """A header value that requests a profile until PORTFOLIO_PROFILE_TOKEN_MAX_AGE seconds from now."""
+    return TimestampSigner(salt=_SIGNER_SALT).sign(_TOKEN_VALUE)
+
+
+def valid_token(value):
+    try:
+        signed = TimestampSigner(salt=_SIGNER_SALT).unsign(value, max_age=settings.PORTFOLIO_PROFILE_TOKEN_MAX_AGE)
+    except BadSignature:  # also SignatureExpired
+        return False
+    return signed == _TOKEN_VALUE
+
+
+def save_profile(profiler, method, view):
+    """Write ``profiler``'s stats into the ring and return the file name."""
+    directory = settings.PORTFOLIO_PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    view = re.sub(r"[^\w.-]", "_", view)
+    name = f"{time.time_ns()}-{os.getpid()}-{method}-{view}.prof"
+    path = os.path.join(directory, name)
+    profiler.dump_stats(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    logger.info("Saved request profile %s", name)
+    trim(directory, settings.PORTFOLIO_PROFILE_KEEP)
+    return name
+
+
+def trim(directory, keep):
+    """Drop all but the ``keep`` newest profiles."""
+    profiles = list_profiles(directory)
+    for profile in profiles[:max(len(profiles) - keep, 0)]:
+        # Another worker may be trimming too
+        with suppress(FileNotFoundError):
+            os.remove(profile["path"])
+
+
+def list_profiles(directory=None):
+    """Saved profiles, oldest first, as dicts of time, pid, method, view and path."""
+    directory = directory or settings.PORTFOLIO_PROFILE_DIR
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        match = PROFILE_NAME_RE.match(name)
+        if match:
+            profiles.append({
+                "time": int(match["time"]),
+                "pid": int(match["pid"]),
+                "method": match["method"],
+                "view": match["view"],
+                "path": os.path.join(directory, name),
+            })
+    return sorted(profiles, key=lambda profile: profile["time"])
@@ -0,0 +1,133 @@
+"""
+Full-text search over a profile's projects.
+
+Each project has a ProjectSearch document (title, description, links and
+skill names). The text index on it is a FULLTEXT index on MySQL and an
+external-content FTS5 table kept in step by triggers on SQLite; both are
+created in migration 0006. Lookups go through the index and stop after
+``limit`` ranked hits, so they don't scan every project of the profile.
+
+InnoDB doesn't index words shorter than innodb_ft_min_token_size (3 by
+default), so on MySQL terms like "Go" or "C" are matched as whole words with
+REGEXP over the profile's documents instead.
+"""
+import re
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Project, ProjectSearch, ProjectSkill
+
+BATCH_SIZE = 500
+SEARCH_LIMIT = 100
+MAX_TERMS = 16
+
+# FTS5 column weights for bm25(): title, description, links, skills
+FTS5_WEIGHTS = (10.0, 1.0, 0.5, 5.0)
+# InnoDB's default innodb_ft_min_token_size; shorter words aren't in the index
+MYSQL_MIN_TOKEN_SIZE = 3
+
+
+def index_projects(project_ids):
+    """(Re)build the search documents of the given projects."""
+    project_ids = sorted(set(project_ids))
+    for start in range(0, len(project_ids), BATCH_SIZE):
+        chunk = project_ids[start:start + BATCH_SIZE]
+        skill_names = defaultdict(list)
+        for project_id, name in ProjectSkill.objects.filter(project_id__in=chunk).order_by("skill_id").values_list(
+            "project_id", "skill__name"
+        ):
+            skill_names[project_id].append(name)
+        documents = [
+            ProjectSearch(
+                project_id=project_id,
+                profile_id=profile_id,
+                title=title,
+                description=description,
+                links=links or "",
+                skills=" ".join(skill_names[project_id]),
+            )
+            for project_id, profile_id, title, description, links in Project.objects.filter(pk__in=chunk).values_list(
+                "id", "profile_id", "title", "description", "links"
+            )
+        ]
+        with transaction.atomic():
+            # Delete + insert keeps the SQLite FTS triggers simple and works
+            # the same on every backend.
+            ProjectSearch.objects.filter(project_id__in=chunk).delete()
+            ProjectSearch.objects.bulk_create(documents)
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query or "")[:MAX_TERMS]
+
+
+def search_projects(profile_id, query, limit=SEARCH_LIMIT):
+    """Ids of ``profile_id``'s projects matching ``query``, best match first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if connection.vendor == "sqlite":
+        # Any term may match; bm25() ranks documents matching more (and rarer) terms higher
+        sql = (
+            "SELECT s.project_id FROM portfolio_projectsearch_fts f "
+            "JOIN portfolio_projectsearch s ON s.project_id = f.rowid "
+            "WHERE portfolio_projectsearch_fts MATCH %s AND s.profile_id = %s "
+            "ORDER BY bm25(portfolio_projectsearch_fts, {}) LIMIT %s".format(", ".join(map(str, FTS5_WEIGHTS)))
+        )
+        params = [" OR ".join(f'"{term}"' for term in terms), profile_id, limit]
+    elif connection.vendor == "mysql":
+        sql, params = mysql_search_sql(profile_id, terms, limit)
+    else:
+        # No text index on other backends: unranked substring match
+        condition = Q()
+        for term in terms:
+            for field in ("title", "description", "links", "skills"):
+                condition |= Q(**{f"{field}__icontains": term})
+        return list(
+            ProjectSearch.objects.filter(condition, profile_id=profile_id)
+            .order_by("project_id")
+            .values_list("project_id", flat=True)[:limit]
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def mysql_search_sql(profile_id, terms, limit):
+    """
+    The MySQL search statement and its parameters. Indexed terms go through
+    the FULLTEXT index; each shorter one adds a whole-word REGEXP match and
+    one point to the relevance.
+    """
+    indexed = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN_SIZE]
+    short = [term for term in terms if len(term) < MYSQL_MIN_TOKEN_SIZE]
+    match = "MATCH(title, description, links, skills) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+    if not short:
+        sql = (
+            f"SELECT project_id FROM portfolio_projectsearch WHERE {match} AND profile_id = %s "
+            f"ORDER BY {match} DESC LIMIT %s"
+        )
+        text = " ".join(indexed)
+        return sql, [text, profile_id, text, limit]
+
+    # Terms are \w+ only, so they need no escaping inside the pattern
+    word = "CONCAT_WS(' ', title, description, links, skills) REGEXP %s"
+    patterns = [f"(^|[^[:alnum:]_]){term}([^[:alnum:]_]|$)" for term in short]
+    conditions = [word] * len(short)
+    scores = [f"({word})"] * len(short)
+    params_where, params_order = list(patterns), list(patterns)
+    if indexed:
+        text = " ".join(indexed)
+        conditions.insert(0, match)
+        scores.insert(0, match)
+        params_where.insert(0, text)
+        params_order.insert(0, text)
+    sql = (
+        f"SELECT project_id FROM portfolio_projectsearch WHERE profile_id = %s AND ({' OR '.join(conditions)}) "
+        f"ORDER BY {' + '.join(scores)} DESC, project_id LIMIT %s"
+    )
+    return sql, [profile_id, *params_where, *params_order, limit]
@@ -1,6 +1,13 @@
+from collections import defaultdict
+
 from rest_framework import serializers
-from .models import UserProfile, Skill, Project
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import revocations
+from .models import UserProfile, Skill, Project, ProjectSkill, WorkEntry, EducationEntry
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 
 # Serializer for Skills
 class SkillSerializer(serializers.ModelSerializer):
@@ -16,18 +23,105 @@ class ProjectSerializer(serializers.ModelSerializer):
         model = Project
         fields = ['title', 'description', 'links', 'skills']
 
+# Read-only twins of SkillSerializer/ProjectSerializer for list endpoints.
+# They take ``.values()`` rows instead of model instances and build the same
+# output directly, skipping DRF's per-field machinery. ``values`` names the
+# columns to select.
+class SkillRowSerializer(serializers.BaseSerializer):
+    values = ('id', 'name', 'level')
+
+    def to_representation(self, row):
+        return {'name': row['name'], 'level': row['level']}
+
+class ProjectRowListSerializer(serializers.ListSerializer):
+    def to_representation(self, rows):
+        rows = list(rows)
+        # Every project's skills in one query, in skill id order
+        skills = defaultdict(list)
+        for project_id, name, level in ProjectSkill.objects.filter(
+            project_id__in=[row['id'] for row in rows]
+        ).order_by('skill_id').values_list('project_id', 'skill__name', 'skill__level'):
+            skills[project_id].append({'name': name, 'level': level})
+        return [
+            {'title': row['title'], 'description': row['description'], 'links': row['links'], 'skills': skills[row['id']]}
+            for row in rows
+        ]
+
+class ProjectRowSerializer(serializers.BaseSerializer):
+    values = ('id', 'title', 'description', 'links')
+
+    class Meta:
+        list_serializer_class = ProjectRowListSerializer
+
+# Work/education entries. Updates write only the columns that were sent.
+class EntrySerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
+class WorkEntrySerializer(EntrySerializer):
+    class Meta:
+        model = WorkEntry
+        fields = ['id', 'position', 'title', 'company', 'period', 'description']
+        extra_kwargs = {'position': {'required': False}}
+
+class EducationEntrySerializer(EntrySerializer):
+    class Meta:
+        model = EducationEntry
+        fields = ['id', 'position', 'degree', 'institution', 'period', 'description']
+        extra_kwargs = {'position': {'required': False}}
+
 # Serializer for User (optional, to show username/email)
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
 
+# One row of a batch registration. A plain Serializer rather than a
+# ModelSerializer so username uniqueness isn't checked with a query per row.
+class ProvisionUserSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    password = serializers.CharField(required=False, write_only=True)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    first_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+    last_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+
+    def validate_username(self, value):
+        return User.normalize_username(value)
+
 # Main UserProfile Serializer
 class UserProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)      # Nested user info
     skills = SkillSerializer(many=True, read_only=True)
     projects = ProjectSerializer(many=True, read_only=True)
+    work_entries = WorkEntrySerializer(many=True, read_only=True)
+    education_entries = EducationEntrySerializer(many=True, read_only=True)
 
     class Meta:
         model = UserProfile
-        fields = ['user', 'education', 'work', 'github', 'linkedin', 'portfolio', 'skills', 'projects']
+        fields = [
+            'user', 'education', 'work', 'github', 'linkedin', 'portfolio', 'skills', 'projects',
+            'work_entries', 'education_entries',
+        ]
+
+# Login serializer that stamps the caller's profile id into the JWT claims.
+# Refreshed access tokens copy it from the refresh token.
+class PortfolioTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        token['profile_id'] = profile.pk
+        return token
+
+# Requests authenticate from the access token alone, so refresh is where a
+# deactivated or revoked user is turned away for good.
+class PortfolioTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+        if revocations.is_revoked(refresh) or not User.objects.filter(pk=user_id, is_active=True).exists():
+            raise InvalidToken('Token has been revoked')
+        return super().validate(attrs)
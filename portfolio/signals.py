@@ -0,0 +1,150 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import revocations
+from .middleware import install_query_recorder
+from .models import Project, Skill, UserProfile, recount_project_counts
+from .search import index_projects
+from .snapshots import remove_snapshot, schedule_snapshot
+
+
+@receiver(m2m_changed, sender=Project.skills.through)
+def track_skill_project_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_add" and pk_set:
+        # pk_set only holds links that were actually inserted
+        if reverse:
+            Skill.objects.filter(pk=instance.pk).update(project_count=F("project_count") + len(pk_set))
+        else:
+            Skill.objects.filter(pk__in=pk_set).update(project_count=F("project_count") + 1)
+    elif action == "pre_clear" and not reverse:
+        instance._cleared_skill_ids = list(instance.skills.values_list("pk", flat=True))
+    elif action in ("post_remove", "post_clear"):
+        # remove() reports the ids it was asked for, not the ones it deleted,
+        # so recount the touched skills instead of trusting pk_set.
+        if reverse:
+            skill_ids = [instance.pk]
+        elif action == "post_remove":
+            skill_ids = pk_set
+        else:
+            skill_ids = getattr(instance, "_cleared_skill_ids", [])
+        if skill_ids:
+            recount_project_counts(Skill.objects.filter(pk__in=skill_ids))
+
+
+@receiver(pre_delete, sender=Project)
+def remember_deleted_project_skills(sender, instance, **kwargs):
+    # The cascade removes through rows without sending m2m_changed
+    instance._deleted_skill_ids = list(instance.skills.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Project)
+def release_deleted_project_skills(sender, instance, **kwargs):
+    skill_ids = getattr(instance, "_deleted_skill_ids", [])
+    if skill_ids:
+        Skill.objects.filter(pk__in=skill_ids, project_count__gt=0).update(project_count=F("project_count") - 1)
+
+
+@receiver(post_save, sender=Project)
+def index_saved_project(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_projects([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.skills.through)
+def index_relinked_projects(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        index_projects([instance.pk])
+    elif action == "post_clear":
+        # The links are already gone, so only the stash from pre_clear knows them
+        index_projects(getattr(instance, "_cleared_project_ids", []))
+    elif pk_set:
+        index_projects(pk_set)
+
+
+@receiver(m2m_changed, sender=Project.skills.through)
+def remember_cleared_skill_projects(sender, instance, action, reverse, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_project_ids = list(instance.projects.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Skill)
+def index_renamed_skill_projects(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # A new skill has no projects yet; saves that don't touch the name (e.g.
+    # level updates) can't change any document.
+    if created or raw or (update_fields is not None and "name" not in update_fields):
+        return
+    index_projects(instance.projects.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Skill)
+def remember_deleted_skill_projects(sender, instance, **kwargs):
+    # The cascade removes the links without sending m2m_changed
+    instance._deleted_project_ids = list(instance.projects.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Skill)
+def index_deleted_skill_projects(sender, instance, **kwargs):
+    # After commit: when the skill goes as part of a profile/user cascade,
+    # its projects are being deleted too and mustn't get fresh documents.
+    project_ids = getattr(instance, "_deleted_project_ids", [])
+    if project_ids:
+        transaction.on_commit(lambda: index_projects(project_ids))
+
+
+@receiver(pre_save, sender=User)
+def detect_credential_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Requests trust the access token, so tokens issued before a password
+    # change or deactivation have to be revoked explicitly.
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {"password", "is_active"} & set(update_fields):
+        return
+    previous = User.objects.filter(pk=instance.pk).values("password", "is_active").first()
+    instance._revoke_tokens = previous is not None and (
+        previous["password"] != instance.password or (previous["is_active"] and not instance.is_active)
+    )
+    instance._activation_changed = previous is not None and previous["is_active"] != instance.is_active
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_credential_change(sender, instance, **kwargs):
+    if getattr(instance, "_revoke_tokens", False):
+        instance._revoke_tokens = False
+        revocations.revoke(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def sync_snapshot_on_activation_change(sender, instance, **kwargs):
+    # A deactivated account's public portfolio is taken down at once; a
+    # reactivated one is rebuilt if it's still marked published.
+    if getattr(instance, "_activation_changed", False):
+        instance._activation_changed = False
+        user_id = instance.pk
+        if instance.is_active:
+            schedule_snapshot(user_id)
+        else:
+            transaction.on_commit(lambda: remove_snapshot(user_id))
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_user_delete(sender, instance, **kwargs):
+    revocations.revoke(instance.pk)
+
+
+@receiver(post_delete, sender=UserProfile)
+def remove_deleted_profile_snapshot(sender, instance, **kwargs):
+    # Also runs when the profile goes with its user
+    user_id = instance.user_id
+    transaction.on_commit(lambda: remove_snapshot(user_id))
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    # Every connection, so a request's queries count whichever thread runs them
+    install_query_recorder(connection)
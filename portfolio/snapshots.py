@@ -0,0 +1,243 @@
+"""
+Published portfolios as static JSON files.
+
+A published profile is rendered to ``<user_id>/<hash>.json`` (content
+addressed, cached forever) and ``<user_id>.json`` (stable URL, short cache)
+under PORTFOLIO_SNAPSHOT_ROOT, each with a gzip variant. SnapshotWhiteNoiseMiddleware
+serves them, so anonymous readers never reach a view or the database.
+
+Each rebuild moves the stable file to the new version; the version it
+replaced stays for PORTFOLIO_SNAPSHOT_GRACE seconds so clients that just
+read its URL can still fetch it.
+
+Writes call ``bump_profile_version``, which schedules a rebuild here if the
+profile is published; the rebuild runs on a background thread after the
+request's transaction commits. A marker file under
+PORTFOLIO_SNAPSHOT_PENDING_DIR records each scheduled rebuild until it has
+run, so rebuilds a recycled worker never got to are picked up by the next
+one (see ``SnapshotWorker.resume``).
+"""
+import gzip
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import suppress
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from rest_framework.renderers import JSONRenderer
+
+from .models import UserProfile, profile_detail_queryset
+from .serializers import UserProfileSerializer
+
+logger = logging.getLogger(__name__)
+
+# Paths relative to PORTFOLIO_SNAPSHOT_ROOT / PORTFOLIO_SNAPSHOT_URL
+SNAPSHOT_NAME_RE = re.compile(r"^[0-9]+\.json$")
+HASHED_NAME_RE = re.compile(r"^[0-9]+/[0-9a-f]{12}\.json$")
+
+
+def snapshot_name(user_id, digest=None):
+    return f"{user_id}/{digest}.json" if digest else f"{user_id}.json"
+
+
+def snapshot_url(user_id, digest=None):
+    return settings.PORTFOLIO_SNAPSHOT_URL.rstrip("/") + "/" + snapshot_name(user_id, digest)
+
+
+def _digest(body):
+    return hashlib.sha256(body).hexdigest()[:12]
+
+
+def _current_digest(user_id):
+    try:
+        with open(os.path.join(settings.PORTFOLIO_SNAPSHOT_ROOT, snapshot_name(user_id)), "rb") as f:
+            return _digest(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def current_snapshot_url(user_id):
+    """The content-addressed URL of ``user_id``'s current snapshot, or None if there isn't one yet."""
+    digest = _current_digest(user_id)
+    if digest is None or not os.path.exists(os.path.join(settings.PORTFOLIO_SNAPSHOT_ROOT, snapshot_name(user_id, digest))):
+        return None
+    return snapshot_url(user_id, digest)
+
+
+def render_snapshot(profile):
+    data = UserProfileSerializer(profile).data
+    # Public copy: the account email stays private
+    data["user"].pop("email", None)
+    return JSONRenderer().render(data)
+
+
+def _write(path, body):
+    # Write-then-rename so readers never see a half-written file
+    for target, content in ((path + ".gz", gzip.compress(body, mtime=0)), (path, body)):
+        tmp = f"{target}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, target)
+
+
+def _remove(path):
+    for target in (path, path + ".gz"):
+        try:
+            os.remove(target)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_versions(user_id, keep=None, grace=0):
+    # A superseded version's mtime is when it was superseded (see write_snapshot)
+    directory = os.path.join(settings.PORTFOLIO_SNAPSHOT_ROOT, str(user_id))
+    if not os.path.isdir(directory):
+        return
+    cutoff = time.time() - grace
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.endswith(".json") and name != keep:
+            with suppress(FileNotFoundError):
+                if os.path.getmtime(path) <= cutoff:
+                    _remove(path)
+
+
+def remove_snapshot(user_id):
+    _remove(os.path.join(settings.PORTFOLIO_SNAPSHOT_ROOT, snapshot_name(user_id)))
+    _remove_versions(user_id)
+
+
+def write_snapshot(user_id):
+    """
+    Re-render ``user_id``'s snapshot, or remove it if the profile isn't
+    published or the account is inactive. Returns the content-addressed URL,
+    or None.
+    """
+    profile = profile_detail_queryset().filter(user_id=user_id, published=True, user__is_active=True).first()
+    if profile is None:
+        remove_snapshot(user_id)
+        return None
+
+    body = render_snapshot(profile)
+    digest = _digest(body)
+    previous = _current_digest(user_id)
+    root = settings.PORTFOLIO_SNAPSHOT_ROOT
+    os.makedirs(os.path.join(root, str(user_id)), exist_ok=True)
+    hashed = os.path.join(root, snapshot_name(user_id, digest))
+    if not os.path.exists(hashed):
+        _write(hashed, body)
+    _write(os.path.join(root, snapshot_name(user_id)), body)
+    if previous is not None and previous != digest:
+        # Its grace period starts now, not when it was first written
+        with suppress(FileNotFoundError):
+            os.utime(os.path.join(root, snapshot_name(user_id, previous)))
+    _remove_versions(user_id, keep=f"{digest}.json", grace=settings.PORTFOLIO_SNAPSHOT_GRACE)
+    return snapshot_url(user_id, digest)
+
+
+def _marker_path(user_id):
+    return os.path.join(settings.PORTFOLIO_SNAPSHOT_PENDING_DIR, str(user_id))
+
+
+def _mark_pending(user_id):
+    path = _marker_path(user_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a"):
+        os.utime(path)
+
+
+def clear_pending(user_id, since):
+    """Drop ``user_id``'s pending marker, unless it was scheduled again after ``since``."""
+    with suppress(FileNotFoundError):
+        path = _marker_path(user_id)
+        if os.path.getmtime(path) <= since:
+            os.remove(path)
+
+
+def pending_snapshots():
+    """User ids whose scheduled rebuild hasn't run yet, in any worker."""
+    try:
+        names = os.listdir(settings.PORTFOLIO_SNAPSHOT_PENDING_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(int(name) for name in names if name.isdigit())
+
+
+class SnapshotWorker:
+    """
+    Background thread that rebuilds snapshots. Changes to the same profile
+    within PORTFOLIO_SNAPSHOT_DELAY seconds collapse into one rebuild.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+
+    def schedule(self, user_id):
+        _mark_pending(user_id)
+        with self._condition:
+            self._pending.setdefault(user_id, time.monotonic() + settings.PORTFOLIO_SNAPSHOT_DELAY)
+            # Started lazily, and again in a forked (gunicorn) worker
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="portfolio-snapshots", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def resume(self):
+        """Queue the rebuilds left pending by workers that have since exited."""
+        for user_id in pending_snapshots():
+            self.schedule(user_id)
+
+    def _take_due(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                due = [user_id for user_id, at in self._pending.items() if at <= now]
+                if due:
+                    for user_id in due:
+                        del self._pending[user_id]
+                    return due
+                wait = min(self._pending.values()) - now if self._pending else None
+                self._condition.wait(wait)
+
+    def _run(self):
+        while True:
+            for user_id in self._take_due():
+                started = time.time()
+                try:
+                    write_snapshot(user_id)
+                except Exception:
+                    # The marker stays, so the next worker to resume retries it
+                    logger.exception("Failed to rebuild portfolio snapshot for user %s", user_id)
+                else:
+                    clear_pending(user_id, started)
+            close_old_connections()
+
+
+worker = SnapshotWorker()
+
+
+def schedule_snapshot(user_id, published=None):
+    """
+    Rebuild ``user_id``'s snapshot off the request path once the current
+    transaction commits, if the profile is published. Callers that already
+    hold the profile pass ``published``; otherwise it is read after the commit.
+    """
+    def run():
+        if published is None and not UserProfile.objects.filter(user_id=user_id, published=True).exists():
+            return
+        if settings.PORTFOLIO_SNAPSHOT_DELAY is None:
+            write_snapshot(user_id)
+        else:
+            worker.schedule(user_id)
+
+    # Unpublishing removes the snapshot itself (see PublishView.delete)
+    if published is not False:
+        transaction.on_commit(run)
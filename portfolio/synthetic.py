@@ -0,0 +1,126 @@
+"""
+Synthetic portfolios for benchmarking (see ``manage.py bench``).
+
+Every row is written with bulk_create in batches; all users share one
+password hash so seeding doesn't spend minutes in PBKDF2. Bench users are
+recognised by the exact usernames generated here and by ``manage.py bench``,
+never by prefix alone, so real accounts that happen to start with it are
+left alone.
+"""
+import re
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from .bulk import BATCH_SIZE
+from .models import EducationEntry, Project, ProjectSkill, Skill, UserProfile, WorkEntry, recount_project_counts
+from .search import index_projects
+from .snapshots import remove_snapshot
+
+BENCH_PREFIX = "bench-"
+BENCH_PASSWORD = "bench-password"
+
+SKILL_NAMES = [
+    "Python", "Django", "PostgreSQL", "MySQL", "Redis", "Docker", "Kubernetes", "AWS", "React", "TypeScript",
+    "Go", "Rust", "GraphQL", "Celery", "Linux", "Terraform", "Vue", "Kafka", "Elasticsearch", "Nginx",
+]
+LEVELS = ["Beginner", "Intermediate", "Advanced", None]
+# Users seeded per round; bounds memory whatever the dataset size
+USERS_PER_ROUND = 100
+
+
+def skill_name(index):
+    # Unique per profile, case-insensitively, however many skills are asked for
+    base = SKILL_NAMES[index % len(SKILL_NAMES)]
+    return base if index < len(SKILL_NAMES) else f"{base} {index // len(SKILL_NAMES) + 1}"
+
+
+def seeded_users(prefix=BENCH_PREFIX):
+    """The ``<prefix><n>`` users created by seed_dataset."""
+    return User.objects.filter(username__regex=rf"^{re.escape(prefix)}[0-9]+$")
+
+
+def bench_users(prefix=BENCH_PREFIX):
+    """Seeded users plus the admin and the users `manage.py bench` registers."""
+    generated = r"[0-9]+|admin|reg-[0-9]+-[0-9]+|bulk-[0-9]+-[0-9]+-[0-9]+"
+    return User.objects.filter(username__regex=rf"^{re.escape(prefix)}({generated})$")
+
+
+def seed_dataset(users, skills_per_user, projects_per_user, skills_per_project, prefix=BENCH_PREFIX):
+    """
+    Create ``users`` users named ``<prefix><n>``, each with a profile,
+    skills, projects linked to ``skills_per_project`` of those skills, and
+    one work and one education entry. Returns the number of users created.
+    """
+    password = make_password(BENCH_PASSWORD)
+    skills_per_project = min(skills_per_project, skills_per_user)
+    for start in range(0, users, USERS_PER_ROUND):
+        usernames = [f"{prefix}{n}" for n in range(start, min(start + USERS_PER_ROUND, users))]
+        User.objects.bulk_create(
+            [User(username=username, password=password, email=f"{username}@example.com") for username in usernames],
+            batch_size=BATCH_SIZE,
+        )
+        # Read ids back; not every backend returns them from bulk_create
+        user_ids = list(User.objects.filter(username__in=usernames).values_list("id", flat=True))
+        UserProfile.objects.bulk_create(
+            [UserProfile(user_id=user_id, github=f"https://github.com/user{user_id}") for user_id in user_ids],
+            batch_size=BATCH_SIZE,
+        )
+        profile_ids = list(UserProfile.objects.filter(user_id__in=user_ids).values_list("id", flat=True))
+
+        Skill.objects.bulk_create(
+            [
+                Skill(profile_id=profile_id, name=skill_name(k), level=LEVELS[k % len(LEVELS)])
+                for profile_id in profile_ids for k in range(skills_per_user)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Project.objects.bulk_create(
+            [
+                Project(
+                    profile_id=profile_id,
+                    title=f"Project {j}: {skill_name(j % max(skills_per_user, 1))} platform",
+                    description=f"Designed and shipped project {j}, with an API, a test suite and background jobs. " * 3,
+                    links=f"https://github.com/user{profile_id}/project-{j}",
+                )
+                for profile_id in profile_ids for j in range(projects_per_user)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        WorkEntry.objects.bulk_create(
+            [WorkEntry(profile_id=profile_id, title="Software Engineer", company="Example Corp", period="2020-Present")
+             for profile_id in profile_ids],
+            batch_size=BATCH_SIZE,
+        )
+        EducationEntry.objects.bulk_create(
+            [EducationEntry(profile_id=profile_id, degree="BSc Computer Science", institution="Example University",
+                            period="2016-2020")
+             for profile_id in profile_ids],
+            batch_size=BATCH_SIZE,
+        )
+
+        skills, projects = {}, {}
+        for skill_id, profile_id in Skill.objects.filter(profile_id__in=profile_ids).order_by("id").values_list("id", "profile_id"):
+            skills.setdefault(profile_id, []).append(skill_id)
+        for project_id, profile_id in Project.objects.filter(profile_id__in=profile_ids).order_by("id").values_list("id", "profile_id"):
+            projects.setdefault(profile_id, []).append(project_id)
+        ProjectSkill.objects.bulk_create(
+            [
+                ProjectSkill(project_id=project_id, skill_id=skills[profile_id][(j + t) % len(skills[profile_id])])
+                for profile_id, project_ids in projects.items() if profile_id in skills
+                for j, project_id in enumerate(project_ids) for t in range(skills_per_project)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # bulk_create skips the signals that keep these in step
+        recount_project_counts(Skill.objects.filter(profile_id__in=profile_ids))
+        index_projects([project_id for project_ids in projects.values() for project_id in project_ids])
+    return users
+
+
+def clear_dataset(prefix=BENCH_PREFIX):
+    """Delete every bench user (and by cascade their portfolios) and any published snapshots."""
+    users = bench_users(prefix)
+    for user_id in UserProfile.objects.filter(user__in=users, published=True).values_list("user_id", flat=True):
+        remove_snapshot(user_id)
+    return users.delete()[0]
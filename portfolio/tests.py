@@ -1,16 +1,81 @@
-from django.test import TestCase
+import gzip
+import importlib
+import io
+import json
+import os
+import re
+import tempfile
+import time
+import unittest
+import zlib
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models.functions import Lower
+from django.db.utils import OperationalError
+from django.test import AsyncRequestFactory, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from django.contrib.auth.models import User
-from .models import UserProfile, Skill, Project
+import meapi.settings
+from . import async_views, bulk, metrics, middleware, passwords, snapshots
+from .authentication import revocations
+from .cache import bump_profile_version
+from .export import iter_all_records
+from .management.commands import bench_connections
+from .management.commands.bench import ENDPOINTS, route_names
+from .management.commands.boot import backoff_delays, unapplied_migrations
+from .metrics import mark_process_dead
+from .models import UserProfile, Skill, Project, ProjectSearch, WorkEntry
+from .profiling import list_profiles, sign_token
+from .search import mysql_search_sql
+from .serializers import ProjectSerializer, SkillSerializer
+from .synthetic import bench_users, clear_dataset, seed_dataset, seeded_users
+from .views import UserProjectsView, UserTopSkillsView
+
+
+def collated_usernames():
+    """Make ``User.objects.filter(username__in=...)`` match regardless of case, as MySQL's collation does."""
+    real_filter = User.objects.filter
+
+    def collated_filter(*args, username__in=None, **kwargs):
+        if username__in is None:
+            return real_filter(*args, **kwargs)
+        return User.objects.alias(lname=Lower('username')).filter(
+            *args, lname__in=[username.lower() for username in username__in], **kwargs
+        )
+
+    return mock.patch.object(User.objects, 'filter', collated_filter)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PortfolioTestCase(APITestCase):
+    """Logged in as ``self.user``, with an empty cache and no revoked tokens."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Keep request metrics out of the real PORTFOLIO_METRICS_DIR, now and at exit
+        metrics_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(PORTFOLIO_METRICS_DIR=metrics_dir))
+        cls.addClassCleanup(metrics.store.reset)
 
-class APITests(APITestCase):
     def setUp(self):
+        cache.clear()
+        revocations.clear()
         self.user = User.objects.create_user(username='testuser', password='testpass')
         self.profile = UserProfile.objects.create(user=self.user)
         self.client.force_authenticate(user=self.user)
 
+
+class APITests(PortfolioTestCase):
     def test_get_skills(self):
         Skill.objects.create(profile=self.profile, name='Python', level='Advanced')
         url = reverse('skills')
@@ -44,6 +109,7 @@ class APITests(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['title'], 'Proj2')
+        self.assertEqual(response.data['skills'], [{'name': 'Django', 'level': 'Intermediate'}])
 
     def test_get_projects_filter_by_skill(self):
         skill1 = Skill.objects.create(profile=self.profile, name='Python')
@@ -69,3 +135,924 @@ class APITests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['results'][0]['name'], 'Python')
+
+    def test_get_profile_query_count_is_constant(self):
+        python = Skill.objects.create(profile=self.profile, name='Python')
+        django = Skill.objects.create(profile=self.profile, name='Django')
+        url = reverse('profile')
+
+        def profile_queries(project_count):
+            existing = Project.objects.filter(profile=self.profile).count()
+            projects = Project.objects.bulk_create([
+                Project(profile=self.profile, title=f'Proj{i}', description='Desc')
+                for i in range(existing, project_count)
+            ])
+            Through = Project.skills.through
+            Through.objects.bulk_create(
+                [Through(project_id=p.id, skill_id=python.id) for p in projects]
+                + [Through(project_id=p.id, skill_id=django.id) for p in projects]
+            )
+            bump_profile_version(self.user.id)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['projects']), project_count)
+            self.assertEqual(len(response.data['projects'][-1]['skills']), 2)
+            return len(ctx.captured_queries)
+
+        baseline = profile_queries(1)
+        self.assertEqual(profile_queries(100), baseline)
+        self.assertEqual(profile_queries(1000), baseline)
+
+    def test_cursor_pagination_is_opt_in(self):
+        Skill.objects.bulk_create([Skill(profile=self.profile, name=f'Skill{i}') for i in range(60)])
+        url = reverse('skills')
+        response = self.client.get(url)
+        self.assertEqual(response.data['count'], 60)
+
+        names, next_url = [], url + '?pagination=cursor'
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            names += [skill['name'] for skill in response.data['results']]
+            next_url = response.data['next']
+        self.assertEqual(names, [f'Skill{i}' for i in range(60)])
+
+        response = self.client.get(url + '?pagination=cursor&count=true')
+        self.assertEqual(response.data['count'], 60)
+
+    def test_profile_sparse_fields_and_inline_paging(self):
+        self.profile.github = 'https://github.com/testuser'
+        self.profile.save()
+        skills = [Skill.objects.create(profile=self.profile, name=f'Skill{i}') for i in range(3)]
+        for i in range(3):
+            Project.objects.create(profile=self.profile, title=f'Proj{i}', description='Desc').skills.add(skills[i])
+        url = reverse('profile')
+
+        # Only the profile row is read: no JOIN, no prefetches
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': 'github,linkedin'})
+        self.assertEqual(response.data, {'github': 'https://github.com/testuser', 'linkedin': None})
+
+        response = self.client.get(url, {'expand': 'skills'})
+        self.assertEqual(list(response.data), ['education', 'work', 'github', 'linkedin', 'portfolio', 'skills'])
+
+        with self.assertNumQueries(3):  # profile, project count, project page
+            response = self.client.get(url, {'fields': 'projects.title', 'projects_page': 2, 'projects_page_size': 2})
+        page = response.data['projects']
+        self.assertEqual(page['count'], 3)
+        self.assertEqual(page['results'], [{'title': 'Proj2'}])
+        self.assertIsNone(page['next'])
+        self.assertIn('projects_page_size=2', page['previous'])
+        self.assertNotIn('projects_page=', page['previous'])
+
+        response = self.client.get(url, {'fields': 'projects.skills.name', 'projects_page_size': 1})
+        self.assertEqual(response.data['projects']['results'], [{'skills': [{'name': 'Skill0'}]}])
+
+        self.assertEqual(self.client.get(url, {'fields': 'github,nope'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'expand': 'github'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'projects_page': 9}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_row_serializers_match_model_serializers(self):
+        skills = [Skill.objects.create(profile=self.profile, name=name, level=level)
+                  for name, level in (('Pythön', 'Advanced'), ('SQL\u2028', None), ('Go', ''))]
+        for i in range(30):
+            project = Project.objects.create(profile=self.profile, title=f'Proj {i}', description='Dësc',
+                                             links=None if i % 2 else 'https://example.com')
+            project.skills.set(skills[:i % 4])
+
+        expected = {
+            'skills': SkillSerializer(Skill.objects.order_by('id'), many=True).data,
+            'projects': ProjectSerializer(Project.objects.order_by('id')[:25], many=True).data,
+            'top-skills': SkillSerializer(Skill.objects.order_by('-project_count', 'id')[:5], many=True).data,
+        }
+        for name, results in expected.items():
+            count = Project.objects.count() if name == 'projects' else len(skills)
+            next_url = 'http://testserver/projects/?page=2' if name == 'projects' else None
+            body = {'count': count, 'next': next_url, 'previous': None, 'results': results}
+            if name == 'projects':
+                # profile (no token claim here), count, page, and one query for every project's skills
+                with self.assertNumQueries(4):
+                    response = self.client.get(reverse(name))
+            else:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.content, JSONRenderer().render(body), name)
+
+    def test_profile_is_created_on_first_request(self):
+        user = User.objects.create_user(username='newuser', password='testpass')
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('social-links'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    async def test_async_read_views_match_sync_views(self):
+        @sync_to_async
+        def setup_and_fetch_sync():
+            skill = Skill.objects.create(profile=self.profile, name='Python', level='Advanced')
+            project = Project.objects.create(profile=self.profile, title='Proj1', description='Desc')
+            project.skills.add(skill)
+            responses = {}
+            for name in ('profile', 'skills', 'projects', 'top-skills'):
+                responses[name] = self.client.get(reverse(name) + ('?skill=python' if name == 'projects' else '')).content
+            cache.clear()
+            return responses, str(RefreshToken.for_user(self.user).access_token)
+
+        expected, token = await setup_and_fetch_sync()
+        factory = AsyncRequestFactory()
+        views = {
+            'profile': async_views.profile,
+            'skills': async_views.skills,
+            'projects': async_views.projects,
+            'top-skills': async_views.top_skills,
+        }
+        for name, view in views.items():
+            path = reverse(name) + ('?skill=python' if name == 'projects' else '')
+            auth = {'Authorization': f'Bearer {token}'}
+            response = await view(factory.get(path, headers=auth))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, expected[name], name)
+
+            response = await view(factory.get(path, headers={**auth, 'If-None-Match': response['ETag']}))
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        sparse = reverse('profile') + '?fields=github,projects.title&projects_page_size=1'
+        expected = await sync_to_async(lambda: self.client.get(sparse).content)()
+        response = await async_views.profile(factory.get(sparse, headers=auth))
+        self.assertEqual(response.content, expected)
+
+        response = await async_views.skills(factory.get(reverse('skills')))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ResponseCacheTests(PortfolioTestCase):
+    def test_cached_read_returns_etag_and_304(self):
+        Skill.objects.create(profile=self.profile, name='Python')
+        url = reverse('skills')
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_write_invalidates_cached_read(self):
+        url = reverse('skills')
+        etag = self.client.get(url)['ETag']
+        self.client.post(url, {'name': 'Django'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['name'], 'Django')
+
+    def test_default_cache_keeps_more_than_the_backend_default(self):
+        try:
+            importlib.reload(meapi.settings)
+            self.assertEqual(meapi.settings.CACHES['default']['OPTIONS']['MAX_ENTRIES'], 20000)
+            with mock.patch.dict(os.environ, {'DJANGO_CACHE_BACKEND': 'django.core.cache.backends.redis.RedisCache'}):
+                importlib.reload(meapi.settings)
+            self.assertNotIn('OPTIONS', meapi.settings.CACHES['default'])
+        finally:
+            importlib.reload(meapi.settings)
+
+    def test_responses_are_compressed_when_large(self):
+        Skill.objects.create(profile=self.profile, name='Python')
+        for i in range(40):
+            Project.objects.create(profile=self.profile, title=f'Project {i}', description='A fairly long description. ' * 5)
+        url = reverse('profile')
+        plain = self.client.get(url).content
+
+        with mock.patch.object(middleware, 'compress', wraps=middleware.compress) as compress:
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertIn('Accept-Encoding', response['Vary'])
+            self.assertEqual(gzip.decompress(response.content), plain)
+            self.assertLess(len(response.content), len(plain))
+            # Same cached read again: the compressed bytes are reused
+            again = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(again.content, response.content)
+            self.assertEqual(compress.call_count, 1)
+
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        if middleware.brotli is not None:
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0.5, br')
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertEqual(middleware.brotli.decompress(response.content), plain)
+        self.assertFalse(self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0').has_header('Content-Encoding'))
+
+        # Small bodies go out as they are
+        response = self.client.get(reverse('skills'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        # HTML (browsable API, admin) is never compressed: it carries CSRF tokens
+        response = self.client.get(url, HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        self.assertGreater(len(response.content), 1024)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        # Streaming export is compressed chunk by chunk, each flushed as it goes
+        plain = b''.join(self.client.get(reverse('export')).streaming_content)
+        response = self.client.get(reverse('export'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        chunks = list(response.streaming_content)
+        first_record = zlib.decompressobj(31).decompress(chunks[0])
+        self.assertTrue(plain.startswith(first_record))
+        self.assertIn(b'"type":"profile"', first_record.replace(b' ', b''))
+        self.assertEqual(gzip.decompress(b''.join(chunks)), plain)
+
+
+class BulkWriteTests(PortfolioTestCase):
+    def test_bulk_upsert_skills(self):
+        Skill.objects.create(profile=self.profile, name='Python', level='Beginner')
+        url = reverse('skills-bulk')
+        data = [
+            {'name': 'python', 'level': 'Advanced'},
+            {'name': 'Django', 'level': 'Intermediate'},
+            {'name': 'django', 'level': 'Advanced'},
+        ] + [{'name': f'Skill{i}'} for i in range(200)]
+        with self.assertNumQueries(7):
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'created': 201, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(Skill.objects.filter(profile=self.profile).count(), 202)
+        self.assertEqual(Skill.objects.get(profile=self.profile, name='Python').level, 'Advanced')
+        self.assertEqual(Skill.objects.get(profile=self.profile, name='Django').level, 'Advanced')
+
+        response = self.client.post(reverse('skills'), {'name': 'PYTHON'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Skill.objects.filter(profile=self.profile).count(), 202)
+
+    def test_upsert_skills_survives_a_concurrent_insert(self):
+        real_skills_by_name = bulk._skills_by_name
+
+        def raced(profile_id, keys):
+            found = real_skills_by_name(profile_id, keys)
+            # Another request inserts the same name right after this one looked
+            if not Skill.objects.filter(profile=self.profile, name='rust').exists():
+                Skill.objects.create(profile=self.profile, name='rust', level='Beginner')
+            return found
+
+        with mock.patch.object(bulk, '_skills_by_name', side_effect=raced):
+            response = self.client.post(reverse('skills'), {'name': 'Rust', 'level': 'Advanced'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(Skill.objects.filter(profile=self.profile).values_list('name', 'level')),
+                         [('rust', 'Advanced')])
+
+    def test_bulk_import_projects(self):
+        Skill.objects.create(profile=self.profile, name='Python')
+        url = reverse('projects-bulk')
+        data = [
+            {
+                'title': f'Proj{i}',
+                'description': 'Desc',
+                'skills': [{'name': 'python'}, {'name': f'Lib{i % 10}', 'level': 'Advanced'}],
+            }
+            for i in range(200)
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 200)
+        self.assertEqual(Skill.objects.filter(profile=self.profile).count(), 11)
+        self.assertEqual(Project.skills.through.objects.count(), 400)
+        python = Skill.objects.get(profile=self.profile, name='Python')
+        self.assertEqual(python.projects.count(), 200)
+
+    def test_bulk_import_projects_without_returned_ids(self):
+        # MySQL can't return ids from a multi-row INSERT; the rows are read back instead
+        Project.objects.create(profile=self.profile, title='Existing', description='Desc')
+        data = [
+            {'title': f'Proj{i}', 'description': 'Desc', 'skills': [{'name': f'Lib{i % 3}'}, {'name': 'LIB0'}]}
+            for i in range(30)
+        ]
+        no_returning = mock.patch.object(
+            type(connection.features), 'can_return_rows_from_bulk_insert', new_callable=mock.PropertyMock, return_value=False
+        )
+        with no_returning, self.assertNumQueries(20):  # the same for any number of projects
+            response = self.client.post(reverse('projects-bulk'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Project.skills.through.objects.count(), 50)
+        for i in (0, 1, 29):
+            project = Project.objects.get(title=f'Proj{i}')
+            self.assertEqual(sorted(project.skills.values_list('name', flat=True)), sorted({f'Lib{i % 3}', 'Lib0'}))
+        self.assertEqual(Skill.objects.get(name='Lib0').project_count, 30)
+
+    def test_bulk_import_projects_reports_errors_per_item(self):
+        url = reverse('projects-bulk')
+        data = [
+            {'title': 'Ok', 'description': 'Desc'},
+            {'title': 'Missing description'},
+            {'title': 'Bad skill', 'description': 'Desc', 'skills': [{'level': 'Advanced'}]},
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['errors']
+        self.assertEqual(errors[0], {})
+        self.assertIn('description', errors[1])
+        self.assertIn('skills', errors[2])
+        self.assertFalse(Project.objects.exists())
+
+    def test_skill_project_count_tracks_links(self):
+        python = Skill.objects.create(profile=self.profile, name='Python')
+        django = Skill.objects.create(profile=self.profile, name='Django')
+        project1 = Project.objects.create(profile=self.profile, title='Proj1', description='Desc')
+        project2 = Project.objects.create(profile=self.profile, title='Proj2', description='Desc2')
+        project1.skills.add(python, django)
+        python.projects.add(project2)
+        self.assertEqual(Skill.objects.get(pk=python.pk).project_count, 2)
+        self.assertEqual(Skill.objects.get(pk=django.pk).project_count, 1)
+
+        project1.skills.remove(django)
+        project1.skills.clear()
+        self.assertEqual(Skill.objects.get(pk=python.pk).project_count, 1)
+        self.assertEqual(Skill.objects.get(pk=django.pk).project_count, 0)
+
+        project2.delete()
+        self.assertEqual(Skill.objects.get(pk=python.pk).project_count, 0)
+
+        self.client.post(reverse('projects-bulk'), [
+            {'title': 'Proj3', 'description': 'Desc', 'skills': [{'name': 'python'}]},
+        ], format='json')
+        self.assertEqual(Skill.objects.get(pk=python.pk).project_count, 1)
+        call_command('recount_skills', '--check', stdout=open(os.devnull, 'w'))
+
+    @override_settings(PASSWORD_HASH_BATCH_WORKERS=2)
+    def test_bulk_register(self):
+        url = reverse('register-bulk')
+        users = [
+            {'username': 'alice', 'password': 'pw-alice', 'first_name': 'Alice'},
+            {'username': 'testuser', 'password': 'pw'},
+            {'username': 'bob', 'email': 'bob@EXAMPLE.com'},
+            {'username': 'alice', 'password': 'other'},
+            {'username': 'not valid!'},
+        ]
+        self.assertEqual(self.client.post(url, users, format='json').status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post(url, {'users': users}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([row['status'] for row in response.data['results']],
+                         ['created', 'exists', 'created', 'duplicate', 'invalid'])
+        self.assertIn('username', response.data['results'][4]['errors'])
+
+        alice = User.objects.get(username='alice')
+        self.assertEqual(response.data['results'][0]['id'], alice.id)
+        self.assertEqual(alice.first_name, 'Alice')
+        self.assertTrue(alice.check_password('pw-alice'))
+        bob = User.objects.get(username='bob')
+        self.assertEqual(bob.email, 'bob@example.com')
+        self.assertFalse(bob.has_usable_password())
+        self.assertEqual(UserProfile.objects.filter(user__in=[alice, bob]).count(), 2)
+
+        # Later batches reuse the same worker processes
+        pool = passwords._batch_executor
+        self.assertIsNotNone(pool)
+        self.assertEqual(len(passwords.hash_passwords(['a', 'b'])), 2)
+        self.assertIs(passwords._batch_executor, pool)
+
+        with collated_usernames():
+            response = self.client.post(url, [{'username': 'Carol'}, {'username': 'CAROL'}, {'username': 'TestUser'}],
+                                        format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'duplicate', 'exists'])
+        self.assertEqual(response.data['results'][0]['id'], User.objects.get(username='Carol').id)
+
+
+class AuthTests(PortfolioTestCase):
+    def test_profile_id_claim_skips_profile_lookup(self):
+        self.client.force_authenticate(user=None)
+        Skill.objects.create(profile=self.profile, name='Python')
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpass'})
+        access = response.data['access']
+        self.assertEqual(AccessToken(access)['profile_id'], self.profile.pk)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('skills'))
+        self.assertEqual(response.data['results'][0]['name'], 'Python')
+        self.assertFalse([q for q in ctx.captured_queries if 'portfolio_userprofile' in q['sql']])
+
+    def test_token_auth_skips_user_lookup_until_revoked(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpass'})
+        access, refresh = response.data['access'], response.data['refresh']
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('skills'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in ctx.captured_queries if 'auth_user' in q['sql']])
+        # Views that need more than the id still get the real user
+        response = self.client.get(reverse('export'))
+        self.assertIn('portfolio-testuser.ndjson', response['Content-Disposition'])
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('skills')).status_code, status.HTTP_401_UNAUTHORIZED)
+        # The marker is durable: losing the shared cache and the per-process memo doesn't un-revoke
+        cache.clear()
+        revocations.clear()
+        self.assertEqual(self.client.get(reverse('skills')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_sheds_load_when_hash_pool_is_full(self):
+        self.client.force_authenticate(user=None)
+        credentials = {'username': 'testuser', 'password': 'testpass'}
+        response = self.client.post(reverse('token_obtain_pair'), credentials)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(reverse('token_obtain_pair'), {**credentials, 'password': 'x'}).status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+        _, slots = passwords._get_pool()
+        held = 0
+        while slots.acquire(blocking=False):
+            held += 1
+        try:
+            response = self.client.post(reverse('token_obtain_pair'), credentials)
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(response['Retry-After'], '1')
+            response = self.client.post(reverse('register'), {'username': 'busy', 'password': 'pw'})
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        finally:
+            for _ in range(held):
+                slots.release()
+
+        response = self.client.post(reverse('register'), {'username': 'new', 'password': 'pw', 'first_name': 'Ada'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username='new')
+        self.assertEqual(user.first_name, 'Ada')
+        self.assertTrue(user.check_password('pw'))
+
+
+class EntryTests(PortfolioTestCase):
+    def test_work_entries_crud(self):
+        url = reverse('work-entries')
+        first = self.client.post(url, {'title': 'Engineer', 'company': 'TechCorp'}, format='json').data
+        second = self.client.post(url, {'title': 'Intern', 'period': '2021'}, format='json').data
+        self.assertEqual((first['position'], second['position']), (0, 1))
+
+        detail = reverse('work-entry', args=[second['id']])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(detail, {'position': 0, 'title': 'Summer Intern'}, format='json')
+        self.assertEqual(response.data['company'], '')
+        update = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE'))
+        self.assertNotIn('"description"', update)
+
+        self.assertEqual([e['title'] for e in self.client.get(url).data], ['Engineer', 'Summer Intern'])
+        self.assertEqual(self.client.delete(reverse('work-entry', args=[first['id']])).status_code,
+                         status.HTTP_204_NO_CONTENT)
+        profile = self.client.get(reverse('profile')).data
+        self.assertEqual([e['title'] for e in profile['work_entries']], ['Summer Intern'])
+
+        other = UserProfile.objects.create(user=User.objects.create_user(username='other', password='x'))
+        entry = WorkEntry.objects.create(profile=other, title='Theirs')
+        response = self.client.patch(reverse('work-entry', args=[entry.id]), {'title': 'Mine'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_legacy_work_and_education_posts_write_entries(self):
+        WorkEntry.objects.create(profile=self.profile, title='Stale')
+        work = '[{"role": "Engineer", "employer": "TechCorp", "start": "2020"}, {"title": "Intern"}]'
+        response = self.client.post(reverse('work-experience'), {'work': work}, format='json')
+        self.assertEqual(response.data['work'], work)
+        self.assertEqual(response['Deprecation'], 'true')
+        self.assertIn(reverse('work-entries'), response['Link'])
+        entries = self.client.get(reverse('work-entries')).data
+        self.assertEqual(
+            [(e['position'], e['title'], e['company'], e['period']) for e in entries],
+            [(0, 'Engineer', 'TechCorp', '2020-Present'), (1, 'Intern', '', '')],
+        )
+        self.assertEqual(self.client.get(reverse('work-experience')).data['work'], work)
+
+        self.client.post(reverse('education'), {'education': 'BSc Computer Science\nMIT'}, format='json')
+        profile = self.client.get(reverse('profile')).data
+        self.assertEqual([(e['degree'], e['description']) for e in profile['education_entries']],
+                         [('BSc Computer Science', 'MIT')])
+
+
+class SearchTests(PortfolioTestCase):
+    def test_project_search_ranks_and_tracks_writes(self):
+        url = reverse('projects-search')
+        python = Skill.objects.create(profile=self.profile, name='Python')
+        api = Project.objects.create(profile=self.profile, title='Payments API', description='Billing service')
+        api.skills.add(python)
+        blog = Project.objects.create(profile=self.profile, title='Blog', description='Written in python and Go')
+        Project.objects.create(profile=self.profile, title='Chess', description='Board game engine')
+        other = UserProfile.objects.create(user=User.objects.create_user(username='other', password='x'))
+        Project.objects.create(profile=other, title='Python tools', description='Not mine')
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'q': 'python'})
+        # A skill match outranks a description mention
+        self.assertEqual([p['title'] for p in response.data['results']], ['Payments API', 'Blog'])
+
+        # Renaming a skill, unlinking it and editing a project all reach the index
+        python.name = 'Rust'
+        python.save()
+        bump_profile_version(self.user.id)
+        self.assertEqual([p['title'] for p in self.client.get(url, {'q': 'rust'}).data['results']], ['Payments API'])
+        api.skills.remove(python)
+        blog.title = 'Rust notes'
+        blog.save()
+        bump_profile_version(self.user.id)
+        self.assertEqual([p['title'] for p in self.client.get(url, {'q': 'rust'}).data['results']], ['Rust notes'])
+        blog.delete()
+        bump_profile_version(self.user.id)
+        self.assertEqual(self.client.get(url, {'q': 'rust'}).data['results'], [])
+
+        go = Skill.objects.create(profile=self.profile, name='Golang')
+        api.skills.add(go)
+        bump_profile_version(self.user.id)
+        self.assertEqual([p['title'] for p in self.client.get(url, {'q': 'golang'}).data['results']], ['Payments API'])
+        with self.captureOnCommitCallbacks(execute=True):
+            go.delete()
+        bump_profile_version(self.user.id)
+        self.assertEqual(self.client.get(url, {'q': 'golang'}).data['results'], [])
+
+        # Two-letter terms: FTS5 indexes them, MySQL's FULLTEXT doesn't
+        api.skills.add(Skill.objects.create(profile=self.profile, name='Go'))
+        bump_profile_version(self.user.id)
+        self.assertEqual([p['title'] for p in self.client.get(url, {'q': 'go'}).data['results']], ['Payments API'])
+        sql, params = mysql_search_sql(self.profile.id, ['payments', 'go'], 10)
+        # Only indexed terms reach MATCH; the short one is a whole-word REGEXP
+        self.assertEqual(params[:3], [self.profile.id, 'payments', '(^|[^[:alnum:]_])go([^[:alnum:]_]|$)'])
+        self.assertEqual(sql.count('REGEXP %s'), 2)
+
+
+class SnapshotTests(PortfolioTestCase):
+    def test_published_snapshot_is_served_statically(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            PORTFOLIO_SNAPSHOT_ROOT=root, PORTFOLIO_SNAPSHOT_DELAY=None
+        ):
+            anonymous = Client()
+            url = f'/portfolios/{self.user.id}.json'
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('publish'))
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(response.data['url'], url)
+
+            with self.assertNumQueries(0):
+                response = anonymous.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            snapshot = json.loads(b''.join(response.streaming_content))
+            self.assertEqual(snapshot['user']['username'], 'testuser')
+            self.assertNotIn('email', snapshot['user'])
+            self.assertNotIn('immutable', response['Cache-Control'])
+
+            first = self.client.get(reverse('publish')).data['versioned_url']
+            self.assertTrue(first.startswith(f'/portfolios/{self.user.id}/'))
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('skills'), {'name': 'Go'}, format='json')
+            latest = self.client.get(reverse('publish')).data['versioned_url']
+            self.assertNotEqual(latest, first)
+            response = anonymous.get(latest)
+            self.assertIn('immutable', response['Cache-Control'])
+            self.assertEqual(json.loads(b''.join(response.streaming_content))['skills'], [{'name': 'Go', 'level': None}])
+            # Pages that still reference the superseded version keep working during the grace period
+            self.assertEqual(anonymous.get(first).status_code, status.HTTP_200_OK)
+            with override_settings(PORTFOLIO_SNAPSHOT_GRACE=0), self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('skills'), {'name': 'Rust'}, format='json')
+            versions = os.listdir(os.path.join(root, str(self.user.id)))
+            self.assertEqual(len([name for name in versions if name.endswith('.json')]), 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.delete(reverse('publish'))
+            self.assertEqual(anonymous.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+            # Deactivating or deleting the account takes the snapshot down too
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('publish'))
+            self.user.is_active = False
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.save()
+            self.assertEqual(anonymous.get(url).status_code, status.HTTP_404_NOT_FOUND)
+            self.user.is_active = True
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.save()
+            self.assertEqual(anonymous.get(url).status_code, status.HTTP_200_OK)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.delete()
+            self.assertEqual(anonymous.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pending_snapshot_rebuilds_survive_the_worker(self):
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as pending, override_settings(
+            PORTFOLIO_SNAPSHOT_ROOT=root, PORTFOLIO_SNAPSHOT_PENDING_DIR=pending, PORTFOLIO_SNAPSHOT_DELAY=60
+        ):
+            self.profile.published = True
+            self.profile.save()
+            worker = snapshots.SnapshotWorker()
+            with mock.patch('portfolio.snapshots.threading.Thread'):
+                worker.schedule(self.user.id)
+            # Queued in memory only, so a recycled worker would lose it without the marker
+            self.assertEqual(snapshots.pending_snapshots(), [self.user.id])
+
+            successor = snapshots.SnapshotWorker()
+            with mock.patch.object(successor, 'schedule') as schedule:
+                successor.resume()
+            schedule.assert_called_once_with(self.user.id)
+
+            started = time.time()
+            snapshots.write_snapshot(self.user.id)
+            snapshots.clear_pending(self.user.id, started)
+            self.assertEqual(snapshots.pending_snapshots(), [])
+            self.assertTrue(os.path.exists(os.path.join(root, f'{self.user.id}.json')))
+            # Nothing but snapshots under the served root
+            self.assertEqual(sorted(os.listdir(root)), [str(self.user.id), f'{self.user.id}.json', f'{self.user.id}.json.gz'])
+
+    def test_only_published_profiles_schedule_rebuilds(self):
+        with tempfile.TemporaryDirectory() as pending, override_settings(
+            PORTFOLIO_SNAPSHOT_PENDING_DIR=pending, PORTFOLIO_SNAPSHOT_DELAY=60
+        ), mock.patch.object(snapshots.worker, 'schedule') as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('skills'), {'name': 'Go'}, format='json')
+                self.client.post(reverse('social-links'), {'github': 'https://github.com/x'}, format='json')
+            schedule.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('publish'))
+            schedule.assert_called_once_with(self.user.id)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('skills'), {'name': 'Rust'}, format='json')
+            self.assertEqual(schedule.call_count, 2)
+
+
+class ExportImportTests(PortfolioTestCase):
+    def test_export_streams_ndjson(self):
+        skill = Skill.objects.create(profile=self.profile, name='Python')
+        project = Project.objects.create(profile=self.profile, title='Proj1', description='Desc')
+        project.skills.add(skill)
+
+        response = self.client.get(reverse('export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([r['type'] for r in records], ['profile', 'skill', 'project'])
+        self.assertEqual(records[0]['user']['username'], 'testuser')
+        self.assertEqual(records[2]['skills'], [{'name': 'Python', 'level': None}])
+
+        with tempfile.NamedTemporaryFile(suffix='.ndjson') as output:
+            call_command('export_portfolios', output=output.name, chunk_size=1, stderr=open(os.devnull, 'w'))
+            with open(output.name) as exported:
+                self.assertEqual([json.loads(line) for line in exported], records)
+
+        # Children are prefetched per page of profiles, not queried per profile
+        for i in range(4):
+            other = UserProfile.objects.create(user=User.objects.create_user(username=f'export{i}'))
+            WorkEntry.objects.create(profile=other, title='Engineer')
+            Project.objects.create(profile=other, title='Theirs', description='Desc').skills.add(
+                Skill.objects.create(profile=other, name='Go')
+            )
+        with self.assertNumQueries(2 * 6 + 1):  # 2 pages of (profiles, skills, projects, project skills, 2 entry kinds)
+            exported = list(iter_all_records(chunk_size=3))
+        self.assertEqual(len(exported), 3 + 4 * 4)
+        self.assertEqual(exported[:3], records)
+
+    def test_load_portfolios_batches_and_resumes(self):
+        lines = []
+        for i in range(3):
+            lines.append({'type': 'profile', 'user': {'username': f'imported{i}'}, 'github': 'https://github.com/x'})
+            lines.append({'type': 'skill', 'name': 'Python', 'level': 'Advanced'})
+            lines.append({'type': 'project', 'title': 'Proj', 'description': 'Desc',
+                          'skills': [{'name': 'python'}, {'name': 'Django'}]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'portfolios.jsonl')
+            with open(path, 'w') as f:
+                f.write('\n'.join(json.dumps(line) for line in lines) + '\n')
+            call_command('load_portfolios', path, batch_size=2, stdout=open(os.devnull, 'w'))
+            self.assertTrue(os.path.exists(path + '.checkpoint'))
+
+            # A resumed run starts at the checkpoint; a restarted one skips loaded users
+            call_command('load_portfolios', path, stdout=open(os.devnull, 'w'))
+            call_command('load_portfolios', path, restart=True, stdout=open(os.devnull, 'w'))
+
+        profile = UserProfile.objects.get(user__username='imported2')
+        self.assertEqual(UserProfile.objects.filter(user__username__startswith='imported').count(), 3)
+        self.assertEqual(profile.github, 'https://github.com/x')
+        python = profile.skills.get(name='Python')
+        self.assertEqual((python.level, python.project_count), ('Advanced', 1))
+        project = profile.projects.get()
+        self.assertEqual(sorted(project.skills.values_list('name', flat=True)), ['Django', 'Python'])
+        self.assertFalse(profile.user.has_usable_password())
+
+    def test_load_portfolios_matches_usernames_regardless_of_case(self):
+        names = ['Imported0', 'TESTUSER', 'Carol', 'carol']
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'portfolios.jsonl')
+            with open(path, 'w') as f:
+                f.write(''.join(json.dumps({'type': 'profile', 'user': {'username': name}}) + '\n' for name in names))
+            User.objects.create_user(username='imported0')
+            out = io.StringIO()
+            with collated_usernames():
+                call_command('load_portfolios', path, stdout=out)
+        self.assertIn('Loaded 1 profiles', out.getvalue())
+        self.assertIn('(3 skipped)', out.getvalue())
+        self.assertEqual(list(User.objects.filter(username__iexact='carol').values_list('username', flat=True)), ['Carol'])
+        self.assertFalse(UserProfile.objects.filter(user__username='imported0').exists())
+
+
+class MetricsTests(PortfolioTestCase):
+    def test_request_metrics_and_server_timing(self):
+        Skill.objects.create(profile=self.profile, name='Python')
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PORTFOLIO_METRICS_DIR=tmp):
+            response = self.client.get(reverse('skills'))
+            self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ queries", render;dur=[\d.]+')
+
+            with override_settings(PORTFOLIO_QUERY_BUDGET=0), self.assertLogs('portfolio.metrics', 'WARNING') as logs:
+                self.client.get(reverse('profile'))
+            self.assertIn('over queries budget', logs.output[0])
+            self.assertIn('FROM "portfolio_userprofile"', logs.output[0])
+
+            # A worker that has exited is folded into the archive, not lost
+            served_1000 = {json.dumps(['portfolio_requests_total', [['method', 'GET'], ['status', 200], ['view', 'skills']]]): 1000}
+            for pid in (99999999, 99999998, os.getppid()):
+                with open(os.path.join(tmp, f'{pid}.json'), 'w') as f:
+                    json.dump(served_1000, f)
+            mark_process_dead(99999999)
+            self.assertNotIn('99999999.json', os.listdir(tmp))
+            self.assertIn('archive.json', os.listdir(tmp))
+
+            body = self.client.get(reverse('metrics')).content.decode()
+            # One that exited without child_exit is archived when collected; a live one stays
+            self.assertNotIn('99999998.json', os.listdir(tmp))
+            self.assertIn(f'{os.getppid()}.json', os.listdir(tmp))
+            # Other tests in this process count too, so only lower bounds hold
+            served = re.search(r'portfolio_requests_total\{method="GET",status="200",view="skills"\} (\d+)', body)
+            self.assertGreater(int(served.group(1)), 3000)
+            self.assertIn('portfolio_request_queries_bucket{view="profile",le="+Inf"}', body)
+            self.assertIn('portfolio_budget_exceeded_total{budget="queries",view="profile"}', body)
+            self.assertIn('# TYPE portfolio_request_duration_seconds histogram', body)
+
+            with override_settings(PORTFOLIO_METRICS_TOKEN='secret'):
+                self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+                response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+                self.assertEqual(response.status_code, 200)
+
+    async def test_request_metrics_count_async_view_queries(self):
+        # The async views query on sync_to_async threads, not the one the middleware runs on
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        handler = middleware.RequestMetricsMiddleware(async_views.skills)
+        response = await handler(AsyncRequestFactory().get(reverse('skills'), headers={'Authorization': f'Bearer {token}'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+        self.assertGreater(queries, 0)
+
+
+class ProfilingTests(PortfolioTestCase):
+    def test_profiling_on_demand_keeps_a_bounded_ring(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PORTFOLIO_PROFILE_DIR=tmp, PORTFOLIO_PROFILE_KEEP=2):
+            # Not asked for, badly signed, or a non-staff flag: no profile
+            self.assertFalse(self.client.get(reverse('skills')).has_header('X-Portfolio-Profile-Id'))
+            self.client.get(reverse('skills'), HTTP_X_PORTFOLIO_PROFILE='profile:forged:signature')
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+            self.client.get(reverse('skills') + '?profile=1')
+            self.assertEqual(list_profiles(), [])
+
+            response = self.client.get(reverse('profile'), HTTP_X_PORTFOLIO_PROFILE=sign_token())
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response['X-Portfolio-Profile-Id'].endswith('-GET-profile.prof'))
+
+            staff = User.objects.create_user(username='staff', password='testpass', is_staff=True)
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(staff)}')
+            self.client.get(reverse('skills') + '?profile=1')
+            self.client.get(reverse('skills') + '?profile=1')
+            # Only the newest PORTFOLIO_PROFILE_KEEP survive
+            self.assertEqual([(p['method'], p['view']) for p in list_profiles()], [('GET', 'skills')] * 2)
+
+            out = io.StringIO()
+            call_command('profiles', '--limit', '5', stdout=out)
+            self.assertIn('skills: 2 profile(s) (GET x2)', out.getvalue())
+            self.assertIn('ms per request under the profiler', out.getvalue())
+            call_command('profiles', '--clear', stdout=io.StringIO())
+            self.assertEqual(list_profiles(), [])
+
+    async def test_profiling_stays_async_for_async_views(self):
+        staff = await sync_to_async(User.objects.create_user)(username='staff', password='testpass', is_staff=True)
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(staff)}'}
+        factory = AsyncRequestFactory()
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PORTFOLIO_PROFILE_DIR=tmp):
+            handler = middleware.ProfilingMiddleware(async_views.skills)
+            self.assertTrue(iscoroutinefunction(handler))
+            response = await handler(factory.get(reverse('skills'), headers=auth))
+            self.assertFalse(response.has_header('X-Portfolio-Profile-Id'))
+            response = await handler(factory.get(reverse('skills'), headers={**auth, 'X-Portfolio-Profile': sign_token()}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.has_header('X-Portfolio-Profile-Id'))
+            # The staff check queries the user, off the event loop
+            response = await handler(factory.get(reverse('skills') + '?profile=1', headers=auth))
+            self.assertTrue(response.has_header('X-Portfolio-Profile-Id'))
+            self.assertEqual(len(await sync_to_async(list_profiles)()), 2)
+
+
+class CommandTests(PortfolioTestCase):
+    def test_persistent_connections_are_configured_and_bench_restores_them(self):
+        try:
+            with mock.patch.dict(os.environ, {'DB_CONN_MAX_AGE': '30'}):
+                importlib.reload(meapi.settings)
+            self.assertEqual(meapi.settings.DATABASES['default']['CONN_MAX_AGE'], 30)
+            self.assertTrue(meapi.settings.DATABASES['default']['CONN_HEALTH_CHECKS'])
+        finally:
+            importlib.reload(meapi.settings)
+
+        settings_dict = connections['default'].settings_dict
+        configured = settings_dict['CONN_MAX_AGE']
+
+        def interrupted_run(self, max_age, requests, threads):
+            settings_dict['CONN_MAX_AGE'] = max_age
+            raise KeyboardInterrupt
+
+        # Closing the test connection would abort the test transaction
+        with mock.patch.object(bench_connections.Command, 'run', interrupted_run), mock.patch.object(connections, 'close_all'):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command('bench_connections', stdout=io.StringIO())
+        self.assertEqual(settings_dict['CONN_MAX_AGE'], configured)
+
+    def test_synthetic_dataset_and_bench_coverage(self):
+        seed_dataset(users=3, skills_per_user=25, projects_per_user=4, skills_per_project=2)
+        profiles = UserProfile.objects.filter(user__in=seeded_users())
+        self.assertEqual(profiles.count(), 3)
+        self.assertEqual(Skill.objects.filter(profile__in=profiles).count(), 75)
+        project = Project.objects.filter(profile__in=profiles).order_by('id').first()
+        self.assertEqual(project.skills.count(), 2)
+        # Projects n and n+1 share a skill; counts are recomputed after bulk_create
+        self.assertEqual(project.skills.order_by('id').last().project_count, 2)
+        self.assertTrue(ProjectSearch.objects.filter(project=project).exists())
+
+        # Every route is driven by `manage.py bench`
+        self.assertEqual(set(route_names()) - {endpoint.name for endpoint in ENDPOINTS}, set())
+
+        # Only generated names are bench users; a real account with the prefix is not
+        User.objects.create_user(username='bench-admin')
+        User.objects.create_user(username='bench-reg-1700000000-3')
+        User.objects.create_user(username='bench-marker')
+        User.objects.create_user(username='bench-12a')
+        self.assertEqual(bench_users().count(), 5)
+        clear_dataset()
+        self.assertFalse(bench_users().exists())
+        self.assertEqual(set(User.objects.filter(username__startswith='bench-').values_list('username', flat=True)),
+                         {'bench-marker', 'bench-12a'})
+
+        # testuser makes this look like a production database
+        seed_dataset(users=1, skills_per_user=1, projects_per_user=1, skills_per_project=1)
+        with self.assertRaises(CommandError):
+            call_command('bench', clear=True, stdout=io.StringIO())
+        self.assertTrue(seeded_users().exists())
+        call_command('bench', clear=True, yes=True, stdout=io.StringIO())
+        self.assertFalse(seeded_users().exists())
+
+    def test_boot_skips_work_that_is_already_done(self):
+        self.assertEqual(unapplied_migrations(connection), [])
+        delays = backoff_delays(0.1, 1)
+        self.assertTrue(all(0 <= next(delays) <= 1 for _ in range(20)))
+
+        def boot(*args):
+            out = io.StringIO()
+            call_command('boot', '--initial-delay', '0', *args, stdout=out)
+            return json.loads(out.getvalue().splitlines()[-1])['phases']
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(STATIC_ROOT=os.path.join(tmp, 'static')):
+            first = boot()
+            self.assertEqual(first['migrate'], {'pending': 0, 'ran': False, 'ms': first['migrate']['ms']})
+            self.assertTrue(first['collectstatic']['ran'])
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'static.source-hash')))
+            self.assertFalse(boot()['collectstatic']['ran'])
+            self.assertTrue(boot('--force')['collectstatic']['ran'])
+
+            # The database comes up on the third try
+            refused = [OperationalError('refused')] * 2 + [None] * 10
+            with mock.patch.object(connection, 'ensure_connection', side_effect=refused), \
+                    mock.patch.object(connection, 'close') as close:
+                self.assertEqual(boot('--skip-static')['database']['attempts'], 3)
+            self.assertEqual(close.call_count, 2)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite-specific')
+class QueryPlanTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.profile = UserProfile.objects.create(user=self.user)
+
+    def assertNoFullScan(self, queryset):
+        plan = queryset.explain()
+        scans = [line for line in plan.splitlines() if ' SCAN ' in f' {line} ']
+        self.assertEqual(scans, [], plan)
+        return plan
+
+    def test_skill_filter_uses_indexes(self):
+        view = UserProjectsView()
+        view.request = type('Request', (), {'user': self.user, 'query_params': {'skill': 'python'}})()
+        plan = self.assertNoFullScan(view.get_queryset())
+        self.assertIn('unique_skill_name_per_profile', plan)
+
+    def test_top_skills_uses_indexes(self):
+        view = UserTopSkillsView()
+        view.request = type('Request', (), {'user': self.user, 'query_params': {}})()
+        plan = self.assertNoFullScan(view.get_queryset())
+        self.assertIn('portfolio_skill_top_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -1,16 +1,45 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
-    UserProfileView, UserSkillsView, UserProjectsView, UserTopSkillsView,
-    WorkExperienceView, EducationView, SocialLinksView, health
+    UserProfileView, UserSkillsView, UserSkillsBulkView, UserProjectsView, UserProjectsBulkView, UserProjectsSearchView,
+    UserTopSkillsView, WorkExperienceView, EducationView, SocialLinksView, PortfolioExportView, WorkEntryListView,
+    WorkEntryDetailView, EducationEntryListView, EducationEntryDetailView, PublishView, health, metrics
 )
 
 urlpatterns = [
     path("health/", health, name="health"),
+    path("metrics/", metrics, name="metrics"),
     path("profile/", UserProfileView.as_view(), name="profile"),
     path("skills/", UserSkillsView.as_view(), name="skills"),
+    path("skills/bulk/", UserSkillsBulkView.as_view(), name="skills-bulk"),
     path("skills/top/", UserTopSkillsView.as_view(), name="top-skills"),
     path("projects/", UserProjectsView.as_view(), name="projects"),
+    path("projects/bulk/", UserProjectsBulkView.as_view(), name="projects-bulk"),
+    path("projects/search/", UserProjectsSearchView.as_view(), name="projects-search"),
     path("work-experience/", WorkExperienceView.as_view(), name="work-experience"),
+    path("work-experience/entries/", WorkEntryListView.as_view(), name="work-entries"),
+    path("work-experience/entries/<int:pk>/", WorkEntryDetailView.as_view(), name="work-entry"),
     path("education/", EducationView.as_view(), name="education"),
+    path("education/entries/", EducationEntryListView.as_view(), name="education-entries"),
+    path("education/entries/<int:pk>/", EducationEntryDetailView.as_view(), name="education-entry"),
     path("social-links/", SocialLinksView.as_view(), name="social-links"),
+    path("export/", PortfolioExportView.as_view(), name="export"),
+    path("publish/", PublishView.as_view(), name="publish"),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+
+    # Same routes and names, served by the async implementations
+    async_routes = {
+        "health": async_views.health,
+        "profile": async_views.profile,
+        "skills": async_views.skills,
+        "top-skills": async_views.top_skills,
+        "projects": async_views.projects,
+    }
+    urlpatterns = [
+        path(str(pattern.pattern), async_routes[pattern.name], name=pattern.name)
+        if pattern.name in async_routes else pattern
+        for pattern in urlpatterns
+    ]
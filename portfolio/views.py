@@ -1,17 +1,37 @@
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from rest_framework import generics
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from .models import UserProfile, Skill
+from .models import UserProfile, Skill, Project, WorkEntry, EducationEntry, profile_detail_queryset
 from rest_framework.permissions import AllowAny
 from rest_framework import generics, permissions
-from .serializers import UserProfileSerializer, SkillSerializer, ProjectSerializer
-from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+from .serializers import (
+    UserProfileSerializer, SkillSerializer, ProjectSerializer, ProvisionUserSerializer, WorkEntrySerializer,
+    EducationEntrySerializer, SkillRowSerializer, ProjectRowSerializer
+)
+from .renderers import FastJSONRenderer
+from .cache import ProfileCacheMixin, bump_profile_version
+from .bulk import import_projects, provision_users, upsert_skills
+from .entries import replace_entries
+from .pagination import OptInCursorPagination
+from .export import iter_profile_records, ndjson_lines
+from .passwords import PasswordHasherBusy, hash_password
+from .search import search_projects
+from .fieldsets import ProfileFieldset
+from .snapshots import current_snapshot_url, remove_snapshot, snapshot_url
+from .metrics import render_prometheus, store
+from django.db.models import Max, Prefetch, Value
+from django.urls import reverse
+from django.db.models.functions import Lower
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view, permission_classes
 from django.db import transaction
 from django.utils import timezone
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,6 +56,15 @@ def health(request):
             "timestamp": timezone.now().isoformat()
         }, status=503)
 
+
+def metrics(request):
+    """Request metrics from every worker, in Prometheus text format"""
+    token = settings.PORTFOLIO_METRICS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+    return HttpResponse(render_prometheus(store.collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def api_root(request):
@@ -72,170 +101,343 @@ class RegisterView(generics.CreateAPIView):
             if User.objects.filter(username=username).exists():
                 return Response({"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST)
 
+            # Hashed in the password pool; names go into the same INSERT
+            user = User(
+                username=User.normalize_username(username),
+                email=User.objects.normalize_email(email),
+                first_name=first_name or "",
+                last_name=last_name or "",
+                password=hash_password(password),
+            )
             with transaction.atomic():
-                user = User.objects.create_user(username=username, email=email, password=password)
-                if first_name:
-                    user.first_name = first_name
-                if last_name:
-                    user.last_name = last_name
                 user.save()
                 UserProfile.objects.create(user=user)  # empty profile auto-created
 
             return Response({"message": "User registered successfully"}, status=status.HTTP_201_CREATED)
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return Response({"error": "Registration failed. Please try again."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class BulkRegisterView(generics.GenericAPIView):
+    """Admin-only batch registration, e.g. for onboarding a whole cohort."""
+    permission_classes = [permissions.IsAdminUser]
+    max_users = 5000
+
+    def post(self, request):
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get('users', [data])
+        if not isinstance(data, list):
+            return Response({"error": "Expected a list of users"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(data) > self.max_users:
+            return Response({"error": f"At most {self.max_users} users per request"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Invalid rows are reported and skipped; the rest are still created
+        rows, items = [], []
+        for entry in data:
+            serializer = ProvisionUserSerializer(data=entry if isinstance(entry, dict) else {})
+            if serializer.is_valid():
+                rows.append({"username": serializer.validated_data["username"], "status": None})
+                items.append(serializer.validated_data)
+            else:
+                rows.append({"username": entry.get("username") if isinstance(entry, dict) else None,
+                             "status": "invalid", "errors": serializer.errors})
+
+        outcomes = iter(provision_users(items))
+        for row in rows:
+            if row["status"] is None:
+                row["status"], row["id"] = next(outcomes)
+
+        return Response({
+            "created": sum(1 for row in rows if row["status"] == "created"),
+            "results": rows,
+        }, status=status.HTTP_200_OK)
+
+
+def resolve_profile(user, queryset=None):
+    """
+    Fetch ``user``'s profile, creating it on first use. get_or_create relies on
+    the unique user_id column, so concurrent first requests all end up with
+    the same row instead of racing into an IntegrityError.
+    """
+    queryset = UserProfile.objects.all() if queryset is None else queryset
+    try:
+        return queryset.get(user_id=user.pk)
+    except UserProfile.DoesNotExist:
+        return UserProfile.objects.get_or_create(user_id=user.pk)[0]
+
+
+class ProfileMixin:
+    """
+    Resolve the requesting user's profile at most once per request.
+
+    Access tokens carry a ``profile_id`` claim (see PortfolioTokenObtainPairSerializer),
+    so views that only need the id to filter or insert never query
+    portfolio_userprofile at all.
+    """
+
+    def get_profile_id(self):
+        token = getattr(self.request, 'auth', None)
+        profile_id = token.get('profile_id') if hasattr(token, 'get') else None
+        if profile_id is not None:
+            return profile_id
+        return self.get_profile().pk
+
+    def get_profile(self, queryset=None):
+        if getattr(self, '_profile', None) is None:
+            self._profile = resolve_profile(self.request.user, queryset)
+        return self._profile
+
+
+class RowListMixin:
+    """
+    List GETs read ``.values()`` rows and serialize them with
+    ``row_serializer_class`` (see SkillRowSerializer), then render with
+    orjson. The response is the same as serializer_class would give; the
+    class is still used for writes and the browsable API forms.
+    """
+    row_serializer_class = None
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        return [FastJSONRenderer()] + [r for r in renderers if type(r) is not JSONRenderer]
+
+    def list(self, request, *args, **kwargs):
+        row_serializer = self.row_serializer_class
+        queryset = self.filter_queryset(self.get_queryset()).values(*row_serializer.values)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(row_serializer(page, many=True).data)
+        return Response(row_serializer(queryset, many=True).data)
+
+
+class UserProfileView(ProfileMixin, ProfileCacheMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         # Always return the profile of the currently logged-in user
-        try:
-            return UserProfile.objects.get(user=self.request.user)
-        except UserProfile.DoesNotExist:
-            # Create profile if it doesn't exist
-            return UserProfile.objects.create(user=self.request.user)
-
-class UserSkillsView(generics.ListAPIView):
+        return self.get_profile(profile_detail_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        # ?fields= / ?expand= / ?projects_page= etc. (see portfolio.fieldsets)
+        fieldset = ProfileFieldset.from_query(request.query_params)
+        if fieldset is None:
+            return super().retrieve(request, *args, **kwargs)
+        profile = self.get_profile(fieldset.queryset())
+        pages = fieldset.pages(profile)
+        for page in pages:
+            page.load()
+        return Response(fieldset.data(profile, pages, request.build_absolute_uri()))
+
+    def perform_update(self, serializer):
+        profile = serializer.save()
+        bump_profile_version(self.request.user.id, profile.published)
+
+class UserSkillsView(ProfileMixin, ProfileCacheMixin, RowListMixin, generics.ListAPIView):
     serializer_class = SkillSerializer
+    row_serializer_class = SkillRowSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptInCursorPagination
 
     def get_queryset(self):
-        try:
-            user_profile = UserProfile.objects.get(user=self.request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=self.request.user)
-        return user_profile.skills.all()
+        return Skill.objects.filter(profile_id=self.get_profile_id())
 
     def post(self, request, *args, **kwargs):
-        try:
-            user_profile = UserProfile.objects.get(user=self.request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=self.request.user)
         data = request.data
         # Accept either a single object or a list of objects
         if isinstance(data, dict):
             data = [data]
         serializer = SkillSerializer(data=data, many=True)
         if serializer.is_valid():
-            # Save each skill with the correct profile
-            skills = []
-            for skill_data in serializer.validated_data:
-                skill = Skill.objects.create(profile=user_profile, **skill_data)
-                skills.append(skill)
+            # Re-posting an existing name updates its level instead of duplicating it
+            skills, _, _ = upsert_skills(self.get_profile_id(), serializer.validated_data)
+            bump_profile_version(request.user.id)
             return Response(SkillSerializer(skills, many=True).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class UserProjectsView(generics.ListAPIView):
+
+class UserSkillsBulkView(ProfileMixin, generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get('skills', [data])
+        serializer = SkillSerializer(data=data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        skills, created, updated = upsert_skills(self.get_profile_id(), serializer.validated_data)
+        bump_profile_version(request.user.id)
+        return Response({
+            "created": created,
+            "updated": updated,
+            "unchanged": len(skills) - created - updated,
+        }, status=status.HTTP_200_OK)
+
+
+class UserProjectsView(ProfileMixin, ProfileCacheMixin, RowListMixin, generics.ListAPIView):
     serializer_class = ProjectSerializer
+    row_serializer_class = ProjectRowSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptInCursorPagination
 
     def get_queryset(self):
-        try:
-            user_profile = UserProfile.objects.get(user=self.request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=self.request.user)
+        profile_id = self.get_profile_id()
         skill_name = self.request.query_params.get('skill')
-        queryset = user_profile.projects.all()
+        queryset = Project.objects.filter(profile_id=profile_id)
         if skill_name:
-            queryset = queryset.filter(skills__name__iexact=skill_name)
+            # Resolve the skill through the (profile_id, LOWER(name)) unique index,
+            # then walk the (skill_id, project_id) index on the through table.
+            skill_ids = Skill.objects.filter(profile_id=profile_id).alias(lname=Lower('name')).filter(lname=Lower(Value(skill_name))).values('id')
+            queryset = queryset.filter(skills__in=skill_ids)
         return queryset
 
     def post(self, request, *args, **kwargs):
-        try:
-            user_profile = UserProfile.objects.get(user=self.request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=self.request.user)
-        skills_data = request.data.get('skills', [])
-        # Create or get skills for the user
-        skill_objs = []
-        for skill in skills_data:
-            skill_obj, created = Skill.objects.get_or_create(
-                profile=user_profile,
-                name=skill.get('name'),
-                defaults={'level': skill.get('level')}
-            )
-            if not created and skill.get('level'):
-                skill_obj.level = skill.get('level')
-                skill_obj.save()
-            skill_objs.append(skill_obj)
-        # Remove skills from data for ProjectSerializer
-        project_data = request.data.copy()
-        project_data.pop('skills', None)
-        serializer = ProjectSerializer(data=project_data)
-        if serializer.is_valid():
-            project = serializer.save(profile=user_profile)
-            project.skills.set(skill_objs)
-            return Response(ProjectSerializer(project).data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        project = ProjectSerializer(data=request.data)
+        skills = SkillSerializer(data=request.data.get('skills', []), many=True)
+        errors = {}
+        if not project.is_valid():
+            errors.update(project.errors)
+        if not skills.is_valid():
+            errors['skills'] = skills.errors
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        # Same path as the bulk endpoint: one skill upsert, one batch of links
+        [created] = import_projects(self.get_profile_id(), [{**project.validated_data, 'skills': skills.validated_data}])
+        bump_profile_version(request.user.id)
+        return Response(ProjectSerializer(created).data, status=status.HTTP_201_CREATED)
+
+
+class UserProjectsBulkView(ProfileMixin, generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
 
-class UserTopSkillsView(generics.ListAPIView):
+    def post(self, request):
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get('projects', [data])
+        if not isinstance(data, list):
+            return Response({"error": "Expected a list of projects"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Validate everything up front; errors line up with the input by index
+        items, errors = [], []
+        for entry in data:
+            if not isinstance(entry, dict):
+                items.append(None)
+                errors.append({"non_field_errors": ["Expected a project object"]})
+                continue
+            project = ProjectSerializer(data=entry)
+            skills = SkillSerializer(data=entry.get('skills', []), many=True)
+            item_errors = {}
+            if not project.is_valid():
+                item_errors.update(project.errors)
+            if not skills.is_valid():
+                item_errors['skills'] = skills.errors
+            errors.append(item_errors)
+            if not item_errors:
+                items.append({**project.validated_data, 'skills': skills.validated_data})
+
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        projects = import_projects(self.get_profile_id(), items)
+        bump_profile_version(request.user.id)
+        return Response({"created": len(projects)}, status=status.HTTP_201_CREATED)
+
+
+class UserProjectsSearchView(ProfileMixin, ProfileCacheMixin, generics.ListAPIView):
+    """Projects ranked by how well their text and skill names match ``?q=``."""
+    serializer_class = ProjectSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({"q": ["This query parameter is required."]})
+        # The text index returns ranked ids; load those rows and keep the rank order
+        ids = search_projects(self.get_profile_id(), query)
+        projects = Project.objects.prefetch_related(
+            Prefetch('skills', queryset=Skill.objects.order_by('id'))
+        ).in_bulk(ids)
+        return [projects[project_id] for project_id in ids if project_id in projects]
+
+
+class UserTopSkillsView(ProfileMixin, ProfileCacheMixin, RowListMixin, generics.ListAPIView):
     serializer_class = SkillSerializer
+    row_serializer_class = SkillRowSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        try:
-            user_profile = UserProfile.objects.get(user=self.request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=self.request.user)
-        # Annotate skills with project count and order by frequency
-        return user_profile.skills.annotate(project_count=Count('projects')).order_by('-project_count')[:5]
+        # project_count is maintained incrementally, so this reads portfolio_skill_top_idx
+        return Skill.objects.filter(profile_id=self.get_profile_id()).order_by('-project_count', 'id')[:5]
 
 
-# Simple views for work experience, education, and social links
-class WorkExperienceView(generics.GenericAPIView):
+class PortfolioExportView(ProfileMixin, generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=request.user)
-        return Response({"work": user_profile.work or ""})
+        user_profile = self.get_profile(UserProfile.objects.select_related('user'))
+        # One JSON object per line, streamed chunk by chunk as rows are read
+        response = StreamingHttpResponse(
+            ndjson_lines(iter_profile_records(user_profile)),
+            content_type='application/x-ndjson',
+        )
+        response['Content-Disposition'] = f'attachment; filename="portfolio-{request.user.username}.ndjson"'
+        return response
+
+
+class LegacyEntriesView(ProfileMixin, generics.GenericAPIView):
+    """
+    Deprecated single-blob view of the work/education entries. POST stores the
+    text and replaces the entries with the ones parsed from it, the way
+    migration 0005 converted existing blobs.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    model = None
+    field = None
+    successor = None
+    message = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        response['Deprecation'] = 'true'
+        response['Link'] = f'<{reverse(self.successor)}>; rel="successor-version"'
+        return response
+
+    def get(self, request):
+        return Response({self.field: getattr(self.get_profile(), self.field) or ""})
 
     def post(self, request):
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=request.user)
-        work_text = request.data.get('work', '')
-        user_profile.work = work_text
-        user_profile.save()
-        return Response({"message": "Work experience saved", "work": work_text})
+        text = request.data.get(self.field, '')
+        user_profile = self.get_profile()
+        replace_entries(user_profile, self.model, text)
+        bump_profile_version(request.user.id, user_profile.published)
+        return Response({"message": self.message, self.field: text})
 
 
-class EducationView(generics.GenericAPIView):
-    permission_classes = [permissions.IsAuthenticated]
+class WorkExperienceView(LegacyEntriesView):
+    model = WorkEntry
+    field = 'work'
+    successor = 'work-entries'
+    message = "Work experience saved"
 
-    def get(self, request):
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=request.user)
-        return Response({"education": user_profile.education or ""})
 
-    def post(self, request):
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=request.user)
-        education_text = request.data.get('education', '')
-        user_profile.education = education_text
-        user_profile.save()
-        return Response({"message": "Education saved", "education": education_text})
+class EducationView(LegacyEntriesView):
+    model = EducationEntry
+    field = 'education'
+    successor = 'education-entries'
+    message = "Education saved"
 
 
-class SocialLinksView(generics.GenericAPIView):
+# Simple view for social links
+class SocialLinksView(ProfileMixin, generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=request.user)
+        user_profile = self.get_profile()
         return Response({
             "github": user_profile.github or "",
             "linkedin": user_profile.linkedin or "", 
@@ -243,21 +445,15 @@ class SocialLinksView(generics.GenericAPIView):
         })
 
     def post(self, request):
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            user_profile = UserProfile.objects.create(user=request.user)
+        user_profile = self.get_profile()
         
         # Update individual fields if provided
-        if 'github' in request.data:
-            user_profile.github = request.data['github']
-        if 'linkedin' in request.data:
-            user_profile.linkedin = request.data['linkedin']
-        if 'portfolio' in request.data:
-            user_profile.portfolio = request.data['portfolio']
-            
-        user_profile.save()
-        
+        changed = [field for field in ('github', 'linkedin', 'portfolio') if field in request.data]
+        for field in changed:
+            setattr(user_profile, field, request.data[field])
+        user_profile.save(update_fields=changed)
+        bump_profile_version(request.user.id, user_profile.published)
+
         return Response({
             "message": "Social links saved",
             "github": user_profile.github or "",
@@ -266,8 +462,94 @@ class SocialLinksView(generics.GenericAPIView):
         })
 
 
+class PublishView(ProfileMixin, generics.GenericAPIView):
+    """
+    Publish the caller's portfolio as a public static snapshot. The file is
+    (re)built in the background, so POST answers 202 before it exists.
+
+    ``url`` always serves the latest version with a short cache lifetime;
+    ``versioned_url`` is the current version's content-addressed copy, which
+    may be cached forever and changes with every rebuild (None until the
+    first build finishes).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def published_urls(self, user_id):
+        return {"url": snapshot_url(user_id), "versioned_url": current_snapshot_url(user_id)}
+
+    def get(self, request):
+        if not self.get_profile().published:
+            return Response({"published": False, "url": None, "versioned_url": None})
+        return Response({"published": True, **self.published_urls(request.user.id)})
+
+    def post(self, request):
+        user_profile = self.get_profile()
+        user_profile.published = True
+        user_profile.save(update_fields=['published'])
+        bump_profile_version(request.user.id, True)
+        return Response({"published": True, **self.published_urls(request.user.id)}, status=status.HTTP_202_ACCEPTED)
+
+    def delete(self, request):
+        user_profile = self.get_profile()
+        user_profile.published = False
+        user_profile.save(update_fields=['published'])
+        # Taken down right away rather than by the background rebuild
+        transaction.on_commit(lambda: remove_snapshot(request.user.id))
+        bump_profile_version(request.user.id, False)
+        return Response({"published": False, "url": None, "versioned_url": None})
+
+
+class EntryListView(ProfileMixin, generics.ListCreateAPIView):
+    """Ordered work/education entries; POST appends one unless ``position`` is given."""
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    model = None
+
+    def get_queryset(self):
+        return self.model.objects.filter(profile_id=self.get_profile_id())
+
+    def perform_create(self, serializer):
+        position = serializer.validated_data.get('position')
+        if position is None:
+            last = self.get_queryset().aggregate(last=Max('position'))['last']
+            position = 0 if last is None else last + 1
+        serializer.save(profile_id=self.get_profile_id(), position=position)
+        bump_profile_version(self.request.user.id)
+
+
+class EntryDetailView(ProfileMixin, generics.UpdateAPIView, generics.DestroyAPIView):
+    """PATCH or DELETE a single entry; a PATCH only writes the fields sent."""
+    permission_classes = [permissions.IsAuthenticated]
+    http_method_names = ['patch', 'delete', 'options']
+    model = None
+
+    def get_queryset(self):
+        return self.model.objects.filter(profile_id=self.get_profile_id())
+
+    def perform_update(self, serializer):
+        serializer.save()
+        bump_profile_version(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        bump_profile_version(self.request.user.id)
+
+
+class WorkEntryListView(EntryListView):
+    model = WorkEntry
+    serializer_class = WorkEntrySerializer
+
 
+class WorkEntryDetailView(EntryDetailView):
+    model = WorkEntry
+    serializer_class = WorkEntrySerializer
 
 
+class EducationEntryListView(EntryListView):
+    model = EducationEntry
+    serializer_class = EducationEntrySerializer
 
 
+class EducationEntryDetailView(EntryDetailView):
+    model = EducationEntry
+    serializer_class = EducationEntrySerializer
@@ -3,11 +3,8 @@
 # Install dependencies
 pip install -r requirements.txt
 
-# Run migrations
-python manage.py migrate
-
-# Collect static files
-python manage.py collectstatic --noinput
+# Wait for the database, then migrate and collect static files if anything changed
+python manage.py boot
 
 # Start gunicorn server
 exec gunicorn meapi.wsgi:application --bind 0.0.0.0:${PORT:-8000} --workers 3